@@ -1,58 +1,54 @@
+import os
 import pandas as pd
 
 # ----------------------------------------------------------
-# 1️⃣ 파일 경로 설정 (사용자 환경에 맞게 수정)
+# 1️⃣ 파일 경로 설정 (저장소 루트 기준)
 # ----------------------------------------------------------
-weather_path = '/Users/parkhyeji/Desktop/PV/data/raw/기상.csv'   # 기상데이터 파일
-generation_path = '/Users/parkhyeji/Desktop/PV/data/raw/발전량.csv'  # 발전량 데이터 파일
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+import sys
+sys.path.append(BASE_DIR)
+from src.utils.data_io import iter_dataset, save_dataset_chunks
+from src.utils.joins import KeyIndex, left_join_chunks, to_date_key
+weather_path = os.path.join(BASE_DIR, 'data/raw/기상.csv')   # 기상데이터 파일
+generation_path = os.path.join(BASE_DIR, 'data/raw/발전량.csv')  # 발전량 데이터 파일
+CHUNK_ROWS = 200_000   # 발전량 파일을 나눠 읽는 행 수 (메모리 사용량 상한)
 
 # ----------------------------------------------------------
-# 2️⃣ 파일 불러오기
+# 2️⃣ 기상데이터 불러오기 + 병합 키 통일 ('지점명' → '지점')
 # ----------------------------------------------------------
 weather_df = pd.read_csv(weather_path, encoding='cp949')
-generation_df = pd.read_csv(generation_path, encoding='utf-8-sig')
-
-# ----------------------------------------------------------
-# 3️⃣ 날짜 컬럼을 datetime으로 변환
-# ----------------------------------------------------------
-# 기상데이터: '일시' / 발전데이터: '날짜'
-weather_df['일시'] = pd.to_datetime(weather_df['일시'], errors='coerce')
-generation_df['날짜'] = pd.to_datetime(generation_df['날짜'], errors='coerce')
-
-# ----------------------------------------------------------
-# 4️⃣ 병합 키 통일 ('지점명' → '지점')
-# ----------------------------------------------------------
 if '지점명' in weather_df.columns:
     weather_df = weather_df.rename(columns={'지점명': '지점'})
 
 # ----------------------------------------------------------
-# 5️⃣ 병합 (발전량 기준으로)
+# 3️⃣ 기상데이터를 (지점, 일시) 기준으로 한 번만 정렬/색인 (날짜는 datetime64 그대로 사용)
 # ----------------------------------------------------------
-merged_df = pd.merge(
-    generation_df,
-    weather_df,
-    how='left',             # 발전량 파일 기준으로 병합
-    left_on=['지점', '날짜'],
-    right_on=['지점', '일시']
-)
+weather_index = KeyIndex(weather_df, keys=['지점', '일시'], date_keys=['일시'])
+
+
+def generation_chunks():
+    # 발전데이터: '날짜'를 datetime으로 변환하며 청크 단위로 읽기
+    for chunk in pd.read_csv(generation_path, encoding='utf-8-sig', chunksize=CHUNK_ROWS):
+        chunk['날짜'] = to_date_key(chunk['날짜'])
+        yield chunk
+
 
 # ----------------------------------------------------------
-# 6️⃣ 병합 후 정리: '일시' 컬럼 제거 → '날짜'만 남기기
+# 4️⃣ 병합 (발전량 기준 왼쪽 조인, 기상의 '일시' 키 컬럼은 붙이지 않고 '날짜'만 남김) + 저장
 # ----------------------------------------------------------
-if '일시' in merged_df.columns:
-    merged_df = merged_df.drop(columns=['일시'])
+# 저장 경로
+output_path = os.path.join(BASE_DIR, 'data/processed/발전량기상데이터(병합).csv')
+
+# Parquet(다음 단계 입력) + CSV(확인용)로 청크 단위 저장
+merged_chunks = left_join_chunks(generation_chunks(), weather_index, on=['지점', '날짜'])
+_, n_rows = save_dataset_chunks(merged_chunks, output_path)
 
 # ----------------------------------------------------------
-# 7️⃣ 결과 확인 및 저장
+# 5️⃣ 결과 확인
 # ----------------------------------------------------------
+preview = next(iter_dataset(output_path, batch_rows=3))
 print("✅ 병합 완료!")
-print("병합된 데이터프레임 크기:", merged_df.shape)
-print(merged_df.head(3))   # 상위 3행만 출력
-
-# 저장 경로
-output_path = '/Users/parkhyeji/Desktop/PV/data/processed/발전량기상데이터(병합).csv'
-
-# CSV 파일로 저장
-merged_df.to_csv(output_path, index=False, encoding='utf-8-sig')
+print("병합된 데이터프레임 크기:", (n_rows, preview.shape[1]))
+print(preview.head(3))   # 상위 3행만 출력
 
 print(f"💾 결과 파일이 저장되었습니다 👉 {output_path}")
@@ -1,34 +1,38 @@
+import os
 import pandas as pd
 
-# 파일 경로
-file1_path = "/Users/parkhyeji/Desktop/PV/data/raw/발전소별_일사량.csv"         # 참조 파일
-file2_path = "/Users/parkhyeji/Desktop/PV/data/raw/발전량기상데이터(병합).csv"       # 기준 파일
-output_path = "/Users/parkhyeji/Desktop/PV/data/processed/발전량+기상.csv"
+# 파일 경로 (저장소 루트 기준, 기준 파일은 1단계 출력)
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+import sys
+sys.path.append(BASE_DIR)
+from src.utils.data_io import iter_dataset, save_dataset_chunks
+from src.utils.joins import KeyIndex, left_join_chunks
+file1_path = os.path.join(BASE_DIR, "data/raw/발전소별_일사량.csv")         # 참조 파일
+file2_path = os.path.join(BASE_DIR, "data/processed/발전량기상데이터(병합).csv")       # 기준 파일
+output_path = os.path.join(BASE_DIR, "data/processed/발전량+기상.csv")
+CHUNK_ROWS = 200_000   # 기준 파일을 나눠 읽는 행 수 (메모리 사용량 상한)
 
-# 파일 읽기 (인코딩 감안)
-df_ref = pd.read_csv(file1_path, encoding='EUC-KR')       # 참조 파일
-df_target = pd.read_csv(file2_path, encoding='UTF-8-SIG') # 기준 파일
+# 참조 파일 읽기 (인코딩 감안, 파일 중간에 섞인 헤더 행 등 숫자가 아닌 값은 결측 처리)
+df_ref = pd.read_csv(file1_path, encoding='EUC-KR')
+df_ref['일별_총_일사량(SI_Sum)'] = pd.to_numeric(df_ref['일별_총_일사량(SI_Sum)'], errors='coerce')
 
-# 날짜 형식 통일
-df_ref['날짜'] = pd.to_datetime(df_ref['날짜'], errors='coerce').dt.strftime('%Y-%m-%d')
-df_target['날짜'] = df_target['날짜'].astype(str).str.replace('.', '-').str.replace('--', '-')
-df_target['날짜'] = pd.to_datetime(df_target['날짜'], errors='coerce').dt.strftime('%Y-%m-%d')
+# 참조용 데이터를 (발전기명, 날짜) 기준으로 한 번만 정렬/색인 (날짜는 문자열 변환 없이 datetime64 일 단위로 비교)
+ref_index = KeyIndex(df_ref[['발전기명', '날짜', '일별_총_일사량(SI_Sum)']], keys=['발전기명', '날짜'], date_keys=['날짜'])
 
-# 참조용 데이터 준비
-ref_map = df_ref[['발전기명', '날짜', '일별_총_일사량(SI_Sum)']].copy()
 
-# 병합 수행
-df_updated = pd.merge(df_target, ref_map, on=['발전기명', '날짜'], how='left')
+def updated_chunks():
+    # 기준 파일(1단계 Parquet)을 청크 단위로 병합
+    for chunk in left_join_chunks(iter_dataset(file2_path, CHUNK_ROWS), ref_index, on=['발전기명', '날짜']):
+        # 값 교체: 참조값이 존재하면 '합계 일사량(MJ/m2)'을 교체
+        mask = chunk['일별_총_일사량(SI_Sum)'].notna()
+        chunk.loc[mask, '합계 일사량(MJ/m2)'] = chunk.loc[mask, '일별_총_일사량(SI_Sum)']
 
-# 값 교체: 참조값이 존재하면 '합계 일사량(MJ/m2)'을 교체
-mask = df_updated['일별_총_일사량(SI_Sum)'].notna()
-df_updated.loc[mask, '합계 일사량(MJ/m2)'] = df_updated.loc[mask, '일별_총_일사량(SI_Sum)']
+        # 불필요한 참조 컬럼 제거
+        yield chunk.drop(columns=['일별_총_일사량(SI_Sum)'])
 
-# 불필요한 참조 컬럼 제거
-df_updated.drop(columns=['일별_총_일사량(SI_Sum)'], inplace=True)
 
-# CSV로 저장
-df_updated.to_csv(output_path, index=False, encoding= 'utf-8-sig')
+# Parquet(다음 단계 입력) + CSV(확인용)로 청크 단위 저장
+save_dataset_chunks(updated_chunks(), output_path)
 
 print("✅ 일사량 값 교체 완료!")
 print(f"저장 위치: {output_path}")
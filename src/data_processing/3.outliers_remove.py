@@ -1,157 +1,188 @@
+import argparse
 import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 import os
-from openpyxl import load_workbook
-from openpyxl.drawing.image import Image as XLImage
-
-# ✅ macOS 한글 폰트 설정
-plt.rcParams['font.family'] = 'AppleGothic'
-plt.rcParams['axes.unicode_minus'] = False
+import sys
 
 # ----------------------------------------------------------
-# 설정
+# 설정 (저장소 루트 기준, 입력은 2단계 출력)
 # ----------------------------------------------------------
-input_path = "/Users/parkhyeji/Desktop/PV/data/raw/발전량+기상.csv"
-output_dir = "/Users/parkhyeji/Desktop/PV/data/outliers_removed"
-os.makedirs(output_dir, exist_ok=True)
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(BASE_DIR)
+from src.utils.data_io import load_dataset, save_dataset
+from src.utils.outliers import detect_outliers, flag_column
+from src.utils.sketches import SketchStore
+from src.utils.quality_report import (boxplot_summary, histogram_summary, sample_rows, start_chart_process,
+                                      write_excel_report)
+
+input_path = os.path.join(BASE_DIR, "data/processed/발전량+기상.csv")
+output_dir = os.path.join(BASE_DIR, "data/outliers_removed")
 
 # 출력 파일 경로
 report_path = os.path.join(output_dir, "데이터품질_시각화통합보고서.xlsx")
+img_dir = os.path.join(output_dir, "plots")
+filtered_csv_path = os.path.join(output_dir, "이상치제거_데이터.csv")
 
-# ----------------------------------------------------------
-# 1. 데이터 불러오기
-# ----------------------------------------------------------
-df = pd.read_csv(input_path, encoding='utf-8-sig')
-df.columns = df.columns.str.strip()
+# 발전기별 누적 통계(sketch)와 그 기준의 IQR/Z-score 표 (--stage sketch)
+sketch_path = os.path.join(output_dir, "발전기별_sketch.json")
+sketch_iqr_path = os.path.join(output_dir, "IQR통계_누적.csv")
+sketch_zscore_path = os.path.join(output_dir, "Zscore통계_누적.csv")
+
+# 보고서의 6_이상치제거 시트: full(전체 행) / sample(RAW_SAMPLE_ROWS행 무작위 추출) / none(생략)
+RAW_SHEET_MODE = "full"
+RAW_SAMPLE_ROWS = 5000
 
-required_cols = ['지점', '날짜', '발전기명', '설비용량(MW)', '발전량(MWh)', '평균기온(°C)', 
+required_cols = ['지점', '날짜', '발전기명', '설비용량(MW)', '발전량(MWh)', '평균기온(°C)',
                  '일강수량(mm)', '평균 풍속(m/s)', '평균 상대습도(%)', '합계 일조시간(hr)', '합계 일사량(MJ/m2)']
-missing_cols = [c for c in required_cols if c not in df.columns]
-if missing_cols:
-    raise ValueError(f"누락된 컬럼: {missing_cols}")
+
 
 # ----------------------------------------------------------
-# 2. 데이터 타입 및 결측치 점검
+# 1. 데이터 불러오기
 # ----------------------------------------------------------
-dtype_info = pd.DataFrame({
-    '컬럼명': df.columns,
-    '데이터타입': df.dtypes.astype(str),
-    '결측치수': df.isna().sum(),
-    '고유값개수': df.nunique()
-})
+def load_data():
+    df = load_dataset(input_path, compact=False)   # 정제 결과를 다시 저장하므로 원래 정밀도로 읽음
+    df.columns = df.columns.str.strip()
 
-missing_ratio = (df.isnull().sum() / len(df) * 100).reset_index()
-missing_ratio.columns = ['컬럼명', '결측치비율(%)']
+    missing_cols = [c for c in required_cols if c not in df.columns]
+    if missing_cols:
+        raise ValueError(f"누락된 컬럼: {missing_cols}")
+    return df
 
-# ----------------------------------------------------------
-# 3. 날짜 범위 확인
-# ----------------------------------------------------------
-df['날짜'] = pd.to_datetime(df['날짜'], errors='coerce')
-date_summary = pd.DataFrame({
-    '시작일자': [df['날짜'].min()],
-    '종료일자': [df['날짜'].max()],
-    '총일수': [(df['날짜'].max() - df['날짜'].min()).days]
-})
 
 # ----------------------------------------------------------
-# 4. IQR 이상치 탐지
+# 4. 이상치 탐지 (보고서/정제 CSV 공통)
 # ----------------------------------------------------------
-iqr_info_list, filtered_df_list = [], []
-
-for gen, sub in df.groupby('발전기명'):
-    q1, q3 = sub['발전량(MWh)'].quantile([0.25, 0.75])
-    iqr = q3 - q1
-    lower, upper = q1 - 1.5 * iqr, q3 + 1.5 * iqr
-
-    iqr_info_list.append({
-        '발전기명': gen,
-        'Q1': q1, 'Q3': q3, 'IQR': iqr,
-        '하한': lower, '상한': upper
-    })
+# 보고서에 통계를 싣는 검출기 (seasonal_iqr, mad 등 추가 가능) / 정제 CSV에서 제거 기준이 되는 검출기
+REPORT_DETECTORS = ["iqr", "zscore"]
+CLEAN_DETECTORS = ["iqr"]
 
-    sub_f = sub[(sub['발전량(MWh)'] >= lower) & (sub['발전량(MWh)'] <= upper)].copy()
-    filtered_df_list.append(sub_f)
 
-iqr_df = pd.DataFrame(iqr_info_list)
-filtered_df = pd.concat(filtered_df_list, ignore_index=True)
+def detect(df, detectors=REPORT_DETECTORS):
+    """
+    발전기별 통계를 한 번에 계산 → (검출기별 이상치 플래그 DF, {검출기명: 통계 DF})
+    """
+    return detect_outliers(df, detectors, value_col='발전량(MWh)', group_col='발전기명', date_col='날짜')
 
-# ----------------------------------------------------------
-# 5. Z-score 이상치 탐지
-# ----------------------------------------------------------
-zscore_info = []
-for gen, sub in df.groupby('발전기명'):
-    mean, std = sub['발전량(MWh)'].mean(), sub['발전량(MWh)'].std()
-    sub['Zscore'] = (sub['발전량(MWh)'] - mean) / std
-    outliers = sub[np.abs(sub['Zscore']) > 3]
-    zscore_info.append({
-        '발전기명': gen,
-        '평균': mean,
-        '표준편차': std,
-        '이상치수': len(outliers),
-        '전체데이터수': len(sub),
-        '이상치비율(%)': round(len(outliers) / len(sub) * 100, 2)
-    })
 
-zscore_df = pd.DataFrame(zscore_info)
+def remove_flagged(df, flags, detectors=CLEAN_DETECTORS):
+    """
+    지정한 검출기 중 하나라도 이상치로 표시한 행을 제외 (발전기명 순, 발전기 안에서는 원래 순서)
+    """
+    drop = flags[[flag_column(name) for name in detectors]].any(axis=1)
+    kept = df.loc[~drop & df['발전기명'].notna()]
+    return kept.sort_values('발전기명', kind='stable').reset_index(drop=True)
 
-# ----------------------------------------------------------
-# 6. 시각화 (그래프 이미지 파일 생성)
-# ----------------------------------------------------------
-img_dir = os.path.join(output_dir, "plots")
-os.makedirs(img_dir, exist_ok=True)
-
-# 🔹 결측치율 시각화
-plt.figure(figsize=(8, 4))
-sns.barplot(data=missing_ratio, x='컬럼명', y='결측치비율(%)', palette='Blues_d')
-plt.title('결측치 비율 (%)')
-plt.xticks(rotation=45)
-plt.tight_layout()
-missing_img = os.path.join(img_dir, "missing_ratio.png")
-plt.savefig(missing_img, dpi=150)
-plt.close()
-
-# 🔹 발전기별 발전량 분포 히스토그램
-plt.figure(figsize=(10, 5))
-sns.histplot(df, x='발전량(MWh)', hue='발전기명', multiple='stack', bins=30)
-plt.title('발전기별 발전량 분포')
-plt.tight_layout()
-hist_img = os.path.join(img_dir, "generation_hist.png")
-plt.savefig(hist_img, dpi=150)
-plt.close()
-
-# 🔹 발전기별 박스플롯 (IQR 시각화)
-plt.figure(figsize=(12, 6))
-sns.boxplot(data=df, x='발전기명', y='발전량(MWh)')
-plt.title('발전기별 발전량 박스플롯 (IQR 이상치 시각화)')
-plt.xticks(rotation=45)
-plt.tight_layout()
-box_img = os.path.join(img_dir, "iqr_boxplot.png")
-plt.savefig(box_img, dpi=150)
-plt.close()
 
-# ----------------------------------------------------------
-# 7. 통합 엑셀 보고서 생성
-# ----------------------------------------------------------
-with pd.ExcelWriter(report_path, engine='openpyxl') as writer:
-    dtype_info.to_excel(writer, index=False, sheet_name='1_데이터타입')
-    missing_ratio.to_excel(writer, index=False, sheet_name='2_결측치비율')
-    date_summary.to_excel(writer, index=False, sheet_name='3_날짜범위')
-    iqr_df.to_excel(writer, index=False, sheet_name='4_IQR통계')
-    zscore_df.to_excel(writer, index=False, sheet_name='5_Zscore통계')
-    filtered_df.to_excel(writer, index=False, sheet_name='6_이상치제거')
+def build_report(df, raw_sheet=RAW_SHEET_MODE, sample_size=RAW_SAMPLE_ROWS):
+    """
+    데이터 품질 진단 + 이상치 통계 + 시각화 → 통합 엑셀 보고서
+    (그래프는 요약 통계로 백그라운드 프로세스에서 그리고, 엑셀은 한 행씩 기록)
+    """
+    # ----------------------------------------------------------
+    # 2. 데이터 타입 및 결측치 점검
+    # ----------------------------------------------------------
+    dtype_info = pd.DataFrame({
+        '컬럼명': df.columns,
+        '데이터타입': df.dtypes.astype(str),
+        '결측치수': df.isna().sum(),
+        '고유값개수': df.nunique()
+    })
 
-# ----------------------------------------------------------
-# 8. 이상치 제거된 데이터 별도 파일 저장
-# ----------------------------------------------------------
-filtered_csv_path = os.path.join(output_dir, "이상치제거_데이터.csv")
-filtered_df.to_csv(filtered_csv_path, index=False, encoding='utf-8-sig')
+    missing_ratio = (df.isnull().sum() / len(df) * 100).reset_index()
+    missing_ratio.columns = ['컬럼명', '결측치비율(%)']
+
+    # ----------------------------------------------------------
+    # 3. 날짜 범위 확인
+    # ----------------------------------------------------------
+    df['날짜'] = pd.to_datetime(df['날짜'], errors='coerce')
+    date_summary = pd.DataFrame({
+        '시작일자': [df['날짜'].min()],
+        '종료일자': [df['날짜'].max()],
+        '총일수': [(df['날짜'].max() - df['날짜'].min()).days]
+    })
 
-# ----------------------------------------------------------
-# 완료 메시지
-# ----------------------------------------------------------
-print("✅ 데이터 품질 진단 + 이상치 탐지 + 시각화 보고서 생성 완료!")
-print(f"📘 통합 보고서 파일: {report_path}")
-print(f"📊 그래프 이미지 폴더: {img_dir}")
-print(f"💾 이상치 제거 CSV: {filtered_csv_path}")
+    # ----------------------------------------------------------
+    # 6. 시각화 (요약 통계만 넘겨 별도 프로세스에서 그래프 이미지 생성)
+    # ----------------------------------------------------------
+    summary = {
+        "missing_ratio": missing_ratio,
+        "histogram": histogram_summary(df, '발전량(MWh)', '발전기명', bins=30),
+        "boxplot": boxplot_summary(df, '발전량(MWh)', '발전기명'),
+    }
+    chart_executor, chart_future = start_chart_process(summary, img_dir)
+
+    # ----------------------------------------------------------
+    # 4~5. IQR / Z-score 이상치 탐지 (통계는 발전기 전체를 한 번에 집계)
+    # ----------------------------------------------------------
+    flags, stats = detect(df)
+    iqr_df, zscore_df = stats['iqr'], stats['zscore']
+
+    # ----------------------------------------------------------
+    # 7. 통합 엑셀 보고서 생성 (그래프 렌더링과 동시에 진행)
+    # ----------------------------------------------------------
+    sheets = [
+        ('1_데이터타입', dtype_info),
+        ('2_결측치비율', missing_ratio),
+        ('3_날짜범위', date_summary),
+        ('4_IQR통계', iqr_df),
+        ('5_Zscore통계', zscore_df),
+    ]
+    raw_df = sample_rows(remove_flagged(df, flags), raw_sheet, sample_size)
+    if raw_df is not None:
+        sheets.append(('6_이상치제거', raw_df))
+    try:
+        write_excel_report(report_path, sheets)
+    finally:
+        chart_executor.shutdown(wait=True)
+    chart_future.result()
+
+    print("✅ 데이터 품질 진단 + 이상치 탐지 + 시각화 보고서 생성 완료!")
+    print(f"📘 통합 보고서 파일: {report_path} (6_이상치제거 시트: {raw_sheet})")
+    print(f"📊 그래프 이미지 폴더: {img_dir}")
+
+
+def write_cleaned(df):
+    # ----------------------------------------------------------
+    # 8. 이상치 제거된 데이터 별도 파일 저장
+    # ----------------------------------------------------------
+    df['날짜'] = pd.to_datetime(df['날짜'], errors='coerce')
+    flags, _ = detect(df, CLEAN_DETECTORS)
+    filtered_df = remove_flagged(df, flags)
+    save_dataset(filtered_df, filtered_csv_path)
+    print(f"💾 이상치 제거 CSV: {filtered_csv_path}")
+
+
+def update_sketches(df):
+    # ----------------------------------------------------------
+    # 9. 누적 통계 갱신 (지난 실행 이후 새로 들어온 날짜의 행만 반영)
+    # ----------------------------------------------------------
+    df['날짜'] = pd.to_datetime(df['날짜'], errors='coerce')
+    store = SketchStore.load(sketch_path)
+    new_df = store.new_rows(df)
+    flags = store.update(new_df)
+    store.save(sketch_path)
+
+    store.iqr_table().to_csv(sketch_iqr_path, index=False, encoding='utf-8-sig')
+    store.zscore_table().to_csv(sketch_zscore_path, index=False, encoding='utf-8-sig')
+    print(f"🧮 누적 통계 갱신: 새 행 {len(new_df)}개 "
+          f"(IQR 이상치 {int(flags[flag_column('iqr')].sum())}개, Z-score 이상치 {int(flags[flag_column('zscore')].sum())}개)")
+    print(f"💾 sketch 파일: {sketch_path}")
+
+
+if __name__ == "__main__":
+    # --stage report: 품질 보고서만 / clean: 이상치 제거 CSV만 / all: 둘 다 (파이프라인에서는 두 갈래를 병렬 실행)
+    #         sketch: 새 행만으로 발전기별 누적 통계(IQR/Z-score) 갱신
+    parser = argparse.ArgumentParser(description="데이터 품질 보고서 + IQR 이상치 제거")
+    parser.add_argument("--stage", choices=["report", "clean", "all", "sketch"], default="all")
+    parser.add_argument("--raw-sheet", choices=["full", "sample", "none"], default=RAW_SHEET_MODE,
+                        help="보고서의 이상치 제거 데이터 시트 (전체 / 표본 / 생략)")
+    parser.add_argument("--sample-rows", type=int, default=RAW_SAMPLE_ROWS, help="--raw-sheet sample일 때 행 수")
+    args = parser.parse_args()
+
+    os.makedirs(output_dir, exist_ok=True)
+    df = load_data()
+    if args.stage in ("report", "all"):
+        build_report(df.copy(), args.raw_sheet, args.sample_rows)
+    if args.stage in ("clean", "all"):
+        write_cleaned(df.copy())
+    if args.stage == "sketch":
+        update_sketches(df.copy())
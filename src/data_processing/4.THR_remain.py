@@ -3,10 +3,13 @@ import sys
 import pandas as pd
 
 # -----------------------------
-# 설정: 경로만 바꿔서 사용하세요
+# 설정: 경로만 바꿔서 사용하세요 (저장소 루트 기준)
 # -----------------------------
-input_path  = "/Users/parkhyeji/Desktop/PV/data/outliers_removed/이상치제거_데이터.csv"   # CSV 또는 XLSX 가능
-output_path = "/Users/parkhyeji/Desktop/PV/data/outliers_removed/이상치제거_THR.csv"  # 확장자에 맞춰 저장됨
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(BASE_DIR)
+from src.utils.data_io import read_table, save_dataset
+input_path  = os.path.join(BASE_DIR, "data/outliers_removed/이상치제거_데이터.csv")   # CSV 또는 XLSX 가능
+output_path = os.path.join(BASE_DIR, "data/outliers_removed/이상치제거_THR.csv")  # 확장자에 맞춰 저장됨
 
 # 최종으로 남길 열(순서 포함)
 TARGET_COLS = [
@@ -68,26 +71,27 @@ def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
     df.columns = df.columns.str.strip()
     return df
 
-def read_any(input_path: str) -> pd.DataFrame:
+def read_any(input_path: str, columns=None) -> pd.DataFrame:
+    """
+    CSV/Parquet/XLSX 읽기 (columns를 주면 해당 열만 읽음, 공백 차이 무시)
+    """
     ext = os.path.splitext(input_path)[1].lower()
-    if ext in [".csv", ".txt"]:
-        # 인코딩 자동 시도
-        for enc in ["utf-8-sig", "cp949", "utf-8"]:
-            try:
-                return pd.read_csv(input_path, encoding=enc)
-            except Exception:
-                continue
-        # 그래도 실패하면 기본 시도(에러 표시)
-        return pd.read_csv(input_path)
+    if ext in [".csv", ".txt", ".parquet"]:
+        # 인코딩은 파일 앞부분으로 한 번만 판별 + 필요한 열만 타입 지정해서 파싱
+        return read_table(input_path, columns=columns)
     elif ext in [".xlsx", ".xls"]:
-        return pd.read_excel(input_path)
+        wanted = None if columns is None else {c.replace(" ", "") for c in columns}
+        usecols = None if wanted is None else (lambda c: str(c).replace(" ", "").replace("\t", "") in wanted)
+        return pd.read_excel(input_path, usecols=usecols)
     else:
         raise ValueError("지원하지 않는 파일 형식입니다. CSV 또는 XLSX를 사용하세요.")
 
 def write_any(df: pd.DataFrame, output_path: str) -> None:
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
     ext = os.path.splitext(output_path)[1].lower()
-    if ext in [".csv", ".txt"]:
+    if ext == ".csv":
+        save_dataset(df, output_path)
+    elif ext == ".txt":
         df.to_csv(output_path, index=False, encoding="utf-8-sig")
     elif ext in [".xlsx", ".xls"]:
         df.to_excel(output_path, index=False)
@@ -100,7 +104,8 @@ def write_any(df: pd.DataFrame, output_path: str) -> None:
 def main():
     # 1) 읽기
     try:
-        df = read_any(input_path)
+        # 대상 열만 읽기 (전체 파싱 후 버리지 않음)
+        df = read_any(input_path, columns=TARGET_COLS)
     except Exception as e:
         print(f"[에러] 파일을 읽는 중 문제가 발생했습니다: {e}")
         sys.exit(1)
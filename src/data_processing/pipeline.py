@@ -0,0 +1,274 @@
+# 데이터 전처리 1~4단계 파이프라인 실행기
+#
+# 실행: python src/data_processing/pipeline.py [--force] [--only 3_clean ...] [--dry-run]
+# - 단계별 입력/출력 파일과 스크립트 내용(스크립트가 import하는 src 모듈 포함)을 해시로 지문화하여, 바뀐 것이 없으면 건너뜀
+# - 서로 의존하지 않는 단계(품질 보고서 / 이상치 제거 CSV)는 병렬 실행
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+STAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.abspath(os.path.join(STAGE_DIR, "..", ".."))
+STATE_FILE = os.path.join(BASE_DIR, "data", ".pipeline_state.json")
+
+
+def data_path(*parts):
+    return os.path.join(BASE_DIR, "data", *parts)
+
+
+# 단계 정의: 스크립트, 인자, 입력/출력 파일, 선행 단계
+STAGES = [
+    {
+        "name": "1_merge",
+        "script": "1.generation_weather_aggregator.py",
+        "args": [],
+        "inputs": [data_path("raw", "기상.csv"), data_path("raw", "발전량.csv")],
+        "outputs": [data_path("processed", "발전량기상데이터(병합).csv"),
+                    data_path("processed", "발전량기상데이터(병합).parquet")],
+        "deps": [],
+    },
+    {
+        "name": "2_solar",
+        "script": "2.solar_radiation_aggregator.py",
+        "args": [],
+        "inputs": [data_path("raw", "발전소별_일사량.csv"), data_path("processed", "발전량기상데이터(병합).csv")],
+        "outputs": [data_path("processed", "발전량+기상.csv"),
+                    data_path("processed", "발전량+기상.parquet")],
+        "deps": ["1_merge"],
+    },
+    {
+        "name": "3_report",
+        "script": "3.outliers_remove.py",
+        "args": ["--stage", "report"],
+        "inputs": [data_path("processed", "발전량+기상.csv")],
+        "outputs": [data_path("outliers_removed", "데이터품질_시각화통합보고서.xlsx"),
+                    data_path("outliers_removed", "plots", "missing_ratio.png"),
+                    data_path("outliers_removed", "plots", "generation_hist.png"),
+                    data_path("outliers_removed", "plots", "iqr_boxplot.png")],
+        "deps": ["2_solar"],
+    },
+    {
+        "name": "3_clean",
+        "script": "3.outliers_remove.py",
+        "args": ["--stage", "clean"],
+        "inputs": [data_path("processed", "발전량+기상.csv")],
+        "outputs": [data_path("outliers_removed", "이상치제거_데이터.csv"),
+                    data_path("outliers_removed", "이상치제거_데이터.parquet")],
+        "deps": ["2_solar"],
+    },
+    {
+        "name": "4_thr",
+        "script": "4.THR_remain.py",
+        "args": [],
+        "inputs": [data_path("outliers_removed", "이상치제거_데이터.csv")],
+        "outputs": [data_path("outliers_removed", "이상치제거_THR.csv"),
+                    data_path("outliers_removed", "이상치제거_THR.parquet")],
+        "deps": ["3_clean"],
+    },
+]
+
+
+# -----------------------------------------------------------------
+# 파일 해시 (크기+수정시각이 같으면 이전 해시 재사용)
+# -----------------------------------------------------------------
+class FileHasher:
+    def __init__(self, memo=None):
+        self.memo = memo or {}
+
+    def hash(self, path):
+        """
+        파일 내용 sha256 (없으면 None)
+        """
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        stamp = [st.st_size, st.st_mtime_ns]
+        cached = self.memo.get(path)
+        if cached and cached[0] == stamp:
+            return cached[1]
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        self.memo[path] = [stamp, digest.hexdigest()]
+        return digest.hexdigest()
+
+
+def repo_modules(script_path):
+    """
+    스크립트가 (간접적으로라도) import하는 저장소 안 src 모듈 파일 목록 (정렬, 스크립트 자신 제외)
+    """
+    found, stack = set(), [script_path]
+    while stack:
+        with open(stack.pop(), encoding="utf-8") as f:
+            tree = ast.parse(f.read())
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+                names = [node.module] + [f"{node.module}.{alias.name}" for alias in node.names]
+            else:
+                continue
+            for name in names:
+                if not name.startswith("src."):
+                    continue
+                path = os.path.join(BASE_DIR, *name.split(".")) + ".py"
+                if os.path.exists(path) and path not in found:
+                    found.add(path)
+                    stack.append(path)
+    return sorted(found)
+
+
+def load_state():
+    if not os.path.exists(STATE_FILE):
+        return {"stages": {}, "hashes": {}}
+    with open(STATE_FILE, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_state(state):
+    tmp_path = STATE_FILE + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, STATE_FILE)
+
+
+def stage_fingerprint(stage, hasher):
+    """
+    스크립트 내용 + 스크립트가 쓰는 src 모듈 내용 + 인자 + 입력 파일 내용 해시를 합친 단계 지문 (입력이 없으면 None)
+    """
+    script_path = os.path.join(STAGE_DIR, stage["script"])
+    parts = [stage["script"], hasher.hash(script_path), " ".join(stage["args"])]
+    for path in repo_modules(script_path):
+        parts.append(f"{os.path.relpath(path, BASE_DIR)}={hasher.hash(path)}")
+    for path in stage["inputs"]:
+        digest = hasher.hash(path)
+        if digest is None:
+            return None
+        parts.append(f"{os.path.relpath(path, BASE_DIR)}={digest}")
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def is_up_to_date(stage, state, hasher):
+    """
+    지문이 같고, 출력 파일이 모두 있고, 출력이 마지막 실행 후 바뀌지 않았으면 True
+    """
+    record = state["stages"].get(stage["name"])
+    if not record or record["fingerprint"] != stage_fingerprint(stage, hasher):
+        return False
+    return all(hasher.hash(path) is not None and hasher.hash(path) == record["outputs"].get(path)
+               for path in stage["outputs"])
+
+
+def run_stage(stage):
+    """
+    단계 스크립트를 별도 프로세스로 실행 → (성공 여부, 소요 시간, 출력 로그)
+    """
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, os.path.join(STAGE_DIR, stage["script"])] + stage["args"],
+                               cwd=BASE_DIR, capture_output=True, text=True)
+    return completed.returncode == 0, time.perf_counter() - start, completed.stdout + completed.stderr
+
+
+def select_stages(only):
+    """
+    --only로 지정한 단계와 그 선행 단계만 남기기
+    """
+    if not only:
+        return STAGES
+    by_name = {s["name"]: s for s in STAGES}
+    wanted, stack = set(), list(only)
+    while stack:
+        name = stack.pop()
+        if name not in wanted:
+            wanted.add(name)
+            stack.extend(by_name[name]["deps"])
+    return [s for s in STAGES if s["name"] in wanted]
+
+
+def run_pipeline(force=False, only=None, max_workers=2, dry_run=False):
+    """
+    선행 단계가 끝난 단계부터 병렬 실행, 최신 상태인 단계는 건너뜀
+    반환: {단계명: '건너뜀' | '실행' | '실패' | '중단' | '실행 예정'}
+    """
+    state = load_state()
+    hasher = FileHasher(state.get("hashes"))
+    stages = select_stages(only)
+    selected = {s["name"] for s in stages}
+    status = {}
+    pending = list(stages)
+    running = {}
+
+    def ready(stage):
+        return all(status.get(dep) in ("건너뜀", "실행", "실행 예정") or dep not in selected for dep in stage["deps"])
+
+    def blocked(stage):
+        return any(status.get(dep) in ("실패", "중단") for dep in stage["deps"])
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while pending or running:
+            for stage in list(pending):
+                if blocked(stage):
+                    status[stage["name"]] = "중단"
+                    pending.remove(stage)
+                    print(f"⛔ {stage['name']}: 선행 단계 실패로 중단")
+                elif ready(stage):
+                    pending.remove(stage)
+                    if not force and is_up_to_date(stage, state, hasher):
+                        status[stage["name"]] = "건너뜀"
+                        print(f"⏭️  {stage['name']}: 최신 상태 (건너뜀)")
+                    elif dry_run:
+                        status[stage["name"]] = "실행 예정"
+                        print(f"📝 {stage['name']}: 실행 필요")
+                    else:
+                        print(f"▶ {stage['name']}: 실행 시작")
+                        running[pool.submit(run_stage, stage)] = stage
+            if not running:
+                if pending and not any(ready(s) or blocked(s) for s in pending):
+                    raise RuntimeError(f"실행할 수 없는 단계: {[s['name'] for s in pending]}")
+                continue
+
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                ok, elapsed, log = future.result()
+                if ok:
+                    status[stage["name"]] = "실행"
+                    # 성공한 단계만 지문/출력 해시 기록 (실패 시 다음 실행에서 다시 수행)
+                    state["stages"][stage["name"]] = {
+                        "fingerprint": stage_fingerprint(stage, hasher),
+                        "outputs": {path: hasher.hash(path) for path in stage["outputs"]},
+                        "elapsed": round(elapsed, 2),
+                    }
+                    print(f"✅ {stage['name']}: 완료 ({elapsed:.1f}초)")
+                else:
+                    status[stage["name"]] = "실패"
+                    state["stages"].pop(stage["name"], None)
+                    print(f"❌ {stage['name']}: 실패 ({elapsed:.1f}초)\n{log[-2000:]}")
+
+    if not dry_run:
+        state["hashes"] = hasher.memo
+        save_state(state)
+    return status
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="데이터 전처리 파이프라인 (변경된 단계만 실행)")
+    parser.add_argument("--force", action="store_true", help="최신 상태여도 모든 단계 다시 실행")
+    parser.add_argument("--only", nargs="+", choices=[s["name"] for s in STAGES], help="지정 단계(+선행 단계)만 실행")
+    parser.add_argument("--workers", type=int, default=2, help="동시에 실행할 단계 수")
+    parser.add_argument("--dry-run", action="store_true", help="실행하지 않고 실행 필요 여부만 출력")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    result = run_pipeline(args.force, args.only, args.workers, args.dry_run)
+    print(f"\n파이프라인 종료 ({time.perf_counter() - start:.2f}초): {result}")
+    sys.exit(1 if any(v in ("실패", "중단") for v in result.values()) else 0)
@@ -0,0 +1,172 @@
+# 발전기별 개별 모델 시계열 교차검증 (train_models.py의 VARIANTS 그대로 사용)
+#
+# - train_models.py의 무작위 80/20 분할은 미래 날짜가 학습에 섞여 성능이 실제보다 좋게 나올 수 있음
+#   → 발전기마다 날짜 순서를 지키는 폴드(rolling-origin 또는 blocked, src/utils/timeseries_cv.py)로 다시 평가
+# - (변형, 발전기, 폴드) 하나를 작업 하나로 프로세스 풀에 분배 (큰 학습 구간부터)
+# - 폴드 분할은 발전기 날짜 배열 + 분할 설정 해시로 캐시 → 같은 데이터/설정이면 다시 계산하지 않음
+# - 결과: 변형별 results/cv/ 아래
+#   · {변형}_cv_folds.csv: 발전기 × 폴드별 지표 (학습/검증 기간 포함)
+#   · {변형}_cv_results.csv: 발전기별 폴드 평균 (RF_full_results.csv와 같은 컬럼)
+# - 모델 파일/그래프는 저장하지 않음 (최종 모델은 train_models.py로 학습)
+#
+# 실행: python -m src.models.individual.cross_validate [--variants RF_full] [--mode rolling|blocked]
+#       [--folds 5] [--gap-days 0] [--min-train-days 365] [--workers N]
+
+import argparse
+import os
+
+import pandas as pd
+
+from src.utils.features import build_features, TARGET
+from src.utils.scheduler import run_tasks
+from src.utils.timeseries_cv import (MIN_TRAIN_DAYS, MODES, N_FOLDS, describe_fold, load_folds,
+                                     split_config)
+from src.models.individual.train_models import (ALGORITHMS, MIN_ROWS, VARIANTS, _accuracy_level, _path,
+                                                _shared_features, metrics_row, regression_metrics)
+
+METRIC_COLUMNS = ["R²", "RMSE", "NRMSE(평균)", "NRMSE(범위)", "MAPE(%)"]
+
+
+def _cv_csv(variant, kind):
+    # results/train/RF_full_results.csv → results/cv/RF_full_cv_{kind}.csv
+    results_dir = os.path.dirname(os.path.dirname(variant["result_csv"]))
+    return _path(os.path.join(results_dir, "cv", f"{variant['name']}_cv_{kind}.csv"))
+
+
+# ----------------------------------------------------------
+# 🔧 폴드 하나 학습/평가 (워커 프로세스에서 실행)
+# ----------------------------------------------------------
+def evaluate_fold(key, train, test, variant, n_jobs=-1):
+    """
+    폴드 하나의 학습 구간으로 학습 → 검증 구간 지표 dict
+    key: (변형 이름, 발전기명, 폴드 번호)
+    """
+    model = ALGORITHMS[variant["algorithm"]]["fit"](train[variant["features"]], train[TARGET],
+                                                    variant["params"], n_jobs)
+    return regression_metrics(test[TARGET], model.predict(test[variant["features"]]))
+
+
+def aggregate(fold_rows, n_rows):
+    """
+    발전기 하나의 폴드별 결과 행 → 폴드 평균 행 (정확도 수준은 평균 NRMSE 기준)
+    """
+    folds = pd.DataFrame(fold_rows)
+    means = folds[METRIC_COLUMNS].mean()
+    return {
+        "발전기명": folds["발전기명"].iloc[0],
+        "데이터 수": n_rows,
+        "R²": round(means["R²"], 4),
+        "RMSE": round(means["RMSE"], 4),
+        "NRMSE(평균)": round(means["NRMSE(평균)"], 3),
+        "NRMSE(범위)": round(means["NRMSE(범위)"], 3),
+        "MAPE(%)": round(means["MAPE(%)"], 2),
+        "정확도 수준": _accuracy_level(means["NRMSE(평균)"]),
+    }
+
+
+def cross_validate(names=None, mode="rolling", n_folds=N_FOLDS, gap_days=0,
+                   min_train_days=MIN_TRAIN_DAYS, max_workers=None, refresh_folds=False):
+    """
+    VARIANTS 중 names(없으면 전체)를 시계열 폴드로 평가 → {변형 이름: (폴드별 DataFrame, 발전기별 DataFrame)}
+    """
+    config = split_config(mode, n_folds, gap_days, min_train_days)
+    variants = [v for v in VARIANTS if names is None or v["name"] in names]
+    print(f"📅 분할: {config['mode']}, 폴드 {config['n_folds']}개, 간격 {config['gap_days']}일"
+          + (f", 최소 학습 {config['min_train_days']}일" if config["mode"] == "rolling" else ""))
+
+    # ----------------------------------------------------------
+    # 1️⃣ 입력 데이터별 로드 → 발전기별 날짜순 정렬 → 폴드 분할 (캐시)
+    # ----------------------------------------------------------
+    sources = {}
+    for v in variants:
+        sources.setdefault((v["data"], v["recipe"]), []).append(v)
+
+    tasks, fold_info, n_rows = [], {}, {}
+    n_cached = n_generators = 0
+    for (data, recipe), source_variants in sources.items():
+        df, prep = build_features(_path(data), recipe, _shared_features(source_variants))
+        print(f"✅ {os.path.basename(data)} 로드 완료 ({len(df)}행) → {', '.join(v['name'] for v in source_variants)}")
+        for gen_name, group in df.groupby('발전기명', observed=True):
+            if len(group) < MIN_ROWS:
+                print(f"⚠️ {gen_name}: 데이터 부족으로 스킵 ({len(group)}개)")
+                continue
+            usable = (group.dropna(subset=_shared_features(source_variants))
+                      .sort_values('날짜', kind="stable").reset_index(drop=True))
+            folds, cached = load_folds(usable['날짜'], config, refresh=refresh_folds)
+            n_cached += cached
+            n_generators += 1
+            if not folds:
+                print(f"⚠️ {gen_name}: 기간이 짧아 폴드를 만들 수 없음 ({usable['날짜'].min():%Y-%m-%d} ~ "
+                      f"{usable['날짜'].max():%Y-%m-%d})")
+                continue
+            for k, (train_idx, test_idx) in enumerate(folds, start=1):
+                info = describe_fold(usable['날짜'], train_idx, test_idx)
+                train, test = usable.iloc[train_idx], usable.iloc[test_idx]
+                for v in source_variants:
+                    key = (v["name"], gen_name, k)
+                    fold_info[key] = info
+                    tasks.append((key, (train, test, v), len(train_idx)))
+            for v in source_variants:
+                n_rows[v["name"], gen_name] = len(group) if v["algorithm"] == "random_forest" else len(usable)
+    print(f"🔎 폴드 작업 {len(tasks)}개 (발전기 {n_generators}개 중 폴드 캐시 사용 {n_cached}개)")
+
+    # ----------------------------------------------------------
+    # 2️⃣ (변형, 발전기, 폴드)별 학습/평가 (큰 학습 구간부터 프로세스 풀에 분배)
+    # ----------------------------------------------------------
+    metrics = {}
+    for key, result in run_tasks(evaluate_fold, tasks, max_workers=max_workers):
+        metrics[key] = result
+        name, gen_name, k = key
+        print(f"[{name}] {gen_name} 폴드 {k} ▶ R²={result['r2']:.3f}, RMSE={result['rmse']:.2f}, "
+              f"MAPE={result['mape']:.1f}%")
+
+    # ----------------------------------------------------------
+    # 3️⃣ 변형별 폴드 결과 / 발전기별 평균 저장
+    # ----------------------------------------------------------
+    outputs = {}
+    for v in variants:
+        fold_rows, gen_rows = [], {}
+        for key, _, _ in tasks:   # 발전기 순서 → 폴드 순서 (작업 생성 순서)
+            name, gen_name, k = key
+            if name != v["name"]:
+                continue
+            row = metrics_row(gen_name, metrics[key], fold_info[key]["검증 수"])
+            row.pop("데이터 수")
+            row = {"발전기명": gen_name, "폴드": k, **fold_info[key], **row}
+            fold_rows.append(row)
+            gen_rows.setdefault(gen_name, []).append(row)
+
+        folds_df = pd.DataFrame(fold_rows)
+        results_df = pd.DataFrame([aggregate(rows, n_rows[v["name"], gen_name])
+                                   for gen_name, rows in gen_rows.items()])
+        for kind, frame in (("folds", folds_df), ("results", results_df)):
+            path = _cv_csv(v, kind)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            frame.to_csv(path, index=False, encoding='utf-8-sig')
+        outputs[v["name"]] = (folds_df, results_df)
+
+        print(f"\n📊 [{v['name']}] 시계열 CV 결과 저장 완료: {_cv_csv(v, 'results')}")
+        if len(results_df):
+            line = f"   발전기 평균 R²={results_df['R²'].mean():.3f}, NRMSE(평균)={results_df['NRMSE(평균)'].mean():.3f}"
+            if os.path.exists(_path(v["result_csv"])):
+                random_split = pd.read_csv(_path(v["result_csv"]))
+                line += f" (무작위 분할 R²={random_split['R²'].mean():.3f})"
+            print(line)
+    return outputs
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="발전기별 개별 모델 시계열 교차검증")
+    parser.add_argument("--variants", nargs="+", choices=[v["name"] for v in VARIANTS], default=None,
+                        help="평가할 변형 (기본: 전체)")
+    parser.add_argument("--mode", default="rolling", choices=MODES,
+                        help="rolling: 앞선 날짜로만 학습 / blocked: 검증 구간 앞뒤를 비우고 나머지로 학습")
+    parser.add_argument("--folds", type=int, default=N_FOLDS, help="폴드 수")
+    parser.add_argument("--gap-days", type=int, default=0, help="학습/검증 구간 사이에 비워 둘 날 수")
+    parser.add_argument("--min-train-days", type=int, default=MIN_TRAIN_DAYS,
+                        help="rolling: 첫 검증 구간 전 최소 학습 기간(일)")
+    parser.add_argument("--workers", type=int, default=None, help="워커 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--refresh-folds", action="store_true", help="폴드 캐시를 무시하고 다시 분할")
+    args = parser.parse_args()
+    cross_validate(args.variants, args.mode, args.folds, args.gap_days, args.min_train_days,
+                   args.workers, args.refresh_folds)
@@ -0,0 +1,534 @@
+# 발전기별 개별 모델 통합 학습 (랜덤포레스트 / 다중선형회귀 × 전체 / 축소 변수)
+#
+# - 학습할 조합(변형)을 VARIANTS에 선언: 알고리즘, 입력 데이터/전처리, 특성, 하이퍼파라미터, 저장 위치
+# - 같은 입력 데이터를 쓰는 변형끼리 데이터 로드/전처리/train-test 분할을 한 번만 하고,
+#   발전기마다 같은 분할로 모든 변형을 학습
+# - 결과 CSV, 모델 파일(rf_integrated_*, rf_simple_*, linear_*, lr_simple_*), 그래프는 기존 스크립트와 같은 위치/이름
+#
+# - 발전기별 학습 데이터 + 특성 + 하이퍼파라미터의 지문이 저장된 모델과 같으면 다시 학습하지 않음
+#   (발전기 하나가 끝날 때마다 지문/결과를 기록하므로 중간에 멈춰도 이어서 실행, --force로 전체 재학습)
+# - --incremental: RF 변형을 새 날짜만큼 증분 갱신 (트리 추가 + 오래된 트리 제거, 오차가 커졌으면 전체 재학습)
+# - 날짜 순서를 지킨 성능 평가(시계열 교차검증)는 cross_validate.py
+#
+# 실행: python -m src.models.individual.train_models [--variants RF_full LR_full] [--workers N] [--force] [--incremental]
+
+import argparse
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+from sklearn.model_selection import train_test_split
+from sklearn.metrics import r2_score, mean_squared_error
+
+from src.utils.model_utils import save_model
+from src.utils.features import build_features, FEATURES_FULL, FEATURES_REDUCED, TARGET
+from src.utils.scheduler import run_tasks
+from src.utils.checkpoint import FingerprintManifest, frame_fingerprint
+from src.utils.incremental_rf import (MIN_NEW_ROWS, check_drift, grow_forest, load_state, new_state,
+                                      recent_window, save_state, state_path)
+
+# ----------------------------------------------------------
+# ✅ macOS 한글 폰트 설정
+# ----------------------------------------------------------
+plt.rcParams['font.family'] = 'AppleGothic'
+plt.rcParams['axes.unicode_minus'] = False
+
+
+# ----------------------------------------------------------
+# 🔧 경로 / 학습 변형 설정
+# ----------------------------------------------------------
+# 저장소 루트 (VARIANTS의 데이터/결과 경로 기준, RE_PV_BASE_DIR 환경변수로 다른 위치 지정 가능)
+BASE_DIR = os.environ.get("RE_PV_BASE_DIR",
+                          os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+MIN_ROWS = 10   # 데이터가 이보다 적은 발전기는 학습하지 않음
+SPLIT = {"test_size": 0.2, "random_state": 42}
+FINGERPRINT_FILE = "fingerprints.json"   # 모델 폴더별 발전기 지문/결과 기록
+
+VARIANTS = [
+    {
+        "name": "RF_full",
+        "algorithm": "random_forest",
+        "data": "data/outliers_removed/이상치제거_데이터.csv",
+        "recipe": "individual_full",
+        "features": FEATURES_FULL,
+        "params": {"n_estimators": 500, "random_state": 42},
+        "model_prefix": "rf_integrated",
+        "result_csv": "src/models/individual/random_forest/results/train/RF_full_results.csv",
+        "plot_dir": "src/models/individual/random_forest/plots/full_model/train",
+        "model_dir": "outputs/models/individual/random_forest/full/train",
+    },
+    {
+        "name": "RF_reduced",
+        "algorithm": "random_forest",
+        "data": "data/outliers_removed/이상치제거_THR.csv",
+        "recipe": "individual_reduced",
+        "features": FEATURES_REDUCED,
+        "params": {"n_estimators": 500, "random_state": 42},
+        "model_prefix": "rf_simple",
+        "result_csv": "src/models/individual/random_forest/results/train/RF_reduced_results.csv",
+        "plot_dir": "src/models/individual/random_forest/plots/reduced_model/train",
+        "model_dir": "outputs/models/individual/random_forest/reduced/train",
+    },
+    {
+        "name": "LR_full",
+        "algorithm": "linear_regression",
+        "data": "data/outliers_removed/이상치제거_데이터.csv",
+        "recipe": "individual_full",
+        "features": FEATURES_FULL,
+        "params": {},
+        "model_prefix": "linear",
+        "result_csv": "src/models/individual/linear_regression/results/train/LR_full_results.csv",
+        "plot_dir": "src/models/individual/linear_regression/plots/full_model/train",
+        "model_dir": "outputs/models/individual/linear_regression/full/train",
+    },
+    {
+        "name": "LR_reduced",
+        "algorithm": "linear_regression",
+        "data": "data/outliers_removed/이상치제거_THR.csv",
+        "recipe": "individual_reduced",
+        "features": FEATURES_REDUCED,
+        "params": {},
+        "model_prefix": "lr_simple",
+        "result_csv": "src/models/individual/linear_regression/results/train/LR_reduced_results.csv",
+        "plot_dir": "src/models/individual/linear_regression/plots/reduced_model/train",
+        "model_dir": "outputs/models/individual/linear_regression/reduced/train",
+    },
+]
+
+
+def _path(relative):
+    return os.path.join(BASE_DIR, relative)
+
+
+def _model_name(variant, gen_name):
+    return f"{variant['model_prefix']}_{gen_name.replace('/', '_').replace(' ', '_')}"
+
+
+def _accuracy_level(nrmse):
+    if nrmse < 0.1:
+        return "✅ 매우 우수"
+    elif nrmse < 0.2:
+        return "👍 양호"
+    elif nrmse < 0.3:
+        return "⚖️ 보통"
+    return "⚠️ 부정확"
+
+
+def regression_metrics(y_test, y_pred):
+    """
+    평가 지표: r2, rmse, mape(%), nrmse_mean, nrmse_range, level(정확도 수준)
+    """
+    rmse = mean_squared_error(y_test, y_pred) ** 0.5
+    metrics = {
+        "r2": r2_score(y_test, y_pred),
+        "rmse": rmse,
+        "mape": np.mean(np.abs((y_test - y_pred) / y_test.replace(0, np.nan))) * 100,
+        "nrmse_mean": rmse / y_test.mean(),
+        "nrmse_range": rmse / (y_test.max() - y_test.min()),
+    }
+    metrics["level"] = _accuracy_level(metrics["nrmse_mean"])
+    return metrics
+
+
+def metrics_row(gen_name, metrics, n_rows):
+    """
+    RF 결과 CSV(RF_full_results.csv) 형식의 결과 행
+    """
+    return {
+        "발전기명": gen_name,
+        "데이터 수": n_rows,
+        "R²": round(metrics["r2"], 4),
+        "RMSE": round(metrics["rmse"], 4),
+        "NRMSE(평균)": round(metrics["nrmse_mean"], 3),
+        "NRMSE(범위)": round(metrics["nrmse_range"], 3),
+        "MAPE(%)": round(metrics["mape"], 2),
+        "정확도 수준": metrics["level"],
+    }
+
+
+def _save_plot(plot_dir, filename):
+    plt.tight_layout()
+    plt.savefig(os.path.join(plot_dir, filename), dpi=300)
+    plt.close()
+
+
+def _plot_scatter_residuals(gen_name, y_test, y_pred, plot_dir):
+    # (1) 실제 vs 예측 산점도
+    plt.figure(figsize=(6, 6))
+    plt.scatter(y_test, y_pred, alpha=0.7, color='royalblue')
+    plt.plot([y_test.min(), y_test.max()], [y_test.min(), y_test.max()], 'r--', lw=2)
+    plt.title(f"[{gen_name}] 실제 vs 예측 발전량")
+    plt.xlabel("실제 발전량(MWh)")
+    plt.ylabel("예측 발전량(MWh)")
+    plt.grid(True)
+    _save_plot(plot_dir, f"{gen_name}_산점도.png")
+
+    # (2) 잔차 분석
+    residuals = y_test - y_pred
+    plt.figure(figsize=(7, 4))
+    plt.hist(residuals, bins=25, color='gray', alpha=0.8)
+    plt.title(f"[{gen_name}] 잔차 분포")
+    plt.xlabel("잔차(실제 - 예측)")
+    plt.ylabel("빈도")
+    _save_plot(plot_dir, f"{gen_name}_잔차분포.png")
+
+
+# ----------------------------------------------------------
+# 🌲 랜덤포레스트
+# ----------------------------------------------------------
+def _fit_random_forest(X_train, y_train, params, n_jobs):
+    model = RandomForestRegressor(**params, n_jobs=n_jobs)
+    return model.fit(X_train, y_train)
+
+
+def _plot_random_forest(gen_name, model, X_test, y_test, y_pred, plot_dir):
+    _plot_scatter_residuals(gen_name, y_test, y_pred, plot_dir)
+
+    # (3) 피처 중요도
+    importances = model.feature_importances_
+    sorted_idx = np.argsort(importances)[::-1]
+    plt.figure(figsize=(7, 4))
+    plt.bar(X_test.columns[sorted_idx], importances[sorted_idx], color='seagreen')
+    plt.title(f"[{gen_name}] 특성 중요도")
+    plt.ylabel("중요도")
+    plt.xticks(rotation=30)
+    _save_plot(plot_dir, f"{gen_name}_특성중요도.png")
+
+
+def _row_random_forest(gen_name, model, X_test, metrics, n_rows):
+    return metrics_row(gen_name, metrics, n_rows)
+
+
+# ----------------------------------------------------------
+# 📈 다중선형회귀
+# ----------------------------------------------------------
+def _fit_linear_regression(X_train, y_train, params, n_jobs):
+    model = LinearRegression(**params)
+    return model.fit(X_train, y_train)
+
+
+def _plot_linear_regression(gen_name, model, X_test, y_test, y_pred, plot_dir):
+    _plot_scatter_residuals(gen_name, y_test, y_pred, plot_dir)
+
+    # (3) 예측 vs 실제 시계열 비교
+    plt.figure(figsize=(10, 4))
+    plt.plot(y_test.index, y_test.values, label='실제', color='black', lw=2)
+    plt.plot(y_test.index, y_pred, label='예측', color='darkorange', lw=2, alpha=0.8)
+    plt.title(f"[{gen_name}] 실제 vs 예측 추이")
+    plt.xlabel("샘플(날짜순 아님)")
+    plt.ylabel("발전량(MWh)")
+    plt.legend()
+    _save_plot(plot_dir, f"{gen_name}_예측추이.png")
+
+    # (4) 회귀계수 중요도 시각화
+    plt.figure(figsize=(8, 4))
+    plt.barh(X_test.columns, np.abs(model.coef_), color='teal', alpha=0.7)
+    plt.title(f"[{gen_name}] 회귀계수 크기 (절댓값 기준)")
+    plt.xlabel("계수 절댓값")
+    _save_plot(plot_dir, f"{gen_name}_회귀계수.png")
+
+
+def _row_linear_regression(gen_name, model, X_test, metrics, n_rows):
+    row = {
+        "발전기명": gen_name,
+        "데이터수": n_rows,
+        "R²": round(metrics["r2"], 4),
+        "RMSE": round(metrics["rmse"], 4),
+        "MAPE(%)": round(metrics["mape"], 2),
+        "NRMSE(평균)": round(metrics["nrmse_mean"], 3),
+        "절편": round(model.intercept_, 4),
+        "정확도 수준": metrics["level"],
+    }
+    for col, coef in zip(X_test.columns, model.coef_):
+        row[col] = round(coef, 4)
+    return row
+
+
+ALGORITHMS = {
+    "random_forest": {
+        "fit": _fit_random_forest,
+        "plot": _plot_random_forest,
+        "row": _row_random_forest,
+        "summary": {"r2_color": "teal", "mape_color": "coral", "alpha": 0.8,
+                    "r2_title": "발전기별 모델 R² 비교", "r2_ylabel": "R² (결정계수)"},
+    },
+    "linear_regression": {
+        "fit": _fit_linear_regression,
+        "plot": _plot_linear_regression,
+        "row": _row_linear_regression,
+        "summary": {"r2_color": "seagreen", "mape_color": "salmon", "alpha": None,
+                    "r2_title": "발전기별 R² (결정계수) 비교", "r2_ylabel": "R²"},
+    },
+}
+
+
+def _shared_features(variants):
+    features = []
+    for v in variants:
+        features += [c for c in v["features"] if c not in features]
+    return features
+
+
+# ----------------------------------------------------------
+# 🔧 발전기 하나 학습 (워커 프로세스에서 실행)
+# ----------------------------------------------------------
+def train_generator(key, group, variants, n_jobs=-1):
+    """
+    발전기 하나를 한 번만 분할해서 모든 변형 학습 + 모델/그래프 저장 → {변형 이름: 결과 dict}
+    key: (입력 데이터 번호, 발전기명) / n_jobs: RF 내부 병렬 수
+    """
+    _, gen_name = key
+    usable = group.dropna(subset=_shared_features(variants))
+    train_idx, test_idx = train_test_split(np.arange(len(usable)), **SPLIT)
+    train, test = usable.iloc[train_idx], usable.iloc[test_idx]
+    y_train, y_test = train[TARGET], test[TARGET]
+
+    rows = {}
+    for v in variants:
+        algo = ALGORITHMS[v["algorithm"]]
+        X_train, X_test = train[v["features"]], test[v["features"]]
+        model = algo["fit"](X_train, y_train, v["params"], n_jobs)
+        y_pred = model.predict(X_test)
+        save_model(model, model_name=_model_name(v, gen_name), output_dir=_path(v["model_dir"]))
+
+        metrics = regression_metrics(y_test, y_pred)
+        print(f"[{v['name']}] {gen_name} ▶ R²={metrics['r2']:.3f}, RMSE={metrics['rmse']:.2f}, "
+              f"MAPE={metrics['mape']:.1f}%, {metrics['level']}")
+
+        algo["plot"](gen_name, model, X_test, y_test, y_pred, _path(v["plot_dir"]))
+        n_rows = len(group) if v["algorithm"] == "random_forest" else len(usable)
+        rows[v["name"]] = algo["row"](gen_name, model, X_test, metrics, n_rows)
+    return rows
+
+
+def _save_summary(variant, results_df):
+    style = ALGORITHMS[variant["algorithm"]]["summary"]
+    plot_dir = _path(variant["plot_dir"])
+
+    plt.figure(figsize=(10, 6))
+    plt.bar(results_df["발전기명"], results_df["R²"], color=style["r2_color"], alpha=style["alpha"])
+    plt.title(style["r2_title"])
+    plt.ylabel(style["r2_ylabel"])
+    plt.xticks(rotation=45)
+    plt.grid(axis="y")
+    _save_plot(plot_dir, "전체_R2비교.png")
+
+    plt.figure(figsize=(10, 6))
+    plt.bar(results_df["발전기명"], results_df["MAPE(%)"], color=style["mape_color"], alpha=style["alpha"])
+    plt.title("발전기별 MAPE(%) 비교")
+    plt.ylabel("MAPE(%)")
+    plt.xticks(rotation=45)
+    plt.grid(axis="y")
+    _save_plot(plot_dir, "전체_MAPE비교.png")
+
+
+def run(names=None, max_workers=None, force=False):
+    """
+    VARIANTS 중 names(없으면 전체) 학습 → {변형 이름: 결과 DataFrame}
+    지문이 저장된 모델과 같은 발전기는 건너뛰고 기록된 결과를 그대로 사용 (force=True면 전체 학습)
+    """
+    variants = [v for v in VARIANTS if names is None or v["name"] in names]
+    for v in variants:
+        os.makedirs(os.path.dirname(_path(v["result_csv"])), exist_ok=True)
+        os.makedirs(_path(v["plot_dir"]), exist_ok=True)
+        os.makedirs(_path(v["model_dir"]), exist_ok=True)
+
+    # ----------------------------------------------------------
+    # 1️⃣ 입력 데이터별로 한 번만 로드 및 결측치 처리
+    # ----------------------------------------------------------
+    sources = {}
+    for v in variants:
+        sources.setdefault((v["data"], v["recipe"]), []).append(v)
+
+    manifests = {v["name"]: _manifest(v) for v in variants}
+    rows = {v["name"]: {} for v in variants}   # 변형 → {발전기명: 결과 행} (발전기 순서 유지)
+    fingerprints, tasks = {}, []
+    for i, ((data, recipe), source_variants) in enumerate(sources.items()):
+        df, prep = build_features(_path(data), recipe, _shared_features(source_variants))
+        print(f"✅ {os.path.basename(data)} 로드 완료 ({len(df)}행, 합계 일사량 결측 {prep['결측제거']}개 제거) "
+              f"→ {', '.join(v['name'] for v in source_variants)}")
+        for gen_name, group in df.groupby('발전기명', observed=True):
+            if len(group) < MIN_ROWS:
+                print(f"⚠️ {gen_name}: 데이터 부족으로 스킵 ({len(group)}개)")
+                continue
+            todo = []
+            for v in source_variants:
+                fingerprint = _fingerprint(v, group, source_variants)
+                fingerprints[v["name"], gen_name] = fingerprint
+                if not force and _is_current(v, gen_name, fingerprint, manifests[v["name"]]):
+                    rows[v["name"]][gen_name] = manifests[v["name"]].result(gen_name)
+                else:
+                    rows[v["name"]][gen_name] = None
+                    todo.append(v)
+            if todo:
+                tasks.append(((i, gen_name), (group, todo), len(group) * len(todo)))
+
+    n_todo = sum(len(todo) for _, (_, todo), _ in tasks)
+    n_all = sum(len(r) for r in rows.values())
+    print(f"🔎 학습 대상 {n_todo}개 / 전체 {n_all}개 (나머지는 데이터/설정이 같아 기존 모델 사용)")
+
+    # ----------------------------------------------------------
+    # 2️⃣ 발전기별 학습 (큰 발전기부터 프로세스 풀에 분배, 끝나는 대로 수집/기록)
+    # ----------------------------------------------------------
+    finished = {}
+    for key, result in run_tasks(train_generator, tasks, max_workers=max_workers):
+        for name, row in result.items():
+            manifests[name].record(key[1], fingerprints[name, key[1]], row)
+            rows[name][key[1]] = row
+        finished[key] = result
+
+    # ----------------------------------------------------------
+    # 3️⃣ 변형별 결과 저장 및 요약 그래프
+    # ----------------------------------------------------------
+    outputs = {}
+    for v in variants:
+        results_df = pd.DataFrame(list(rows[v["name"]].values()))
+        results_df.to_csv(_path(v["result_csv"]), index=False, encoding='utf-8-sig')
+        _save_summary(v, results_df)
+        outputs[v["name"]] = results_df
+        if v["algorithm"] == "random_forest":
+            # 증분 갱신 기준: 발전기별 마지막 학습 날짜 + 이번 학습의 RMSE
+            _record_full_fits(v, {key[1]: (group["날짜"].max(), finished[key][v["name"]]["RMSE"])
+                                  for key, (group, _), _ in tasks if v["name"] in finished[key]})
+        print(f"\n📊 [{v['name']}] 결과 저장 완료: {_path(v['result_csv'])}")
+        print(f"🖼️ 그래프 저장 경로: {_path(v['plot_dir'])}")
+        print(f"💾 개별 모델 저장 경로: {_path(v['model_dir'])}")
+    return outputs
+
+
+def _manifest(variant):
+    return FingerprintManifest(os.path.join(_path(variant["model_dir"]), FINGERPRINT_FILE))
+
+
+def _fingerprint(variant, group, source_variants):
+    """
+    학습에 쓰는 데이터 조각(날짜, 특성, 발전량) + 알고리즘/특성/하이퍼파라미터/분할 설정의 지문
+    """
+    usable = group.dropna(subset=_shared_features(source_variants))
+    return frame_fingerprint(usable, ["날짜"] + variant["features"] + [TARGET],
+                             algorithm=variant["algorithm"], features=variant["features"],
+                             params=variant["params"], split=SPLIT, rows=len(group))
+
+
+def _is_current(variant, gen_name, fingerprint, manifest):
+    model_path = os.path.join(_path(variant["model_dir"]), _model_name(variant, gen_name) + ".pkl")
+    return manifest.matches(gen_name, fingerprint) and os.path.exists(model_path)
+
+
+def _record_full_fits(variant, fits):
+    # fits: {발전기명: (마지막 날짜, RMSE)}
+    path = state_path(_path(variant["model_dir"]))
+    state = load_state(path)
+    for gen_name, (last_date, rmse) in fits.items():
+        state[gen_name] = new_state(last_date, rmse)
+    save_state(path, state)
+
+
+# ----------------------------------------------------------
+# 🔁 RF 증분 갱신 (워커 프로세스에서 실행)
+# ----------------------------------------------------------
+def update_generator(key, group, variant, entry, n_jobs=-1):
+    """
+    발전기 하나의 RF를 새 날짜만큼 갱신 → {"row": 갱신 내역, "state": 새 상태, "refit": 전체 재학습 결과 dict 또는 None}
+    저장된 모델/상태가 없거나 새 데이터 오차가 기준보다 크게 늘었으면 전체 재학습
+    """
+    _, gen_name = key
+    features = variant["features"]
+    group = group.dropna(subset=features)
+    model_path = os.path.join(_path(variant["model_dir"]), _model_name(variant, gen_name) + ".pkl")
+    row = {"발전기명": gen_name, "동작": "", "새 데이터 수": len(group), "새 데이터 RMSE": np.nan,
+           "기준 RMSE": np.nan, "RMSE 비율": np.nan, "트리 수": np.nan}
+
+    if entry is not None and os.path.exists(model_path):
+        new = group[group["날짜"] > pd.Timestamp(entry["last_date"])]
+        row.update({"새 데이터 수": len(new), "기준 RMSE": entry["baseline_rmse"]})
+        if len(new) < MIN_NEW_ROWS:
+            row["동작"] = "대기" if len(new) else "변경없음"
+            return {"row": row, "state": entry, "refit": None}
+
+        model = joblib.load(model_path)
+        rmse, drift, refit = check_drift(model, new[features], new[TARGET], entry["baseline_rmse"])
+        row.update({"새 데이터 RMSE": round(rmse, 4), "RMSE 비율": round(drift, 3)})
+        if not refit:
+            window = recent_window(group, entry["last_date"])
+            seed = variant["params"].get("random_state", 0) + entry["updates"] + 1
+            grow_forest(model, window[features], window[TARGET],
+                        budget=variant["params"]["n_estimators"], seed=seed, n_jobs=n_jobs)
+            save_model(model, model_name=_model_name(variant, gen_name), output_dir=_path(variant["model_dir"]))
+            print(f"[{variant['name']}] {gen_name} ▶ 트리 추가 (새 데이터 {len(new)}개, RMSE 비율 {drift:.2f})")
+            row.update({"동작": "트리추가", "트리 수": len(model.estimators_)})
+            state = dict(entry, last_date=pd.Timestamp(group["날짜"].max()).strftime("%Y-%m-%d"),
+                         updates=entry["updates"] + 1)
+            return {"row": row, "state": state, "refit": None}
+
+    # 전체 재학습 (기존 학습과 같은 분할/지표/그래프)
+    result = train_generator(key, group, [variant], n_jobs)[variant["name"]]
+    row.update({"동작": "전체재학습", "트리 수": variant["params"]["n_estimators"]})
+    return {"row": row, "state": new_state(group["날짜"].max(), result["RMSE"]), "refit": result}
+
+
+def update(names=None, max_workers=None):
+    """
+    RF 변형(names가 없으면 전체)을 새 데이터만큼 증분 갱신 → {변형 이름: 갱신 내역 DataFrame}
+    내역은 결과 CSV 옆 *_incremental.csv, 전체 재학습한 발전기는 결과 CSV의 해당 행도 교체
+    """
+    variants = [v for v in VARIANTS if v["algorithm"] == "random_forest" and (names is None or v["name"] in names)]
+    tasks, states = [], {}
+    for i, v in enumerate(variants):
+        df, _ = build_features(_path(v["data"]), v["recipe"], v["features"])
+        states[v["name"]] = load_state(state_path(_path(v["model_dir"])))
+        for gen_name, group in df.groupby('발전기명', observed=True):
+            if len(group) < MIN_ROWS:
+                continue
+            tasks.append(((i, gen_name), (group, v, states[v["name"]].get(gen_name)), len(group)))
+
+    finished = dict(run_tasks(update_generator, tasks, max_workers=max_workers))
+
+    outputs = {}
+    for i, v in enumerate(variants):
+        keys = [key for key, _, _ in tasks if key[0] == i]
+        state = states[v["name"]]
+        state.update({key[1]: finished[key]["state"] for key in keys})
+        save_state(state_path(_path(v["model_dir"])), state)
+
+        # 전체 재학습한 모델은 지문도 갱신 (다음 전체 학습에서 건너뜀)
+        manifest = _manifest(v)
+        for key, (group, _, _), _ in tasks:
+            if key[0] == i and finished[key]["refit"] is not None:
+                manifest.record(key[1], _fingerprint(v, group, [v]), finished[key]["refit"])
+
+        refits = [finished[key]["refit"] for key in keys if finished[key]["refit"] is not None]
+        if refits:
+            result_csv = _path(v["result_csv"])
+            results_df = pd.read_csv(result_csv) if os.path.exists(result_csv) else pd.DataFrame()
+            if len(results_df):
+                results_df = results_df[~results_df["발전기명"].isin([r["발전기명"] for r in refits])]
+            results_df = pd.concat([results_df, pd.DataFrame(refits)], ignore_index=True)
+            results_df = results_df.sort_values("발전기명", kind="stable")
+            results_df.to_csv(result_csv, index=False, encoding='utf-8-sig')
+
+        log_df = pd.DataFrame([finished[key]["row"] for key in keys]).astype({"트리 수": "Int64"})
+        log_csv = _path(v["result_csv"]).replace("_results.csv", "_incremental.csv")
+        log_df.to_csv(log_csv, index=False, encoding='utf-8-sig')
+        outputs[v["name"]] = log_df
+        print(f"\n🔁 [{v['name']}] 증분 갱신: {log_df['동작'].value_counts().to_dict()} → {log_csv}")
+    return outputs
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="발전기별 개별 모델 통합 학습")
+    parser.add_argument("--variants", nargs="+", choices=[v["name"] for v in VARIANTS], default=None,
+                        help="학습할 변형 (기본: 전체)")
+    parser.add_argument("--workers", type=int, default=None, help="학습 워커 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--force", action="store_true", help="지문이 같아도 모든 발전기 다시 학습")
+    parser.add_argument("--incremental", action="store_true",
+                        help="RF 변형을 새 날짜만큼 증분 갱신 (필요하면 전체 재학습)")
+    args = parser.parse_args()
+    if args.incremental:
+        update(args.variants, args.workers)
+    else:
+        run(args.variants, args.workers, args.force)
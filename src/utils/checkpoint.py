@@ -0,0 +1,98 @@
+# 장시간 수집/학습 작업의 중단/재개용 체크포인트 유틸리티 파일
+
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+
+class CompletionLedger:
+    """
+    완료된 요청 키(예: 발전기명, 날짜, 시간대)를 한 줄씩 기록하는 장부 파일
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.done = set()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    line = line.rstrip("\n")
+                    if line:
+                        self.done.add(tuple(line.split("\t")))
+        self._file = open(path, "a", encoding="utf-8")
+
+    def __len__(self):
+        return len(self.done)
+
+    def is_done(self, key):
+        return tuple(str(k) for k in key) in self.done
+
+    def mark_done(self, key):
+        """
+        키를 장부에 추가하고 즉시 디스크에 반영
+        """
+        key = tuple(str(k) for k in key)
+        if key in self.done:
+            return
+        self._file.write("\t".join(key) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.done.add(key)
+
+    def close(self):
+        self._file.close()
+
+
+def frame_fingerprint(df, columns, **config):
+    """
+    데이터 조각(columns 값, 행 순서 포함) + 설정값으로 만든 지문 (sha256 hex)
+    """
+    digest = hashlib.sha256()
+    digest.update(pd.util.hash_pandas_object(df[list(columns)], index=False).to_numpy().tobytes())
+    digest.update(json.dumps(config, ensure_ascii=False, sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _json_scalar(value):
+    # numpy 스칼라 → 파이썬 값 (float32는 출력되는 자릿수 그대로 옮겨 CSV로 다시 써도 같은 값)
+    if isinstance(value, np.floating):
+        return float(str(value))
+    if isinstance(value, np.integer):
+        return int(value)
+    raise TypeError(f"JSON으로 저장할 수 없는 값: {value!r}")
+
+
+class FingerprintManifest:
+    """
+    키(예: 발전기명)별 마지막 완료 작업의 지문 + 결과를 보관하는 JSON 파일
+    작업 하나가 끝날 때마다 바로 저장 → 중간에 죽어도 끝난 작업은 다음 실행에서 건너뜀
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+    def matches(self, key, fingerprint):
+        entry = self.entries.get(key)
+        return entry is not None and entry["fingerprint"] == fingerprint
+
+    def result(self, key):
+        return self.entries[key]["result"]
+
+    def record(self, key, fingerprint, result):
+        """
+        지문/결과 기록 후 즉시 디스크에 반영 (임시 파일에 쓴 뒤 교체)
+        """
+        self.entries[key] = {"fingerprint": fingerprint, "result": result}
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, ensure_ascii=False, indent=1, default=_json_scalar)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,342 @@
+# 전처리 결과(중간 데이터셋) Parquet 저장/로드 유틸리티 파일
+#
+# - 각 데이터셋은 같은 이름의 .parquet(기본 형식) + .csv(사람이 보는 용도, utf-8-sig)로 저장
+# - load_dataset()은 CSV 경로를 받아도 옆의 .parquet이 최신이면 그것을 읽음
+#   (없거나 CSV가 더 새로우면 CSV를 한 번 읽어 .parquet을 만들어 둠)
+
+import argparse
+import codecs
+import hashlib
+import json
+import os
+import re
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# 전처리 데이터셋 공통 스키마 (여기 없는 컬럼은 읽은 그대로 유지)
+DATASET_SCHEMA = {
+    "지점": "string",
+    "날짜": "datetime64[ns]",
+    "발전기명": "string",
+    "설비용량(MW)": "float64",
+    "발전량(MWh)": "float64",
+    "평균기온(°C)": "float64",
+    "일강수량(mm)": "float64",
+    "평균 풍속(m/s)": "float64",
+    "평균 상대습도(%)": "float64",
+    "합계 일조시간(hr)": "float64",
+    "합계 일사량(MJ/m2)": "float64",
+}
+
+# 분석/학습용 메모리 절약 스키마 (load_dataset 기본값)
+# - 식별자(지점, 발전기명)는 category, 측정값은 float32 (소수 1~3자리라 float32로 읽어도 같은 값)
+# - 발전량(MWh)은 Wh 단위(소수 6자리)까지 있어 float32로는 값이 바뀌므로 float64 유지
+COMPACT_SCHEMA = dict(DATASET_SCHEMA, **{
+    "지점": "category",
+    "발전기명": "category",
+    "설비용량(MW)": "float32",
+    "평균기온(°C)": "float32",
+    "일강수량(mm)": "float32",
+    "평균 풍속(m/s)": "float32",
+    "평균 상대습도(%)": "float32",
+    "합계 일조시간(hr)": "float32",
+    "합계 일사량(MJ/m2)": "float32",
+})
+
+# 메모리 보고서 기본 대상 (전처리 단계별 결과)
+REPORT_DATASETS = [
+    "data/processed/발전량기상데이터(병합).csv",
+    "data/processed/발전량+기상.csv",
+    "data/outliers_removed/이상치제거_데이터.csv",
+    "data/outliers_removed/이상치제거_THR.csv",
+]
+
+SOURCE_META_KEY = b"re_pv_source_csv"
+
+SNIFF_BYTES = 64 * 1024
+
+
+def sniff_encoding(path, n_bytes=SNIFF_BYTES):
+    """
+    파일 앞부분만 읽어 인코딩 판별: BOM → utf-8-sig / utf-8로 디코딩되면 utf-8 / 아니면 cp949
+    """
+    with open(path, "rb") as f:
+        prefix = f.read(n_bytes)
+    if prefix.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    try:
+        # 잘린 마지막 글자는 오류로 보지 않도록 final=False
+        codecs.getincrementaldecoder("utf-8")().decode(prefix, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        return "cp949"
+
+
+def _norm_col(name):
+    # 컬럼명 비교용: 모든 공백 제거
+    return re.sub(r"\s+", "", str(name))
+
+
+def parquet_path_for(csv_path):
+    return os.path.splitext(csv_path)[0] + ".parquet"
+
+
+def _to_datetime(values):
+    # ISO 형식(YYYY-MM-DD)은 빠른 경로, 섞인 형식이면 한 값씩 해석 (실패 시 NaT)
+    try:
+        return pd.to_datetime(values, format="ISO8601").astype("datetime64[ns]")
+    except (ValueError, TypeError):
+        return pd.to_datetime(values, errors="coerce", format="mixed").astype("datetime64[ns]")
+
+
+def apply_schema(df, schema=DATASET_SCHEMA):
+    """
+    스키마에 있는 컬럼을 정해진 타입으로 변환 (날짜는 변환 실패 시 NaT, 숫자는 NaN)
+    """
+    df = df.copy()
+    for col, dtype in schema.items():
+        if col not in df.columns:
+            continue
+        if dtype.startswith("datetime64"):
+            df[col] = _to_datetime(df[col])
+        elif dtype.startswith("float") or dtype.startswith("int"):
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype(dtype)
+        else:
+            df[col] = df[col].astype(dtype)
+    return df
+
+
+def _file_signature(path):
+    st = os.stat(path)
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest.hexdigest()}
+
+
+def _parquet_is_fresh(csv_path, pq_path):
+    """
+    .parquet에 기록된 원본 CSV 정보와 현재 CSV가 같으면 True
+    (크기+수정시각이 같으면 바로 True, 수정시각만 다르면 내용 해시로 비교)
+    """
+    if not os.path.exists(pq_path):
+        return False
+    if not os.path.exists(csv_path):
+        return True
+    meta = pq.read_schema(pq_path).metadata or {}
+    if SOURCE_META_KEY not in meta:
+        return False
+    source = json.loads(meta[SOURCE_META_KEY])
+    st = os.stat(csv_path)
+    if st.st_size != source["size"]:
+        return False
+    if st.st_mtime_ns == source["mtime_ns"]:
+        return True
+    return _file_signature(csv_path)["sha256"] == source["sha256"]
+
+
+_SOURCE_HASHES = {}   # 같은 프로세스 안에서 재사용: (경로, 크기, 수정시각) → 내용 해시
+
+
+def source_hash(csv_path):
+    """
+    데이터셋 내용 해시 (load_dataset과 같은 최신 판정 기준으로 가능한 한 다시 해시하지 않음)
+    - .parquet이 최신이면 거기 기록된 원본 CSV 해시 사용 (CSV 없이 .parquet만 있어도 동작)
+    - 기록이 없으면 CSV(없으면 .parquet) 파일을 해시하고, 크기/수정시각이 같은 동안 메모리에 보관
+    """
+    pq_path = parquet_path_for(csv_path)
+    path = csv_path if os.path.exists(csv_path) else pq_path
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+    if key not in _SOURCE_HASHES:
+        digest = None
+        if _parquet_is_fresh(csv_path, pq_path):
+            meta = pq.read_schema(pq_path).metadata or {}
+            if SOURCE_META_KEY in meta:
+                digest = json.loads(meta[SOURCE_META_KEY])["sha256"]
+        _SOURCE_HASHES[key] = digest or _file_signature(path)["sha256"]
+    return _SOURCE_HASHES[key]
+
+
+def _write_parquet(df, pq_path, csv_path=None):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if csv_path is not None and os.path.exists(csv_path):
+        metadata = dict(table.schema.metadata or {})
+        metadata[SOURCE_META_KEY] = json.dumps(_file_signature(csv_path)).encode("utf-8")
+        table = table.replace_schema_metadata(metadata)
+    tmp_path = pq_path + ".tmp"
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, pq_path)
+
+
+def save_dataset(df, csv_path, write_csv=True, schema=DATASET_SCHEMA):
+    """
+    스키마 적용 후 .parquet 저장 (+ 사람이 보는 CSV 내보내기)
+    반환: parquet 경로
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(csv_path)), exist_ok=True)
+    df = apply_schema(df, schema)
+    if write_csv:
+        df.to_csv(csv_path, index=False, encoding="utf-8-sig")
+    pq_path = parquet_path_for(csv_path)
+    _write_parquet(df, pq_path, csv_path if write_csv else None)
+    return pq_path
+
+
+def save_dataset_chunks(chunks, csv_path, schema=DATASET_SCHEMA):
+    """
+    청크(DataFrame) 단위로 저장: CSV는 이어 쓰고 Parquet은 row group 단위로 기록
+    (메모리는 청크 크기만큼만 사용, 결과 파일은 save_dataset과 같은 형식)
+    반환: (parquet 경로, 전체 행 수)
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(csv_path)), exist_ok=True)
+    pq_path = parquet_path_for(csv_path)
+    tmp_csv, part_path = csv_path + ".tmp", pq_path + ".part"
+    writer, rows = None, 0
+    try:
+        with open(tmp_csv, "w", encoding="utf-8-sig", newline="") as f:
+            for chunk in chunks:
+                chunk = apply_schema(chunk, schema)
+                chunk.to_csv(f, index=False, header=writer is None)
+                if writer is None:
+                    table = pa.Table.from_pandas(chunk, preserve_index=False)
+                    writer = pq.ParquetWriter(part_path, table.schema)
+                else:
+                    table = pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False)
+                writer.write_table(table)
+                rows += len(chunk)
+        if writer is None:
+            raise ValueError(f"저장할 데이터가 없습니다: {csv_path}")
+        writer.close()
+        os.replace(tmp_csv, csv_path)
+
+        # 원본 CSV 정보는 CSV를 다 쓴 뒤에야 알 수 있으므로 row group을 옮겨 쓰면서 메타데이터 추가
+        part = pq.ParquetFile(part_path)
+        metadata = dict(part.schema_arrow.metadata or {})
+        metadata[SOURCE_META_KEY] = json.dumps(_file_signature(csv_path)).encode("utf-8")
+        tmp_path = pq_path + ".tmp"
+        with pq.ParquetWriter(tmp_path, part.schema_arrow.with_metadata(metadata)) as final:
+            for i in range(part.num_row_groups):
+                final.write_table(part.read_row_group(i))
+        os.replace(tmp_path, pq_path)
+    finally:
+        for path in (tmp_csv, part_path):
+            if os.path.exists(path):
+                os.remove(path)
+    return pq_path, rows
+
+
+def iter_dataset(csv_path, batch_rows=200_000, columns=None, schema=DATASET_SCHEMA):
+    """
+    데이터셋을 batch_rows행씩 나눠 읽기 (최신 .parquet이면 row group 단위, 아니면 CSV 청크)
+    """
+    pq_path = parquet_path_for(csv_path)
+    if _parquet_is_fresh(csv_path, pq_path):
+        for batch in pq.ParquetFile(pq_path).iter_batches(batch_size=batch_rows, columns=columns):
+            yield batch.to_pandas()
+        return
+    reader = pd.read_csv(csv_path, encoding=sniff_encoding(csv_path), usecols=columns, chunksize=batch_rows)
+    for chunk in reader:
+        yield apply_schema(chunk, schema)
+
+
+def load_dataset(csv_path, columns=None, encoding=None, schema=DATASET_SCHEMA, compact=True):
+    """
+    데이터셋 로드 (최신 .parquet 우선, 없으면 CSV를 읽고 .parquet 생성)
+    columns를 주면 해당 컬럼만 읽음 / encoding=None이면 파일 앞부분으로 판별
+    compact=True면 COMPACT_SCHEMA(category/float32)로 변환해 반환
+    (전처리 단계처럼 읽은 값을 다시 저장하는 경우에는 compact=False로 원래 정밀도 유지)
+    """
+    pq_path = parquet_path_for(csv_path)
+    if _parquet_is_fresh(csv_path, pq_path):
+        df = pd.read_parquet(pq_path, columns=columns)
+    else:
+        df = apply_schema(pd.read_csv(csv_path, encoding=encoding or sniff_encoding(csv_path)), schema)
+        try:
+            _write_parquet(df, pq_path, csv_path)
+        except OSError as e:
+            print(f"⚠️ Parquet 캐시 저장 실패 (CSV로 계속 진행): {e}")
+        if columns is not None:
+            df = df[columns]
+    return apply_schema(df, COMPACT_SCHEMA) if compact else df
+
+
+def memory_report(csv_paths=REPORT_DATASETS, base_dir="."):
+    """
+    데이터셋별 메모리 사용량 비교 → DataFrame
+    (문자열을 object로 둔 경우 / 기본 스키마 / 절약 스키마)
+    """
+    rows = []
+    for path in csv_paths:
+        full_path = os.path.join(base_dir, path)
+        if not os.path.exists(full_path) and not os.path.exists(parquet_path_for(full_path)):
+            continue
+        full = load_dataset(full_path, compact=False)
+        as_object = full.astype({c: object for c in full.columns if pd.api.types.is_string_dtype(full[c])})
+        compact = apply_schema(full, COMPACT_SCHEMA)
+        sizes = [df.memory_usage(deep=True).sum() / 2 ** 20 for df in (as_object, full, compact)]
+        rows.append({
+            "데이터셋": os.path.basename(path),
+            "행 수": len(full),
+            "object 문자열(MB)": round(sizes[0], 2),
+            "기본 스키마(MB)": round(sizes[1], 2),
+            "절약 스키마(MB)": round(sizes[2], 2),
+            "감소(배, object 대비)": round(sizes[0] / sizes[2], 2),
+            "감소(배, 기본 대비)": round(sizes[1] / sizes[2], 2),
+        })
+    return pd.DataFrame(rows)
+
+
+def read_table(path, columns=None, dtypes=None, encoding=None, schema=DATASET_SCHEMA):
+    """
+    필요한 컬럼만, 정해진 타입으로 읽기 (CSV/Parquet)
+    - columns: 읽을 컬럼 (공백 차이는 무시하고 매칭, 없는 컬럼은 건너뜀)
+    - dtypes: 컬럼별 타입 (없으면 schema에서 가져옴, 날짜는 datetime64로 파싱)
+    - CSV는 인코딩을 앞부분으로 한 번만 판별, 최신 .parquet이 옆에 있으면 그것을 읽음
+    """
+    ext = os.path.splitext(path)[1].lower()
+    wanted = None if columns is None else {_norm_col(c) for c in columns}
+    types = {_norm_col(k): v for k, v in dict(schema, **(dtypes or {})).items()}
+
+    pq_path = path if ext == ".parquet" else parquet_path_for(path)
+    if ext == ".parquet" or _parquet_is_fresh(path, pq_path):
+        names = pq.read_schema(pq_path).names
+        selected = names if wanted is None else [c for c in names if _norm_col(c) in wanted]
+        return pd.read_parquet(pq_path, columns=selected)
+
+    encoding = encoding or sniff_encoding(path)
+    header = pd.read_csv(path, encoding=encoding, nrows=0).columns
+    selected = list(header) if wanted is None else [c for c in header if _norm_col(c) in wanted]
+
+    dtype, parse_dates = {}, []
+    for col in selected:
+        t = types.get(_norm_col(col))
+        if t is None:
+            continue
+        if t.startswith("datetime64"):
+            parse_dates.append(col)
+        else:
+            dtype[col] = t
+    try:
+        df = pd.read_csv(path, encoding=encoding, usecols=selected, dtype=dtype)
+    except (ValueError, TypeError):
+        # 숫자 칸에 문자가 섞인 경우: 그대로 읽은 뒤 변환 실패 값만 결측 처리
+        df = pd.read_csv(path, encoding=encoding, usecols=selected)
+        df = apply_schema(df, {col: t for col, t in dtype.items()})
+    for col in parse_dates:
+        df[col] = _to_datetime(df[col])
+    return df[selected]
+
+
+if __name__ == "__main__":
+    # 실행: python -m src.utils.data_io [CSV 경로 ...] → 데이터셋별 메모리 사용량 보고
+    parser = argparse.ArgumentParser(description="데이터셋별 메모리 사용량 보고 (기본 스키마 vs 절약 스키마)")
+    parser.add_argument("paths", nargs="*", default=REPORT_DATASETS)
+    args = parser.parse_args()
+
+    repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+    report = memory_report(args.paths, base_dir=repo_root)
+    print(report.to_string(index=False))
@@ -0,0 +1,194 @@
+# 학습용 특성 행렬(전처리 결과) 생성/캐시 유틸리티 파일
+#
+# - 학습 스크립트마다 반복되던 결측 처리를 이름 붙인 전처리 방식(PREPROCESS)으로 모아 둠
+#   (스크립트별로 조금씩 달랐던 처리는 각각 별도 방식으로 그대로 유지)
+# - 날짜별 평균 채우기는 컬럼마다 lambda를 돌리지 않고 groupby().transform('mean') 한 번으로 처리
+# - 결과 행렬은 (원본 CSV 해시 + 전처리 방식 + 특성 목록)을 키로 메모리/디스크(.parquet)에 캐시
+
+import argparse
+import hashlib
+import json
+import os
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.utils.data_io import load_dataset, source_hash
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+CACHE_DIR = os.path.join(REPO_ROOT, "data", "cache", "features")
+CACHE_VERSION = 2   # 전처리 로직이 바뀌면 올려서 기존 캐시 무효화
+INFO_META_KEY = b"re_pv_feature_info"
+
+FEATURES_FULL = ['설비용량(MW)', '평균기온(°C)', '일강수량(mm)', '평균 풍속(m/s)',
+                 '평균 상대습도(%)', '합계 일조시간(hr)', '합계 일사량(MJ/m2)']
+FEATURES_REDUCED = ['설비용량(MW)', '평균기온(°C)', '평균 상대습도(%)', '합계 일사량(MJ/m2)']
+TARGET = '발전량(MWh)'
+ID_COLUMNS = ['지점', '날짜', '발전기명']
+
+# 전처리 방식
+# - fill_zero: 0으로 채울 컬럼
+# - fill_date_mean: 같은 날짜의 평균으로 채울 컬럼 (그날 값이 모두 없으면 NaN 유지)
+# - drop_missing: 결측이면 행을 제거할 컬럼
+# - drop_nonfinite: 원본 CSV의 모든 컬럼 중 하나라도 NaN/inf면 행 제거 (행렬 컬럼으로 줄이기 전에 적용)
+# - drop_zero_target: 발전량 0인 행 제거
+PREPROCESS = {
+    # src/models/individual/*/train_full_model.py
+    "individual_full": {
+        "fill_zero": ['일강수량(mm)'],
+        "fill_date_mean": ['평균기온(°C)', '평균 풍속(m/s)', '평균 상대습도(%)', '합계 일조시간(hr)'],
+        "drop_missing": ['합계 일사량(MJ/m2)'],
+        "drop_nonfinite": False,
+        "drop_zero_target": True,
+    },
+    # src/models/individual/*/train_reduced_model.py
+    "individual_reduced": {
+        "fill_zero": [],
+        "fill_date_mean": ['평균기온(°C)', '평균 상대습도(%)'],
+        "drop_missing": ['합계 일사량(MJ/m2)'],
+        "drop_nonfinite": False,
+        "drop_zero_target": True,
+    },
+    # 통합RF, 발전기별RF, 발전기별_발전량_선형회귀
+    "rain_zero": {
+        "fill_zero": ['일강수량(mm)'],
+        "fill_date_mean": [],
+        "drop_missing": ['합계 일사량(MJ/m2)'],
+        "drop_nonfinite": False,
+        "drop_zero_target": False,
+    },
+    # 발전기별LR 변수 검정 (기존 스크립트처럼 CSV 전체 컬럼 기준으로 무한대/결측이 남은 행까지 제거)
+    "rain_zero_finite": {
+        "fill_zero": ['일강수량(mm)'],
+        "fill_date_mean": [],
+        "drop_missing": ['합계 일사량(MJ/m2)'],
+        "drop_nonfinite": True,
+        "drop_zero_target": False,
+    },
+    # 통합LR (기상 결측을 모두 0으로)
+    "weather_zero": {
+        "fill_zero": ['일강수량(mm)', '평균기온(°C)', '평균 풍속(m/s)', '평균 상대습도(%)', '합계 일조시간(hr)'],
+        "fill_date_mean": [],
+        "drop_missing": ['합계 일사량(MJ/m2)'],
+        "drop_nonfinite": False,
+        "drop_zero_target": False,
+    },
+}
+
+_MEMORY = {}   # 같은 프로세스 안에서 재사용: 캐시 키 → (행렬, 정보)
+
+
+def matrix_columns(df, features):
+    """
+    특성 행렬에 남길 컬럼 (식별 컬럼 + 특성 + 발전량, 중복 없이 원래 순서)
+    """
+    wanted = set(ID_COLUMNS) | set(features) | {TARGET}
+    return [c for c in df.columns if c in wanted]
+
+
+def preprocess(df, recipe, features=FEATURES_FULL):
+    """
+    전처리 방식(recipe: PREPROCESS 이름 또는 dict)대로 결측 처리 → (행렬, 제거 건수 정보)
+    """
+    rules = PREPROCESS[recipe] if isinstance(recipe, str) else recipe
+    if rules["drop_nonfinite"]:
+        # 행렬에 쓰지 않는 컬럼의 결측도 행 제거 기준이므로 컬럼은 마지막에 줄임
+        df = df.copy()
+    else:
+        df = df[matrix_columns(df, list(features) + rules["fill_zero"] + rules["fill_date_mean"] + rules["drop_missing"])].copy()
+    info = {"원본행수": len(df)}
+
+    if rules["fill_zero"]:
+        df[rules["fill_zero"]] = df[rules["fill_zero"]].fillna(0)
+
+    cols = rules["fill_date_mean"]
+    if cols:
+        # 날짜별 평균을 한 번에 계산해서 빈 칸만 채움 (float32 컬럼도 평균은 float64로 계산)
+        daily_mean = df[cols].astype('float64').groupby(df['날짜'], observed=True).transform('mean')
+        df[cols] = df[cols].fillna(daily_mean.astype(df[cols].dtypes.to_dict()))
+
+    before = len(df)
+    df = df.dropna(subset=rules["drop_missing"])
+    info["결측제거"] = before - len(df)
+
+    before = len(df)
+    if rules["drop_nonfinite"]:
+        df = df.replace([np.inf, -np.inf], np.nan).dropna()
+    info["무한대제거"] = before - len(df)
+
+    before = len(df)
+    if rules["drop_zero_target"]:
+        df = df[df[TARGET] != 0]
+    info["발전량0제거"] = before - len(df)
+
+    info["행수"] = len(df)
+    return df[matrix_columns(df, features)], info
+
+
+def cache_key(csv_path, recipe, features):
+    """
+    캐시 키: 원본 데이터 내용 해시(data_io 최신 판정 기준, 매번 다시 해시하지 않음) + 전처리 규칙 + 특성 목록
+    """
+    rules = PREPROCESS[recipe] if isinstance(recipe, str) else recipe
+    payload = {
+        "version": CACHE_VERSION,
+        "source": source_hash(csv_path),
+        "rules": rules,
+        "features": list(features),
+    }
+    return hashlib.sha256(json.dumps(payload, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _cache_path(csv_path, recipe, key, cache_dir):
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    name = recipe if isinstance(recipe, str) else "custom"
+    return os.path.join(cache_dir, f"{stem}_{name}_{key[:16]}.parquet")
+
+
+def build_features(csv_path, recipe="individual_full", features=FEATURES_FULL,
+                   cache_dir=CACHE_DIR, refresh=False):
+    """
+    특성 행렬 로드 (메모리 → 디스크 캐시 → 원본 CSV 순) → (DataFrame, 정보 dict)
+    정보: 원본행수, 결측제거, 무한대제거, 발전량0제거, 행수, 캐시("memory"/"disk"/None)
+    """
+    key = cache_key(csv_path, recipe, features)
+    if not refresh and key in _MEMORY:
+        df, info = _MEMORY[key]
+        return df.copy(), dict(info, 캐시="memory")
+
+    path = _cache_path(csv_path, recipe, key, cache_dir)
+    if not refresh and os.path.exists(path):
+        table = pq.read_table(path)
+        info = json.loads(table.schema.metadata[INFO_META_KEY])
+        df = table.to_pandas()
+        _MEMORY[key] = (df, info)
+        return df.copy(), dict(info, 캐시="disk")
+
+    df, info = preprocess(load_dataset(csv_path), recipe, features)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        table = pa.Table.from_pandas(df)
+        metadata = dict(table.schema.metadata or {})
+        metadata[INFO_META_KEY] = json.dumps(info, ensure_ascii=False).encode("utf-8")
+        tmp_path = path + ".tmp"
+        pq.write_table(table.replace_schema_metadata(metadata), tmp_path)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"⚠️ 특성 행렬 캐시 저장 실패 (계속 진행): {e}")
+    _MEMORY[key] = (df, info)
+    return df.copy(), dict(info, 캐시=None)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="학습용 특성 행렬 생성/캐시")
+    parser.add_argument("csv_path")
+    parser.add_argument("--recipe", default="individual_full", choices=sorted(PREPROCESS))
+    parser.add_argument("--reduced", action="store_true", help="축소 특성(FEATURES_REDUCED) 사용")
+    parser.add_argument("--refresh", action="store_true", help="캐시를 무시하고 다시 생성")
+    args = parser.parse_args()
+
+    features = FEATURES_REDUCED if args.reduced else FEATURES_FULL
+    df, info = build_features(args.csv_path, args.recipe, features, refresh=args.refresh)
+    print(f"✅ 특성 행렬 {df.shape} (캐시: {info['캐시'] or '새로 생성'})")
+    print(json.dumps(info, ensure_ascii=False))
@@ -0,0 +1,88 @@
+# 발전기별 랜덤포레스트 증분 갱신 유틸리티 파일
+#
+# - 새 날짜가 들어오면 최근 구간(WINDOW_DAYS)으로 트리를 NEW_TREES개 더 키우고(warm_start),
+#   가장 오래된 트리부터 버려 전체 트리 수를 예산(학습 때 n_estimators) 안으로 유지
+# - 갱신 전 모델로 새 날짜를 예측한 RMSE가 마지막 전체 학습 때 RMSE의 DRIFT_RATIO배를 넘으면 전체 재학습
+# - 발전기별 상태(마지막 학습 날짜, 기준 RMSE, 증분 횟수)는 모델 폴더의 JSON 파일에 보관
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import mean_squared_error
+
+STATE_FILE = "incremental_state.json"
+NEW_TREES = 50       # 한 번 갱신할 때 추가하는 트리 수
+WINDOW_DAYS = 365    # 새 트리를 학습할 최근 구간 (새 날짜 포함)
+MIN_NEW_ROWS = 7     # 새 데이터가 이보다 적으면 갱신하지 않고 다음 실행까지 모음
+DRIFT_RATIO = 1.5    # 새 데이터 RMSE / 기준 RMSE가 이 값을 넘으면 전체 재학습
+
+
+def state_path(model_dir):
+    return os.path.join(model_dir, STATE_FILE)
+
+
+def load_state(path):
+    """
+    발전기별 상태 로드 → {발전기명: {"last_date", "baseline_rmse", "updates"}}
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_state(path, state):
+    """
+    상태 저장 (임시 파일에 쓴 뒤 교체)
+    """
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def new_state(last_date, baseline_rmse):
+    """
+    전체 학습 직후의 상태
+    """
+    return {"last_date": pd.Timestamp(last_date).strftime("%Y-%m-%d"),
+            "baseline_rmse": float(baseline_rmse), "updates": 0}
+
+
+def check_drift(model, X_new, y_new, baseline_rmse, ratio=DRIFT_RATIO):
+    """
+    갱신 전 모델로 새 데이터 예측 → (새 데이터 RMSE, 기준 대비 비율, 전체 재학습 필요 여부)
+    """
+    rmse = mean_squared_error(y_new, model.predict(X_new)) ** 0.5
+    drift = rmse / baseline_rmse if baseline_rmse > 0 else np.inf
+    return rmse, drift, drift > ratio
+
+
+def grow_forest(model, X, y, new_trees=NEW_TREES, budget=None, seed=None, n_jobs=None):
+    """
+    warm_start로 트리 new_trees개를 (X, y)에 추가 학습하고, 오래된 트리를 버려 budget개로 맞춤
+    budget=None이면 현재 트리 수 유지 / seed를 주면 새 트리의 난수 시드를 바꿈 (이전 갱신과 겹치지 않도록)
+    """
+    budget = budget or len(model.estimators_)
+    model.set_params(warm_start=True, n_estimators=len(model.estimators_) + new_trees)
+    if seed is not None:
+        model.set_params(random_state=seed)
+    if n_jobs is not None:
+        model.set_params(n_jobs=n_jobs)
+    model.fit(X, y)
+
+    # 앞쪽(오래된) 트리부터 제거
+    model.estimators_ = model.estimators_[-budget:]
+    model.set_params(warm_start=False, n_estimators=len(model.estimators_))
+    return model
+
+
+def recent_window(group, last_date, date_col="날짜", days=WINDOW_DAYS):
+    """
+    새 트리 학습 구간: 가장 최근 날짜에서 days일 이내 (새 날짜 포함)
+    """
+    end = pd.Timestamp(group[date_col].max())
+    start = min(end - pd.Timedelta(days=days), pd.Timestamp(last_date))
+    return group[group[date_col] > start]
@@ -0,0 +1,124 @@
+# 정렬/색인 기반 조인 유틸리티 파일
+#
+# - 조인 키를 문자열로 바꾸지 않고 datetime64(일 단위) / 범주형 코드 그대로 사용
+# - 오른쪽 표(기상, 일사량 등)는 한 번만 정렬·색인(KeyIndex)하고,
+#   왼쪽 표(발전량)는 청크 단위로 넣어 np.searchsorted로 찾음 → 메모리 사용량은 청크 크기 + 색인 크기
+# - 결과는 pd.merge(how='left')와 같음 (왼쪽 행 순서 유지, 여러 건 일치 시 오른쪽 원래 순서로 반복)
+#   단, 키가 결측(NaT/NaN)인 행은 매칭하지 않음
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CHUNK_ROWS = 200_000
+
+
+def to_date_key(values):
+    """
+    날짜 키를 datetime64[ns] 일 단위로 변환 ('2023.9.1', '2023-09-01' 등, 변환 실패는 NaT)
+    """
+    if not pd.api.types.is_datetime64_any_dtype(values):
+        values = pd.to_datetime(values, errors="coerce")
+    return pd.Series(values).astype("datetime64[ns]").dt.normalize()
+
+
+class KeyIndex:
+    """
+    오른쪽 표를 조인 키 기준으로 한 번 정렬해 둔 색인
+    - keys: 조인 키 컬럼 목록 / date_keys: 그중 날짜 키 (일 단위로 맞춤)
+    - 키 컬럼별 고유값(categories)을 정렬해 두고, 키 조합을 하나의 int64 코드로 합쳐 정렬
+    """
+
+    def __init__(self, df, keys, date_keys=()):
+        self.keys = list(keys)
+        self.date_keys = set(date_keys)
+        self.categories, codes = [], []
+        for key in self.keys:
+            values = self._key_values(df[key], key)
+            cat = pd.Categorical(values)
+            self.categories.append(cat.categories)
+            codes.append(cat.codes.astype(np.int64))
+
+        sizes = [max(len(c), 1) for c in self.categories]
+        self.strides = np.cumprod([1] + sizes[:0:-1])[::-1].astype(np.int64)
+        combined = self._combine(codes)
+        valid = np.flatnonzero(combined >= 0)
+        order = valid[np.argsort(combined[valid], kind="stable")]
+        self.sorted_codes = combined[order]
+        self.order = order
+        self.table = df.reset_index(drop=True)
+
+    def _key_values(self, values, key):
+        if key in self.date_keys:
+            return to_date_key(values)
+        return values
+
+    def _combine(self, codes):
+        combined = np.zeros(len(codes[0]), dtype=np.int64)
+        missing = np.zeros(len(codes[0]), dtype=bool)
+        for code, stride in zip(codes, self.strides):
+            missing |= code < 0
+            combined += code * stride
+        combined[missing] = -1
+        return combined
+
+    def encode(self, df, on):
+        """
+        왼쪽 표의 키 컬럼(on, self.keys와 같은 순서)을 같은 int64 코드로 변환 (색인에 없는 값은 -1)
+        """
+        codes = []
+        for key, left_key, categories in zip(self.keys, on, self.categories):
+            values = df[left_key]
+            if isinstance(values.dtype, pd.CategoricalDtype) and values.cat.categories.equals(categories):
+                codes.append(values.cat.codes.to_numpy(dtype=np.int64))   # 같은 범주면 코드 그대로 사용
+                continue
+            values = self._key_values(values, key)
+            codes.append(categories.get_indexer(pd.Index(values)).astype(np.int64))
+        return self._combine(codes)
+
+    def lookup(self, df, on):
+        """
+        왼쪽 조인 위치 계산 → (왼쪽 행 번호, 오른쪽 행 번호(일치 없으면 -1)) 배열
+        """
+        left_codes = self.encode(df, on)
+        lo = np.searchsorted(self.sorted_codes, left_codes, side="left")
+        hi = np.searchsorted(self.sorted_codes, left_codes, side="right")
+        counts = np.where(left_codes >= 0, hi - lo, 0)
+
+        repeats = np.maximum(counts, 1)
+        left_idx = np.repeat(np.arange(len(df)), repeats)
+        offsets = np.arange(len(left_idx)) - np.repeat(np.cumsum(repeats) - repeats, repeats)
+        matched = np.repeat(counts > 0, repeats)
+        positions = np.repeat(lo, repeats) + offsets
+        right_idx = np.where(matched, self.order[np.minimum(positions, len(self.order) - 1)], -1) \
+            if len(self.order) else np.full(len(left_idx), -1)
+        return left_idx, right_idx
+
+
+def left_join(left, index, on, columns=None, suffixes=("_x", "_y")):
+    """
+    left 기준 왼쪽 조인 (pd.merge(how='left')와 같은 결과)
+    - on: 왼쪽 키 컬럼 (index.keys와 같은 순서)
+    - columns: 붙일 오른쪽 컬럼 (기본: 오른쪽 키를 뺀 전체)
+    - 이름이 겹치는 키가 아닌 컬럼은 suffixes를 붙임
+    """
+    right = index.table
+    if columns is None:
+        columns = [c for c in right.columns if c not in index.keys]
+    left_idx, right_idx = index.lookup(left, on)
+
+    overlap = set(columns) & (set(left.columns) - set(on))
+    out = left.iloc[left_idx].reset_index(drop=True)
+    if overlap:
+        out = out.rename(columns={c: c + suffixes[0] for c in overlap})
+    for col in columns:
+        name = col + suffixes[1] if col in overlap else col
+        out[name] = right[col].array.take(right_idx, allow_fill=True)
+    return out
+
+
+def left_join_chunks(chunks, index, on, columns=None, suffixes=("_x", "_y")):
+    """
+    왼쪽 표를 청크 단위로 조인 (청크별 결과를 차례로 반환)
+    """
+    for chunk in chunks:
+        yield left_join(chunk, index, on, columns, suffixes)
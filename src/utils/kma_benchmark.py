@@ -0,0 +1,119 @@
+# 수집 스크립트 종단 간(end-to-end) 벤치마크 유틸리티 파일
+#
+# 실행: python -m src.utils.kma_benchmark --fetchers forecast daily --latency 0.05 --p429 0.05
+# 각 수집 스크립트를 모의 서버(kma_simulator)에 연결해 임시 폴더에서 실행하고
+# 초당 요청 수 / 재시도 횟수 / 전체 수집 시간 / 재실행(캐시·장부) 시간을 보고
+# - weather(1년치 위성 일사 백필)는 기본으로 SHORT_PERIOD(1주일)만 수집, --full이면 스크립트 설정 기간 전체
+#   (1년치는 초당 5건 기준 약 1만 4천 건 요청으로 수십 분 걸림)
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from src.utils.kma_simulator import KMASimulator, add_fault_arguments, faults_from_args
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+WEB_DIR = os.path.join(REPO_ROOT, "웹페이지기상및코드", "웹페이지")
+DAILY_DIR = os.path.join(REPO_ROOT, "웹페이지기상및코드", "과거기상데이터_일별")
+
+# 이름: (스크립트 경로, 작업 폴더로 복사할 입력 파일, 기본 실행 때 덮어쓸 환경변수(수집 기간 단축))
+SHORT_PERIOD = {"KMA_START_DATE": "20240101", "KMA_END_DATE": "20240107"}
+FETCHERS = {
+    "weather": (os.path.join(WEB_DIR, "weather.py"), [os.path.join(WEB_DIR, "locations.csv")], SHORT_PERIOD),
+    "forecast": (os.path.join(WEB_DIR, "예측api.py"), [os.path.join(WEB_DIR, "locations.csv")], {}),
+    "daily": (os.path.join(DAILY_DIR, "일별날씨.py"), [], {}),
+}
+
+
+def run_fetcher(script, work_dir, base_url, cache_dir, timeout=None, extra_env=None):
+    """
+    스크립트를 work_dir에서 실행 → (소요 시간(초), 종료 코드)
+    출력은 work_dir/run_*.log에 저장 / extra_env: 추가로 넘길 환경변수
+    """
+    env = dict(os.environ, KMA_BASE_URL=base_url, KMA_CACHE_DIR=cache_dir, KMA_CACHE_MODE="normal",
+               PYTHONIOENCODING="utf-8", **(extra_env or {}))
+    log_path = os.path.join(work_dir, f"run_{int(time.time() * 1000)}.log")
+    start = time.perf_counter()
+    with open(log_path, "w", encoding="utf-8") as log:
+        try:
+            code = subprocess.run([sys.executable, script], cwd=work_dir, env=env, stdout=log,
+                                  stderr=subprocess.STDOUT, timeout=timeout).returncode
+        except subprocess.TimeoutExpired:
+            code = "timeout"
+    return time.perf_counter() - start, code
+
+
+def benchmark_fetcher(name, simulator, timeout=None, keep_dir=False, full=False):
+    """
+    수집기 1개를 빈 캐시로 한 번, 같은 폴더/캐시로 한 번 더 실행하여 결과 dict 반환
+    full=False면 FETCHERS의 단축 기간으로 실행
+    """
+    script, inputs, short_env = FETCHERS[name]
+    extra_env = None if full else short_env
+    work_dir = tempfile.mkdtemp(prefix=f"kma_bench_{name}_")
+    for path in inputs:
+        shutil.copy(path, work_dir)
+    cache_dir = os.path.join(work_dir, "kma_cache")
+
+    simulator.reset_stats()
+    cold_time, cold_code = run_fetcher(script, work_dir, simulator.url, cache_dir, timeout, extra_env)
+    stats = simulator.stats_snapshot()
+
+    simulator.reset_stats()
+    warm_time, warm_code = run_fetcher(script, work_dir, simulator.url, cache_dir, timeout, extra_env)
+    warm_stats = simulator.stats_snapshot()
+
+    requests_made = stats.get("requests", 0)
+    result = {
+        "수집기": name,
+        "요청 수": requests_made,
+        "초당 요청": round(requests_made / cold_time, 2) if cold_time else None,
+        "재시도(429/500)": stats.get("status:429", 0) + stats.get("status:500", 0),
+        "오류 본문": stats.get("fault:error_body", 0),
+        "빈 응답": stats.get("fault:empty", 0),
+        "Long 포맷": stats.get("fault:long_format", 0),
+        "수집 시간(초)": round(cold_time, 2),
+        "재실행 요청 수": warm_stats.get("requests", 0),
+        "재실행 시간(초)": round(warm_time, 2),
+        "종료 코드": f"{cold_code}/{warm_code}",
+        "작업 폴더": work_dir if keep_dir else "",
+    }
+    if not keep_dir:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="수집 스크립트 벤치마크 (로컬 모의 서버 사용)")
+    parser.add_argument("--fetchers", nargs="+", choices=list(FETCHERS), default=list(FETCHERS))
+    parser.add_argument("--timeout", type=float, default=None, help="수집기 1회 실행 제한 시간(초)")
+    parser.add_argument("--keep", action="store_true", help="작업 폴더(출력/로그) 남기기")
+    parser.add_argument("--full", action="store_true",
+                        help="weather를 단축 기간(1주일) 대신 스크립트 설정 기간 전체(1년치 백필)로 실행")
+    parser.add_argument("--output", default=None, help="결과를 저장할 CSV 경로")
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+
+    simulator = KMASimulator(faults=faults_from_args(args), recordings_dir=args.recordings, seed=args.seed).start()
+    print(f"모의 서버: {simulator.url} / 장애 설정: {simulator.faults}\n")
+
+    results = []
+    try:
+        for name in args.fetchers:
+            print(f"▶ {name} 실행 중...")
+            results.append(benchmark_fetcher(name, simulator, args.timeout, args.keep, args.full))
+            print(f"   → {results[-1]['요청 수']}건, {results[-1]['수집 시간(초)']}초\n")
+    finally:
+        simulator.stop()
+
+    df_results = pd.DataFrame(results)
+    print(df_results.to_string(index=False))
+    if args.output:
+        df_results.to_csv(args.output, index=False, encoding="utf-8-sig")
+        print(f"\n결과 저장: {args.output}")
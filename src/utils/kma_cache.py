@@ -0,0 +1,160 @@
+# 기상청 API 응답 디스크 캐시 유틸리티 파일
+
+import datetime
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlparse
+
+CACHE_DIR = os.environ.get(
+    "KMA_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "data", "cache", "kma"))
+
+# normal: 캐시 우선 + 미스 시 요청 / replay: 캐시만 사용(네트워크 금지) / refresh: 항상 새로 요청 후 갱신
+CACHE_MODE = os.environ.get("KMA_CACHE_MODE", "normal")
+
+MAX_CACHE_BYTES = 2 * 1024 ** 3     # 2GB 초과 시 오래 안 쓴 응답부터 삭제
+NWP_TTL = 6 * 3600                  # 수치예보(NWP)는 6시간
+RECENT_OBS_TTL = 3600               # 오늘이 포함된 관측 구간은 1시간
+
+# 캐시 키에서 제외할 파라미터 (인증키가 바뀌어도 같은 응답)
+IGNORED_PARAMS = {"authKey"}
+
+KST = datetime.timezone(datetime.timedelta(hours=9))
+
+
+def normalize_request(url, params=None):
+    """
+    (엔드포인트 경로, 정렬된 파라미터) 형태로 요청을 정규화
+    """
+    parsed = urlparse(url)
+    merged = {}
+    if parsed.query:
+        for pair in parsed.query.split("&"):
+            k, _, v = pair.partition("=")
+            merged[k] = v
+    for k, v in (params or {}).items():
+        merged[k] = v
+    items = sorted((k, str(v)) for k, v in merged.items() if k not in IGNORED_PARAMS)
+    return parsed.path, items
+
+
+def cache_key(url, params=None):
+    endpoint, items = normalize_request(url, params)
+    raw = json.dumps([endpoint, items], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def default_ttl(url, params=None):
+    """
+    TTL 정책 (초, None이면 영구 보관)
+    - 수치예보(nph_sun_nwp_txt): 짧게
+    - 관측 자료: 종료일이 오늘 이전이면 영구, 오늘 이후가 포함되면 짧게
+    """
+    endpoint, items = normalize_request(url, params)
+    params = dict(items)
+    if "nwp" in endpoint:
+        return NWP_TTL
+
+    end = params.get("tm2") or params.get("tm")
+    if end:
+        today = datetime.datetime.now(KST).strftime("%Y%m%d")
+        if end[:8] < today:
+            return None
+    return RECENT_OBS_TTL
+
+
+class KMACache:
+    """
+    엔드포인트+정규화 파라미터 해시를 키로 응답 본문을 저장하는 디스크 캐시 (크기 제한 LRU)
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, mode=CACHE_MODE, max_bytes=MAX_CACHE_BYTES, ttl_policy=default_ttl):
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.mode = mode
+        self.max_bytes = max_bytes
+        self.ttl_policy = ttl_policy
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(os.path.join(self.cache_dir, "objects"), exist_ok=True)
+
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(os.path.join(self.cache_dir, "index.db"), check_same_thread=False)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, endpoint TEXT, size INTEGER, encoding TEXT,"
+            " created REAL, expires REAL, last_access REAL)")
+        self.db.commit()
+
+    def _object_path(self, key):
+        return os.path.join(self.cache_dir, "objects", key[:2], key)
+
+    def get(self, url, params=None):
+        """
+        캐시된 (본문 bytes, 인코딩) 반환, 없거나 만료면 None
+        """
+        if self.mode == "refresh":
+            return None
+        key = cache_key(url, params)
+        now = time.time()
+        with self.lock:
+            row = self.db.execute("SELECT encoding, expires FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None or (row[1] is not None and row[1] < now and self.mode != "replay"):
+                self.misses += 1
+                return None
+            try:
+                with open(self._object_path(key), "rb") as f:
+                    content = f.read()
+            except FileNotFoundError:
+                self.db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self.db.commit()
+                self.misses += 1
+                return None
+            self.db.execute("UPDATE entries SET last_access = ? WHERE key = ?", (now, key))
+            self.db.commit()
+            self.hits += 1
+        return content, row[0]
+
+    def put(self, url, params, content, encoding=None):
+        key = cache_key(url, params)
+        endpoint, _ = normalize_request(url, params)
+        ttl = self.ttl_policy(url, params)
+        now = time.time()
+        path = self._object_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, endpoint, len(content), encoding, now, None if ttl is None else now + ttl, now))
+            self.db.commit()
+            self._evict()
+
+    def _evict(self):
+        """
+        전체 크기가 max_bytes를 넘으면 마지막 사용 시각이 오래된 항목부터 삭제
+        """
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self.db.execute("SELECT key, size FROM entries ORDER BY last_access").fetchall():
+            try:
+                os.remove(self._object_path(key))
+            except FileNotFoundError:
+                pass
+            self.db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+        self.db.commit()
+
+    def close(self):
+        self.db.close()
@@ -0,0 +1,201 @@
+# 기상청 API허브 병렬 요청용 유틸리티 파일
+
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# 테스트/오프라인 실행 시 KMA_BASE_URL 환경변수로 로컬 서버 지정 가능
+KMA_BASE_URL = os.environ.get("KMA_BASE_URL", "https://apihub.kma.go.kr")
+
+
+class TokenBucket:
+    """
+    초당 rate개씩 토큰을 채우는 토큰 버킷 (최대 burst개까지 보관)
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.capacity = float(burst if burst is not None else max(1, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def pause(self, seconds):
+        """
+        429 응답 시 모든 작업자가 함께 쉬도록 버킷 전체를 일시 정지
+        """
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.tokens = 0.0
+
+    def acquire(self):
+        """
+        토큰 1개를 얻을 때까지 대기
+        """
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    wait_time = self.paused_until - now
+                else:
+                    self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                    self.updated = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait_time = (1 - self.tokens) / self.rate
+            time.sleep(wait_time)
+
+
+class KMAFetcher:
+    """
+    토큰 버킷 속도 제한 + 동시 요청 수 제한 + HTTP 429 자동 백오프를 적용한 요청기
+    (cache를 넘기면 응답을 디스크 캐시에서 먼저 찾음)
+    """
+
+    def __init__(self, rate=5.0, burst=None, max_workers=8, max_retries=5,
+                 backoff=2.0, max_backoff=60.0, timeout=30, cache=None):
+        self.bucket = TokenBucket(rate, burst)
+        self.cache = cache
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.retry_count = 0
+        self.request_count = 0
+        self._count_lock = threading.Lock()
+        self._cancelled = threading.Event()
+
+        # keep-alive 연결을 작업자 수만큼 재사용
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _backoff_time(self, attempt, response=None):
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after:
+            try:
+                return min(self.max_backoff, float(retry_after))
+            except ValueError:
+                pass
+        delay = min(self.max_backoff, self.backoff * (2 ** attempt))
+        return delay * (0.5 + random.random() / 2)
+
+    def get(self, url, params=None):
+        """
+        단일 요청 (429/5xx/네트워크 오류는 max_retries까지 재시도)
+        반환: {'status', 'text', 'content', 'error', 'retries', 'cached'}
+        """
+        result = {"status": None, "text": "", "content": b"", "error": None, "retries": 0, "cached": False}
+
+        if self.cache is not None:
+            hit = self.cache.get(url, params)
+            if hit is not None:
+                content, encoding = hit
+                result.update(status=200, content=content, cached=True,
+                              text=content.decode(encoding or "utf-8", errors="replace"))
+                return result
+            if self.cache.mode == "replay":
+                result["error"] = "캐시 미스 (replay 모드에서는 네트워크 요청을 하지 않음)"
+                return result
+
+        for attempt in range(self.max_retries + 1):
+            if self._cancelled.is_set():
+                result["error"] = "마감 시간 초과로 요청 취소"
+                return result
+            self.bucket.acquire()
+            with self._count_lock:
+                self.request_count += 1
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+            except requests.exceptions.RequestException as e:
+                result["status"], result["error"] = None, e
+                if attempt < self.max_retries:
+                    self._count_retry(result)
+                    time.sleep(self._backoff_time(attempt))
+                    continue
+                return result
+
+            result["status"], result["error"] = response.status_code, None
+            result["content"], result["text"] = response.content, response.text
+            if response.status_code == 429 or response.status_code >= 500:
+                if attempt < self.max_retries:
+                    delay = self._backoff_time(attempt, response)
+                    if response.status_code == 429:
+                        # 트래픽 제한은 전체 작업자 공통이므로 버킷 자체를 멈춤
+                        self.bucket.pause(delay)
+                    else:
+                        time.sleep(delay)
+                    self._count_retry(result)
+                    continue
+            elif response.status_code == 200 and self.cache is not None and self._cacheable(result["text"]):
+                self.cache.put(url, params, response.content, response.encoding)
+            return result
+        return result
+
+    @staticmethod
+    def _cacheable(text):
+        text = text.strip()
+        return not (text.startswith("#ERROR") or text.startswith("<Error>"))
+
+    def _count_retry(self, result):
+        result["retries"] += 1
+        with self._count_lock:
+            self.retry_count += 1
+
+    def fetch_all(self, jobs, deadline=None):
+        """
+        jobs: (key, url, params) 반복자
+        완료되는 순서대로 (key, result)를 yield (진행 중 요청은 max_workers*2개로 제한)
+        deadline(초)이 지나면 남은 요청은 보내지 않고, 끝나지 않은 요청은 error가 채워진 결과로 yield
+        """
+        jobs = iter(jobs)
+        in_flight = {}
+        self._cancelled.clear()
+        end_time = None if deadline is None else time.monotonic() + deadline
+        pool = ThreadPoolExecutor(max_workers=self.max_workers)
+
+        def submit_next():
+            try:
+                key, url, params = next(jobs)
+            except StopIteration:
+                return False
+            in_flight[pool.submit(self.get, url, params)] = key
+            return True
+
+        try:
+            while len(in_flight) < self.max_workers * 2 and submit_next():
+                pass
+
+            while in_flight:
+                timeout = None if end_time is None else max(0.0, end_time - time.monotonic())
+                done, _ = wait(list(in_flight), timeout=timeout, return_when=FIRST_COMPLETED)
+                if not done:
+                    break
+                for future in done:
+                    key = in_flight.pop(future)
+                    submit_next()
+                    yield key, future.result()
+
+            if in_flight:
+                # 마감 초과: 대기/재시도 중인 요청을 멈추고 미완료 키를 모두 보고
+                self._cancelled.set()
+                timeout_result = {"status": None, "text": "", "content": b"", "error": "마감 시간 초과",
+                                  "retries": 0, "cached": False}
+                for key in list(in_flight.values()):
+                    yield key, dict(timeout_result)
+                for key, _, _ in jobs:
+                    yield key, dict(timeout_result)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def close(self):
+        self.session.close()
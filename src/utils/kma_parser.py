@@ -0,0 +1,132 @@
+# 기상청 API Wide 포맷(| 구분 표) 응답 파서 유틸리티 파일
+
+import time
+
+import numpy as np
+import pandas as pd
+
+KST_OFFSET = np.timedelta64(9, "h")   # 한국은 서머타임이 없으므로 UTC+9 고정
+NAN_TOKENS = ("nan", "-nan")
+
+# 고정 길이 숫자 시각 형식 → 자릿수 (정수 연산으로 바로 datetime64 변환)
+DIGIT_FORMATS = {"%Y%m%d%H%M": 12, "%Y%m%d%H": 10, "%Y%m%d": 8}
+
+
+def _digits_to_datetime64(headers, n_digits):
+    """
+    'YYYYMMDD[HH[MM]]' 숫자 문자열 배열을 정수 연산만으로 datetime64[ns]로 변환
+    (없는 날짜/시각은 다음 달로 넘기지 않고 NaT: 예) 20240230, 24시, 60분)
+    """
+    stamps = np.asarray(headers, dtype=np.int64)
+    minute = hour = np.zeros(len(stamps), dtype=np.int64)
+    if n_digits == 12:
+        stamps, minute = np.divmod(stamps, 100)
+    if n_digits >= 10:
+        stamps, hour = np.divmod(stamps, 100)
+    stamps, day = np.divmod(stamps, 100)
+    year, month = np.divmod(stamps, 100)
+
+    valid = (month >= 1) & (month <= 12) & (day >= 1) & (hour <= 23) & (minute <= 59)
+    months = ((year - 1970) * 12 + np.clip(month, 1, 12) - 1).astype("datetime64[M]")
+    first_day = months.astype("datetime64[D]")
+    days_in_month = ((months + 1).astype("datetime64[D]") - first_day).astype(np.int64)
+    valid &= day <= days_in_month
+
+    times = (first_day + (day - 1).astype("timedelta64[D]")
+             + hour.astype("timedelta64[h]") + minute.astype("timedelta64[m]")).astype("datetime64[ns]")
+    times[~valid] = np.datetime64("NaT")
+    return times
+
+
+def _to_datetime64(headers, time_format):
+    n_digits = DIGIT_FORMATS.get(time_format)
+    if n_digits and all(len(h) == n_digits and h.isdigit() for h in headers):
+        return _digits_to_datetime64(headers, n_digits)
+    return pd.to_datetime(np.asarray(headers), format=time_format, errors="coerce").to_numpy("datetime64[ns]")
+
+
+def _to_float64(values):
+    try:
+        return np.asarray(values, dtype=np.float64), None
+    except ValueError:
+        # 숫자가 아닌 칸이 섞인 경우에만 느린 경로: 변환 실패 칸은 버리고 'nan'/'-nan'은 결측값으로 유지
+        raw = np.asarray(values)
+        numbers = pd.to_numeric(raw, errors="coerce").astype(np.float64)
+        return numbers, ~np.isnan(numbers) | np.isin(np.char.lower(raw), NAN_TOKENS)
+
+
+def parse_wide_table(text_data, time_format="%Y%m%d%H%M", utc_to_kst=False, n_meta=4):
+    """
+    '|'로 구분된 헤더/값 2줄 표를 한 번에 분해하여 (시각 배열, 값 배열) 반환
+    - 앞의 n_meta개 열(위경도 등)은 건너뛰고 나머지 시각 열만 사용
+    - 시각/값 변환은 각각 한 번의 벡터화 연산으로 처리
+    - utc_to_kst=True면 UTC 시각을 KST(+9시간, 시간대 정보 없음)로 변환
+    - 형식이 맞지 않으면 None
+    """
+    table_lines = [line for line in text_data.splitlines() if line.lstrip().startswith("|")]
+    if len(table_lines) < 2:
+        return None
+
+    headers = table_lines[0].replace("|", " ").split()[n_meta:]
+    values = table_lines[1].replace("|", " ").split()[n_meta:]
+    if not headers or len(headers) != len(values):
+        return None
+
+    times = _to_datetime64(headers, time_format)
+    numbers, valid = _to_float64(values)
+    if np.isnat(times).any():
+        valid = ~np.isnat(times) if valid is None else valid & ~np.isnat(times)
+    if valid is not None:
+        times, numbers = times[valid], numbers[valid]
+    if len(times) == 0:
+        return None
+
+    if utc_to_kst:
+        times = times + KST_OFFSET
+    return times, numbers
+
+
+def _legacy_parse(text_data, time_format):
+    # 벤치마크 비교용: 기존 weather.py의 시각별 루프 방식
+    lines = text_data.strip().split("\n")
+    table_lines = [line.strip() for line in lines if line.strip().startswith("|")]
+    headers = [h.strip() for h in table_lines[0].split("|") if h.strip()]
+    values = [v.strip() for v in table_lines[1].split("|") if v.strip()]
+    parsed_data = []
+    for dt_str, si_val in zip(headers[4:], values[4:]):
+        try:
+            dt_obj = pd.to_datetime(dt_str, format=time_format)
+            si = float(si_val.replace("-nan", "NaN"))
+        except ValueError:
+            continue
+        parsed_data.append({"발전기명": "벤치마크", "DATETIME": dt_obj, "SI": si})
+    return pd.DataFrame(parsed_data)
+
+
+def benchmark(n_slots=24, repeat=200):
+    """
+    응답 1건당 파싱 시간 비교 (기존 루프 방식 vs 벡터화 방식)
+    """
+    times = pd.date_range("2024-01-01", periods=n_slots, freq="30min").strftime("%Y%m%d%H%M")
+    vals = ["-nan" if i % 7 == 0 else f"{i * 1.5:.1f}" for i in range(n_slots)]
+    text = ("#START7777\n| LAT | LON | X | Y | " + " | ".join(times) + " |\n"
+            "| 37.5 | 126.9 | 1 | 2 | " + " | ".join(vals) + " |\n#7777END\n")
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        _legacy_parse(text, "%Y%m%d%H%M")
+    legacy = (time.perf_counter() - start) / repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        parse_wide_table(text)
+    vectorized = (time.perf_counter() - start) / repeat
+
+    print(f"시각 {n_slots}개 응답 1건 파싱: 기존 {legacy * 1e3:.3f}ms → 벡터화 {vectorized * 1e3:.3f}ms "
+          f"({legacy / vectorized:.1f}배)")
+    return legacy, vectorized
+
+
+if __name__ == "__main__":
+    benchmark(n_slots=24)
+    benchmark(n_slots=6)
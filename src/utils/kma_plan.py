@@ -0,0 +1,89 @@
+# 기상청 API 요청 계획(가까운 발전소 요청 공유, 시각 구간 분할) 유틸리티 파일
+
+import numpy as np
+import pandas as pd
+
+# 자료별로 한 번의 요청을 나눠 쓸 발전소 간 최대 거리(km)
+# - 천리안 2A(정지궤도 투영)와 KIM(자체 격자)의 실제 격자점을 여기서 계산하지 않으므로,
+#   같은 격자점을 쓴다고 봐도 될 만큼 가까운 발전소만 묶는 근사 (격자 간격의 약 1/4)
+SHARE_DISTANCE_KM = {
+    "sat": 0.5,     # 천리안 2A 일사 분석장 (약 2km)
+    "nwp": 3.0,     # KIM 전지구 수치예보 (약 12km)
+}
+
+# 엔드포인트별 1회 요청당 최대 시각 수
+SLOT_LIMITS = {
+    "sat": 24,      # nph_sun_sat_ana_txt
+    "nwp": 6,       # nph_sun_nwp_txt
+}
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def distance_km(lat1, lon1, lat2, lon2):
+    """
+    두 지점(또는 배열) 사이의 대원 거리(km, haversine)
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=float)) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+def plan_grid_cells(df_locations, max_km, name_col="발전기명", lat_col="위도", lon_col="경도"):
+    """
+    발전소 목록을 요청 단위로 묶기 (근사: 대표 발전소에서 max_km 이내인 발전소만 같은 요청 사용)
+    - 대표 발전소는 입력 순서상 묶음의 첫 발전소이며, 요청은 대표 발전소의 실제 위도/경도로 보냄
+    - 혼자인 발전소는 자기 좌표 그대로 요청
+    반환: {(대표 위도, 대표 경도): [발전기명, ...]} (입력 순서 유지)
+    """
+    names = df_locations[name_col].astype(str).str.strip().tolist()
+    lats = df_locations[lat_col].to_numpy(dtype=float)
+    lons = df_locations[lon_col].to_numpy(dtype=float)
+
+    cells = {}
+    for name, lat, lon in zip(names, lats, lons):
+        if cells:
+            reps = list(cells)
+            dist = distance_km([r[0] for r in reps], [r[1] for r in reps], lat, lon)
+            nearest = int(np.argmin(dist))
+            if dist[nearest] <= max_km:
+                cells[reps[nearest]].append(name)
+                continue
+        cells[(float(lat), float(lon))] = [name]
+    return cells
+
+
+def print_cell_plan(cells, n_locations, label=""):
+    n_shared = sum(len(names) for names in cells.values() if len(names) > 1)
+    print(f"[요청 계획{label}] 발전소 {n_locations}곳 → 좌표 {len(cells)}곳 요청 "
+          f"(요청 공유 발전소 {n_shared}곳, 요청량 {len(cells) / max(n_locations, 1):.0%})")
+    for (cell_lat, cell_lon), names in cells.items():
+        if len(names) > 1:
+            print(f"   - ({cell_lat}, {cell_lon}): {', '.join(names)}")
+
+
+def plan_windows(start, end, interval_minutes, max_slots, split_days=False, time_format="%Y%m%d%H%M"):
+    """
+    start~end(양 끝 포함) 구간을 interval_minutes 간격 시각으로 나눈 뒤
+    요청 1회당 max_slots개 이하가 되도록 최소 개수의 요청 구간으로 묶기
+    - 기본은 날짜 경계를 넘어 이어 붙임 (split_days=True면 하루 안에서만 묶음)
+    반환: [(tm1, tm2), ...] (time_format 문자열)
+    """
+    slots = pd.date_range(start, end, freq=f"{interval_minutes}min")
+    if len(slots) == 0:
+        return []
+
+    if split_days:
+        # 날짜가 바뀌는 위치와 max_slots마다 새 구간 시작
+        day_start = np.r_[True, slots.normalize()[1:] != slots.normalize()[:-1]]
+        day_id = np.cumsum(day_start) - 1
+        first_of_day = np.flatnonzero(day_start)[day_id]
+        new_window = (np.arange(len(slots)) - first_of_day) % max_slots == 0
+    else:
+        new_window = np.arange(len(slots)) % max_slots == 0
+
+    starts = np.flatnonzero(new_window)
+    ends = np.r_[starts[1:] - 1, len(slots) - 1]
+    tm1 = slots[starts].strftime(time_format)
+    tm2 = slots[ends].strftime(time_format)
+    return list(zip(tm1, tm2))
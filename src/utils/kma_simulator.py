@@ -0,0 +1,280 @@
+# 기상청 API허브 로컬 모의 서버 유틸리티 파일 (수집기 부하/회귀 테스트용)
+#
+# 실행: python -m src.utils.kma_simulator --port 8765 --latency 0.05 --p429 0.05
+# 수집 스크립트는 KMA_BASE_URL=http://127.0.0.1:8765 환경변수로 이 서버에 연결
+
+import argparse
+import collections
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlparse
+
+import pandas as pd
+
+from src.utils.kma_cache import KMACache
+
+SAT_PATH = "/api/typ01/cgi-bin/url/nph_sun_sat_ana_txt"
+NWP_PATH = "/api/typ01/cgi-bin/url/nph_sun_nwp_txt"
+SFC_PATH = "/api/typ01/url/kma_sfcdd3.php"
+
+# 장애 주입 설정 (확률은 요청 1건 기준)
+DEFAULT_FAULTS = {
+    "latency": 0.0,       # 기본 응답 지연(초)
+    "jitter": 0.0,        # 지연에 더해지는 0~jitter초 무작위 지연
+    "p429": 0.0,          # HTTP 429 (트래픽 제한)
+    "p500": 0.0,          # HTTP 500
+    "perror": 0.0,        # 200 + '#ERROR' 본문
+    "pempty": 0.0,        # 200 + 표 없는 빈 응답
+    "plong": 0.0,         # 200 + Long 포맷 (위성 일사 엔드포인트만)
+    "max_rps": None,      # 초당 요청 수 상한 (넘으면 429)
+    "retry_after": 1,     # 429 응답의 Retry-After(초)
+}
+
+
+# -----------------------------------------------------------------
+# 응답 본문 생성 (녹화된 응답이 없을 때)
+# -----------------------------------------------------------------
+def _wide_table(lat, lon, headers, values):
+    header = "| LAT | LON | X | Y | " + " | ".join(headers) + " |"
+    row = f"| {lat} | {lon} | 0 | 0 | " + " | ".join(values) + " |"
+    return f"#START7777\n{header}\n{row}\n#7777END\n"
+
+
+def _solar_curve(times, peak):
+    # 6시~18시 사이 사인 곡선 (나머지 시간 0)
+    hours = times.hour + times.minute / 60
+    return [peak * max(0.0, math.sin(math.pi * (h - 6) / 12)) for h in hours]
+
+
+def synth_sat(params, long_format=False):
+    times = pd.date_range(pd.to_datetime(params["tm1"], format="%Y%m%d%H%M"),
+                          pd.to_datetime(params["tm2"], format="%Y%m%d%H%M"),
+                          freq=f"{params.get('int', 30)}min")
+    si = _solar_curve(times, 900.0)
+    if long_format:
+        lines = ["# YEAR MON DAY HR MIN LAT LON SI", "YEAR MON DAY HR MIN LAT LON SI"]
+        lines += [f"{t.year} {t.month} {t.day} {t.hour} {t.minute} {params['lat']} {params['lon']} {v:.1f}"
+                  for t, v in zip(times, si)]
+        return "\n".join(lines) + "\n"
+    values = ["-nan" if t.hour == 0 and t.minute == 0 else f"{v:.1f}" for t, v in zip(times, si)]
+    return _wide_table(params["lat"], params["lon"], times.strftime("%Y%m%d%H%M"), values)
+
+
+def synth_nwp(params):
+    # 예측 시각(KST 기준 요청)을 UTC로 표기하여 반환 (실제 API와 동일)
+    times = pd.date_range(pd.to_datetime(params["tmef1"], format="%Y%m%d%H%M"),
+                          pd.to_datetime(params["tmef2"], format="%Y%m%d%H%M"),
+                          freq=f"{params.get('int', 3)}h") - pd.Timedelta(hours=9)
+    varn = params.get("varn", "DSWRF")
+    if varn == "DSWRF":
+        values = _solar_curve(times + pd.Timedelta(hours=9), 800.0)
+    elif varn == "TMP":
+        values = [15.0 + 8 * math.sin(math.pi * (t.hour - 3) / 12) for t in times]
+    else:
+        values = [60.0 + 20 * math.cos(math.pi * t.hour / 12) for t in times]
+    return _wide_table(params["lat"], params["lon"], times.strftime("%Y%m%d%H"), [f"{v:.1f}" for v in values])
+
+
+def synth_sfc(params):
+    # 일자료: 공백 구분 56열 (0: 날짜, 1: 지점, 나머지 값 / 일부 -9 결측)
+    days = pd.date_range(params["tm1"], params["tm2"], freq="D")
+    stn = int(params.get("stn", 0))
+    lines = ["#START7777", "# YYMMDD STN WS_AVG ... (모의 일자료)"]
+    for i, day in enumerate(days):
+        values = [day.strftime("%Y%m%d"), str(stn)]
+        values += ["-9.0" if (i + col) % 97 == 0 else f"{(col * 0.7 + day.dayofyear % 30 + stn % 7):.1f}"
+                   for col in range(2, 56)]
+        lines.append(" ".join(values))
+    lines.append("#7777END")
+    return "\n".join(lines) + "\n"
+
+
+ENDPOINTS = {SAT_PATH: "sat", NWP_PATH: "nwp", SFC_PATH: "sfc"}
+
+
+# -----------------------------------------------------------------
+# 서버
+# -----------------------------------------------------------------
+class KMASimulator:
+    """
+    기상청 API허브 3개 엔드포인트(위성 일사/수치예보/지상 일자료)를 흉내 내는 로컬 HTTP 서버
+    - recordings_dir(KMACache 폴더)에 녹화된 응답이 있으면 그대로 재생, 없으면 모의 응답 생성
+    - faults 설정에 따라 지연, 429/500, #ERROR, 빈 응답, Long 포맷을 섞어서 반환
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, faults=None, recordings_dir=None, seed=None):
+        self.faults = dict(DEFAULT_FAULTS, **(faults or {}))
+        self.recordings = KMACache(recordings_dir, mode="replay") if recordings_dir else None
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.recent = collections.deque()
+        self.reset_stats()
+
+        simulator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                status, body, headers = simulator.handle(self.path)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def reset_stats(self):
+        with self.lock:
+            self.stats = collections.Counter()
+            self.started = time.monotonic()
+
+    def stats_snapshot(self):
+        with self.lock:
+            snapshot = dict(self.stats)
+            snapshot["elapsed"] = time.monotonic() - self.started
+        return snapshot
+
+    def _count(self, *names):
+        with self.lock:
+            for name in names:
+                self.stats[name] += 1
+
+    def _over_rate(self):
+        max_rps = self.faults["max_rps"]
+        if not max_rps:
+            return False
+        now = time.monotonic()
+        with self.lock:
+            while self.recent and now - self.recent[0] > 1.0:
+                self.recent.popleft()
+            if len(self.recent) >= max_rps:
+                return True
+            self.recent.append(now)
+        return False
+
+    def _roll(self, name):
+        p = self.faults[name]
+        if not p:
+            return False
+        with self.lock:
+            return self.random.random() < p
+
+    def handle(self, raw_path):
+        """
+        요청 1건 처리 → (상태 코드, 본문 bytes, 헤더 dict)
+        """
+        parsed = urlparse(raw_path)
+        params = dict(parse_qsl(parsed.query))
+        endpoint = ENDPOINTS.get(parsed.path)
+        self._count("requests", f"endpoint:{endpoint}")
+
+        delay = self.faults["latency"] + (self.random.random() * self.faults["jitter"] if self.faults["jitter"] else 0)
+        if delay:
+            time.sleep(delay)
+
+        if endpoint is None:
+            self._count("status:404")
+            return 404, b"<Error>unknown endpoint</Error>", {}
+        if self._over_rate() or self._roll("p429"):
+            self._count("status:429")
+            return 429, b"Too Many Requests", {"Retry-After": str(self.faults["retry_after"])}
+        if self._roll("p500"):
+            self._count("status:500")
+            return 500, b"Internal Server Error", {}
+        if self._roll("perror"):
+            self._count("status:200", "fault:error_body")
+            return 200, "#ERROR 모의 오류 응답\n".encode("euc-kr"), {}
+        if self._roll("pempty"):
+            self._count("status:200", "fault:empty")
+            return 200, b"#START7777\n#7777END\n", {}
+
+        encoding = "euc-kr" if endpoint == "sfc" else "utf-8"
+        headers = {"Content-Type": f"text/plain; charset={encoding}"}
+        if self.recordings is not None:
+            hit = self.recordings.get(parsed.path, params)
+            if hit is not None:
+                content, recorded_encoding = hit
+                self._count("status:200", "replayed")
+                if recorded_encoding:
+                    headers["Content-Type"] = f"text/plain; charset={recorded_encoding}"
+                return 200, content, headers
+
+        try:
+            if endpoint == "sat":
+                long_format = self._roll("plong")
+                if long_format:
+                    self._count("fault:long_format")
+                body = synth_sat(params, long_format)
+            elif endpoint == "nwp":
+                body = synth_nwp(params)
+            else:
+                body = synth_sfc(params)
+        except (KeyError, ValueError) as e:
+            self._count("status:200", "fault:bad_params")
+            return 200, f"#ERROR 파라미터 오류: {e}\n".encode(encoding), headers
+        self._count("status:200", "synthesized")
+        return 200, body.encode(encoding), headers
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if self.recordings is not None:
+            self.recordings.close()
+
+
+def add_fault_arguments(parser):
+    parser.add_argument("--latency", type=float, default=DEFAULT_FAULTS["latency"], help="응답 지연(초)")
+    parser.add_argument("--jitter", type=float, default=DEFAULT_FAULTS["jitter"], help="추가 무작위 지연 최대값(초)")
+    parser.add_argument("--p429", type=float, default=DEFAULT_FAULTS["p429"], help="HTTP 429 확률")
+    parser.add_argument("--p500", type=float, default=DEFAULT_FAULTS["p500"], help="HTTP 500 확률")
+    parser.add_argument("--perror", type=float, default=DEFAULT_FAULTS["perror"], help="#ERROR 본문 확률")
+    parser.add_argument("--pempty", type=float, default=DEFAULT_FAULTS["pempty"], help="빈 응답 확률")
+    parser.add_argument("--plong", type=float, default=DEFAULT_FAULTS["plong"], help="Long 포맷 확률 (위성 일사)")
+    parser.add_argument("--max-rps", type=float, default=DEFAULT_FAULTS["max_rps"], help="초당 요청 상한 (초과 시 429)")
+    parser.add_argument("--retry-after", type=float, default=DEFAULT_FAULTS["retry_after"], help="429 Retry-After(초)")
+    parser.add_argument("--recordings", default=None, help="녹화 응답으로 쓸 KMA 캐시 폴더")
+    parser.add_argument("--seed", type=int, default=None)
+
+
+def faults_from_args(args):
+    return {"latency": args.latency, "jitter": args.jitter, "p429": args.p429, "p500": args.p500,
+            "perror": args.perror, "pempty": args.pempty, "plong": args.plong,
+            "max_rps": args.max_rps, "retry_after": args.retry_after}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="기상청 API허브 로컬 모의 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+
+    simulator = KMASimulator(args.host, args.port, faults_from_args(args), args.recordings, args.seed).start()
+    print(f"모의 서버 실행 중: KMA_BASE_URL={simulator.url}")
+    try:
+        while True:
+            time.sleep(10)
+            print(simulator.stats_snapshot())
+    except KeyboardInterrupt:
+        simulator.stop()
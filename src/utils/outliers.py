@@ -0,0 +1,178 @@
+# 발전기별 이상치 탐지 유틸리티 파일
+#
+# - 모든 발전기의 통계(분위수/평균/표준편차/중앙값)를 groupby 집계 한 번씩으로 계산하고
+#   행 단위 판정은 벡터 연산으로 처리 (발전기 수가 수천 개여도 Python 반복 없음)
+# - 결과는 데이터 복사 대신 검출기별 bool 플래그 컬럼(True = 이상치)으로 반환
+# - DETECTORS에 함수를 추가하면 새 검출기를 같은 방식으로 사용 가능
+
+import numpy as np
+import pandas as pd
+
+
+class GroupContext:
+    """
+    값 배열 + 그룹 번호(codes)와 그룹별 집계 결과 캐시 (여러 검출기가 같은 집계를 재사용)
+    """
+
+    def __init__(self, values, keys):
+        self.values = pd.Series(np.asarray(values, dtype=np.float64))
+        grouped = self.values.groupby([pd.Series(np.asarray(k)) for k in keys], sort=True)
+        self.codes = grouped.ngroup().fillna(-1).to_numpy(dtype=np.int64)   # 키가 결측인 행은 -1
+        self.index = grouped.size().index
+        self._by_code = self.values[self.codes >= 0].groupby(self.codes[self.codes >= 0])
+        self._cache = {}
+
+    def _aggregate(self, name, func):
+        if name not in self._cache:
+            self._cache[name] = func().reindex(range(len(self.index))).to_numpy(dtype=np.float64)
+        return self._cache[name]
+
+    def quantiles(self, qs):
+        """
+        그룹별 분위수 {q: 배열} (요청한 분위수를 한 번에 계산)
+        """
+        missing = [q for q in qs if ("q", q) not in self._cache]
+        if missing:
+            table = self._by_code.quantile(missing).unstack()
+            for q in missing:
+                self._cache[("q", q)] = table[q].reindex(range(len(self.index))).to_numpy(dtype=np.float64)
+        return {q: self._cache[("q", q)] for q in qs}
+
+    def mean(self):
+        return self._aggregate("mean", self._by_code.mean)
+
+    def std(self):
+        return self._aggregate("std", self._by_code.std)
+
+    def median(self):
+        return self._aggregate("median", self._by_code.median)
+
+    def size(self):
+        # 값이 결측인 행도 포함한 그룹별 행 수
+        return np.bincount(self.codes[self.codes >= 0], minlength=len(self.index))
+
+    def at_rows(self, per_group):
+        """
+        그룹별 값을 각 행 위치로 펼치기 (그룹 없는 행은 NaN)
+        """
+        out = np.full(len(self.codes), np.nan)
+        valid = self.codes >= 0
+        out[valid] = np.asarray(per_group, dtype=np.float64)[self.codes[valid]]
+        return out
+
+    def count_by_group(self, flags):
+        valid = self.codes >= 0
+        return np.bincount(self.codes[valid], weights=flags[valid].astype(np.float64),
+                           minlength=len(self.index)).astype(np.int64)
+
+    def group_frame(self, columns):
+        """
+        그룹 키 컬럼 + columns(dict)로 발전기별 통계 DataFrame 생성
+        """
+        keys = self.index.to_frame(index=False)
+        return pd.concat([keys, pd.DataFrame(columns)], axis=1)
+
+
+# -----------------------------------------------------------------
+# 검출기: ctx → (이상치 플래그 배열, 그룹별 통계 DataFrame)
+# -----------------------------------------------------------------
+def _iqr_flags(ctx, k):
+    q = ctx.quantiles([0.25, 0.75])
+    q1, q3 = q[0.25], q[0.75]
+    iqr = q3 - q1
+    lower, upper = q1 - k * iqr, q3 + k * iqr
+    x = ctx.values.to_numpy()
+    # 범위 안(하한 이상, 상한 이하)이 아니면 이상치 (값이 없는 행 포함)
+    flags = ~((x >= ctx.at_rows(lower)) & (x <= ctx.at_rows(upper)))
+    return flags, {"Q1": q1, "Q3": q3, "IQR": iqr, "하한": lower, "상한": upper}
+
+
+def iqr_detector(ctx, k=1.5):
+    """
+    발전기별 IQR 범위 [Q1 - k·IQR, Q3 + k·IQR] 밖이면 이상치
+    """
+    flags, stats = _iqr_flags(ctx, k)
+    return flags, ctx.group_frame(stats)
+
+
+def zscore_detector(ctx, threshold=3.0):
+    """
+    발전기별 |(x - 평균) / 표준편차| > threshold이면 이상치
+    """
+    mean, std = ctx.mean(), ctx.std()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = (ctx.values.to_numpy() - ctx.at_rows(mean)) / ctx.at_rows(std)
+    flags = np.abs(z) > threshold
+    n_out, n_all = ctx.count_by_group(flags), ctx.size()
+    return flags, ctx.group_frame({
+        "평균": mean,
+        "표준편차": std,
+        "이상치수": n_out,
+        "전체데이터수": n_all,
+        "이상치비율(%)": np.round(n_out / np.maximum(n_all, 1) * 100, 2),
+    })
+
+
+def mad_detector(ctx, threshold=3.5):
+    """
+    발전기별 수정 Z-score 0.6745·|x - 중앙값| / MAD > threshold이면 이상치
+    """
+    median = ctx.median()
+    deviation = np.abs(ctx.values.to_numpy() - ctx.at_rows(median))
+    valid = ctx.codes >= 0
+    mad = (pd.Series(deviation[valid]).groupby(ctx.codes[valid]).median()
+             .reindex(range(len(ctx.index))).to_numpy(dtype=np.float64))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        score = 0.6745 * deviation / ctx.at_rows(mad)
+    flags = score > threshold
+    n_out = ctx.count_by_group(flags)
+    return flags, ctx.group_frame({"중앙값": median, "MAD": mad, "이상치수": n_out})
+
+
+DETECTORS = {
+    "iqr": iqr_detector,
+    "zscore": zscore_detector,
+    "mad": mad_detector,
+}
+
+# 발전기 + 월 단위로 통계를 내는 검출기 (계절에 따른 발전량 차이 반영)
+SEASONAL_DETECTORS = {
+    "seasonal_iqr": iqr_detector,
+}
+
+
+def flag_column(name):
+    return f"이상치_{name}"
+
+
+def detect_outliers(df, detectors=("iqr", "zscore"), value_col="발전량(MWh)", group_col="발전기명",
+                    date_col="날짜", params=None):
+    """
+    여러 검출기를 한 번에 실행
+    - params: {검출기명: {인자: 값}} (예: {"iqr": {"k": 3.0}})
+    반환: (df와 같은 index의 플래그 DataFrame, {검출기명: 그룹별 통계 DataFrame})
+    """
+    params = params or {}
+    contexts = {}
+    flags, stats = {}, {}
+
+    for name in detectors:
+        if name in DETECTORS:
+            func, key = DETECTORS[name], "group"
+        elif name in SEASONAL_DETECTORS:
+            func, key = SEASONAL_DETECTORS[name], "seasonal"
+        else:
+            raise ValueError(f"알 수 없는 검출기: {name} (사용 가능: {list(DETECTORS) + list(SEASONAL_DETECTORS)})")
+
+        if key not in contexts:
+            keys = [df[group_col]]
+            if key == "seasonal":
+                keys.append(pd.to_datetime(df[date_col], errors="coerce").dt.month.rename("월"))
+            contexts[key] = GroupContext(df[value_col], keys)
+            contexts[key].index.names = [group_col] + (["월"] if key == "seasonal" else [])
+
+        flag, table = func(contexts[key], **params.get(name, {}))
+        flags[flag_column(name)] = flag
+        stats[name] = table
+
+    return pd.DataFrame(flags, index=df.index), stats
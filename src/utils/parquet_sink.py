@@ -0,0 +1,183 @@
+# 수집 데이터를 (자료원/발전소/연-월) 단위 Parquet 조각으로 바로 쓰는 스트리밍 저장 유틸리티 파일
+
+import glob
+import os
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+KEY_COLUMNS = ["발전기명", "DATETIME"]
+DEFAULT_FLUSH_ROWS = 50_000
+
+
+def _safe_dir_name(name):
+    return str(name).strip().replace(os.sep, "_")
+
+
+def partition_dir(root, source, plant, year_month):
+    """
+    root/source/발전기명/YYYY-MM 경로
+    """
+    return os.path.join(root, source, _safe_dir_name(plant), year_month)
+
+
+def _dedup_sorted(df, key_columns):
+    # 같은 키는 나중에 쓴 행이 이김 (upsert)
+    return (df.drop_duplicates(subset=key_columns, keep="last")
+              .sort_values(key_columns)
+              .reset_index(drop=True))
+
+
+class ParquetSink:
+    """
+    응답을 받는 대로 메모리 버퍼에 모았다가 flush_rows마다 파티션별 Parquet 파일(row group)로 내려쓰는 저장기
+    - 파티션: root/source/발전기명/YYYY-MM/part-*.parquet
+    - (발전기명, DATETIME)이 같은 행은 나중에 쓴 값으로 덮어씀 (읽을 때/compact 시 적용)
+    """
+
+    def __init__(self, root, source, key_columns=KEY_COLUMNS, flush_rows=DEFAULT_FLUSH_ROWS):
+        self.root = root
+        self.source = source
+        self.key_columns = list(key_columns)
+        self.flush_rows = flush_rows
+        self.buffer = []
+        self.buffered_rows = 0
+        self.dirty = set()
+        self._seq = 0
+
+    def write(self, df):
+        """
+        DataFrame을 버퍼에 추가 (flush_rows를 넘으면 flush 필요 여부 True 반환)
+        """
+        if df is not None and not df.empty:
+            self.buffer.append(df)
+            self.buffered_rows += len(df)
+        return self.buffered_rows >= self.flush_rows
+
+    def _part_path(self, directory):
+        # 파일 이름 순서 = 쓰기 순서 (같은 키는 뒤 파일이 우선)
+        self._seq += 1
+        return os.path.join(directory, f"part-{time.time_ns():020d}-{os.getpid()}-{self._seq:06d}.parquet")
+
+    def flush(self):
+        """
+        버퍼를 파티션별로 나누어 새 Parquet 파일로 기록 (임시 파일 → 이름 변경으로 원자적 기록)
+        """
+        if not self.buffer:
+            return 0
+        df = pd.concat(self.buffer, ignore_index=True)
+        self.buffer, self.buffered_rows = [], 0
+        df["DATETIME"] = pd.to_datetime(df["DATETIME"])
+        year_month = df["DATETIME"].dt.strftime("%Y-%m")
+
+        for (plant, ym), part in df.groupby([df["발전기명"], year_month], sort=False):
+            directory = partition_dir(self.root, self.source, plant, ym)
+            os.makedirs(directory, exist_ok=True)
+            path = self._part_path(directory)
+            tmp_path = path + ".tmp"
+            pq.write_table(pa.Table.from_pandas(part, preserve_index=False), tmp_path)
+            os.replace(tmp_path, path)
+            self.dirty.add(directory)
+        return len(df)
+
+    def compact(self):
+        """
+        이번 실행에서 쓴 파티션마다 조각 파일을 하나로 합치고 키 중복 제거 + 정렬
+        """
+        for directory in sorted(self.dirty):
+            compact_partition(directory, self.key_columns)
+        self.dirty.clear()
+
+    def close(self):
+        self.flush()
+        self.compact()
+
+
+def compact_partition(directory, key_columns=KEY_COLUMNS):
+    part_paths = sorted(glob.glob(os.path.join(directory, "part-*.parquet")))
+    if len(part_paths) <= 1:
+        return
+    df = _dedup_sorted(pd.concat((pd.read_parquet(p) for p in part_paths), ignore_index=True), key_columns)
+    merged_path = part_paths[-1].replace(".parquet", "-c.parquet")
+    tmp_path = merged_path + ".tmp"
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), tmp_path)
+    os.replace(tmp_path, merged_path)
+    for p in part_paths:
+        os.remove(p)
+
+
+def _month_range(start=None, end=None):
+    # 기간 → (시작 YYYY-MM, 끝 YYYY-MM) (없는 쪽은 None)
+    return (None if start is None else pd.Timestamp(start).strftime("%Y-%m"),
+            None if end is None else pd.Timestamp(end).strftime("%Y-%m"))
+
+
+def list_partitions(root, source, plants=None, start=None, end=None):
+    """
+    [(발전기명 폴더, YYYY-MM 폴더 경로), ...]를 발전소/연-월 순으로 반환
+    start/end(양 끝 포함)를 주면 그 기간과 겹치는 연-월 파티션만
+    """
+    first_month, last_month = _month_range(start, end)
+    source_dir = os.path.join(root, source)
+    if not os.path.isdir(source_dir):
+        return []
+    wanted = None if plants is None else {_safe_dir_name(p) for p in plants}
+    partitions = []
+    for plant in sorted(os.listdir(source_dir)):
+        if wanted is not None and plant not in wanted:
+            continue
+        for ym in sorted(os.listdir(os.path.join(source_dir, plant))):
+            if (first_month and ym < first_month) or (last_month and ym > last_month):
+                continue
+            partitions.append((plant, os.path.join(source_dir, plant, ym)))
+    return partitions
+
+
+def read_partition(directory, columns=None, key_columns=KEY_COLUMNS, start=None, end=None):
+    """
+    파티션 하나 읽기 (키 중복 제거, start/end를 주면 DATETIME이 그 기간(양 끝 포함)인 행만)
+    """
+    part_paths = sorted(glob.glob(os.path.join(directory, "part-*.parquet")))
+    if not part_paths:
+        return pd.DataFrame()
+    df = pd.concat((pd.read_parquet(p) for p in part_paths), ignore_index=True)
+    df = _dedup_sorted(df, key_columns)
+    if start is not None:
+        df = df[df["DATETIME"] >= pd.Timestamp(start)]
+    if end is not None:
+        df = df[df["DATETIME"] <= pd.Timestamp(end)]
+    return df if columns is None else df[columns]
+
+
+def read_dataset(root, source, plants=None, columns=None, key_columns=KEY_COLUMNS, start=None, end=None):
+    """
+    저장된 데이터(수집 중인 부분 결과 포함)를 읽어 키 중복 제거 후 반환 (start/end: 기간 제한, 양 끝 포함)
+    """
+    frames = [read_partition(d, columns, key_columns, start, end)
+              for _, d in list_partitions(root, source, plants, start, end)]
+    frames = [f for f in frames if not f.empty]
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
+def export_csv(root, source, output_file, columns=None, encoding="utf-8-sig", key_columns=KEY_COLUMNS,
+               start=None, end=None, plants=None):
+    """
+    파티션을 하나씩 읽어 CSV로 이어쓰기 (메모리에는 파티션 1개만 올림)
+    - start/end(양 끝 포함)/plants를 주면 그 기간/발전소만 (같은 저장소에 다른 수집 기간이 섞여 있어도 분리)
+    반환: 기록한 행 수
+    """
+    n_rows = 0
+    first = True
+    for _, directory in list_partitions(root, source, plants, start, end):
+        df = read_partition(directory, columns, key_columns, start, end)
+        if df.empty:
+            continue
+        df.to_csv(output_file, mode="w" if first else "a", header=first, index=False,
+                  encoding=encoding if first else "utf-8")
+        first = False
+        n_rows += len(df)
+    return n_rows
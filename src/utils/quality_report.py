@@ -0,0 +1,177 @@
+# 데이터 품질 보고서(엑셀 + 그래프) 작성 유틸리티 파일
+#
+# - 엑셀은 xlsxwriter constant_memory 모드로 한 행씩 기록 (메모리 사용량이 행 수와 무관)
+# - 그래프는 원본 행이 아닌 요약(구간별 개수, 박스플롯 통계)으로 별도 프로세스에서 그림
+#   → 엑셀 작성과 그래프 렌더링이 동시에 진행됨
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import xlsxwriter
+
+WRITE_CHUNK_ROWS = 10000
+MAX_FLIERS = 200   # 박스플롯에 표시할 발전기별 이상치 점 최대 개수
+
+
+# -----------------------------------------------------------------
+# 엑셀 (행 단위 스트리밍)
+# -----------------------------------------------------------------
+def _chunk_rows(df, chunk_rows):
+    # 결측(NaN/NaT/NA)은 빈 칸으로 쓰도록 None으로 변환
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        columns = [chunk[c].astype(object).where(chunk[c].notna(), None).tolist() for c in chunk.columns]
+        yield from zip(*columns)
+
+
+def write_excel_report(path, sheets, chunk_rows=WRITE_CHUNK_ROWS):
+    """
+    sheets: [(시트명, DataFrame)] 순서대로 한 시트씩, 한 행씩 기록
+    """
+    tmp_path = path + ".tmp.xlsx"
+    workbook = xlsxwriter.Workbook(tmp_path, {
+        "constant_memory": True,
+        "default_date_format": "yyyy-mm-dd hh:mm:ss",
+    })
+    header_format = workbook.add_format({"bold": True, "border": 1, "align": "center"})
+    for sheet_name, df in sheets:
+        worksheet = workbook.add_worksheet(sheet_name)
+        worksheet.write_row(0, 0, [str(c) for c in df.columns], header_format)
+        for row_idx, row in enumerate(_chunk_rows(df, chunk_rows), start=1):
+            worksheet.write_row(row_idx, 0, row)
+    workbook.close()
+    os.replace(tmp_path, path)
+
+
+def sample_rows(df, mode, n_rows, seed=0):
+    """
+    원본 데이터 시트용 행 선택: full(전체) / sample(n_rows개 무작위, 원래 순서 유지) / none(시트 생략 → None)
+    """
+    if mode == "none":
+        return None
+    if mode == "sample" and len(df) > n_rows:
+        return df.sample(n=n_rows, random_state=seed).sort_index()
+    return df
+
+
+# -----------------------------------------------------------------
+# 그래프용 요약
+# -----------------------------------------------------------------
+def histogram_summary(df, value_col, group_col, bins=30):
+    """
+    공통 구간으로 발전기별 히스토그램 개수 계산 → {"edges", "groups", "counts"(발전기 × 구간)}
+    """
+    sub = df[[group_col, value_col]].dropna()
+    values = sub[value_col].to_numpy(dtype=np.float64)
+    codes, groups = pd.factorize(sub[group_col], sort=True)
+    edges = np.histogram_bin_edges(values, bins=bins)
+    bin_idx = np.clip(np.searchsorted(edges, values, side="right") - 1, 0, bins - 1)
+    counts = np.bincount(codes * bins + bin_idx, minlength=len(groups) * bins).reshape(len(groups), bins)
+    return {"edges": edges, "groups": [str(g) for g in groups], "counts": counts}
+
+
+def boxplot_summary(df, value_col, group_col, max_fliers=MAX_FLIERS):
+    """
+    발전기별 박스플롯 통계 (matplotlib bxp 형식 dict 목록, 수염 = 1.5·IQR 안의 최소/최대)
+    """
+    sub = df[[group_col, value_col]].dropna()
+    grouped = sub.groupby(group_col, sort=True, observed=True)[value_col]
+    quartiles = grouped.quantile([0.25, 0.5, 0.75]).unstack()
+    q1, q3 = quartiles[0.25], quartiles[0.75]
+    iqr = q3 - q1
+
+    lower = sub[group_col].map(q1 - 1.5 * iqr)
+    upper = sub[group_col].map(q3 + 1.5 * iqr)
+    inside = (sub[value_col] >= lower) & (sub[value_col] <= upper)
+    whiskers = sub[inside].groupby(group_col, sort=True, observed=True)[value_col].agg(["min", "max"])
+    fliers = sub[~inside].groupby(group_col, sort=True, observed=True).head(max_fliers)
+    fliers_by_group = fliers.groupby(group_col, observed=True)[value_col].apply(list)
+
+    stats = []
+    for gen in quartiles.index:
+        stats.append({
+            "label": str(gen),
+            "q1": q1[gen], "med": quartiles.loc[gen, 0.5], "q3": q3[gen],
+            "whislo": whiskers["min"].get(gen, q1[gen]), "whishi": whiskers["max"].get(gen, q3[gen]),
+            "fliers": fliers_by_group.get(gen, []),
+        })
+    return stats
+
+
+# -----------------------------------------------------------------
+# 그래프 렌더링 (별도 프로세스에서 실행)
+# -----------------------------------------------------------------
+def render_charts(summary, img_dir):
+    """
+    요약 dict로 그래프 3종 저장 → 저장한 이미지 경로 목록
+    summary: {"missing_ratio": DataFrame, "histogram": histogram_summary(), "boxplot": boxplot_summary()}
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    # ✅ macOS 한글 폰트 설정
+    plt.rcParams['font.family'] = 'AppleGothic'
+    plt.rcParams['axes.unicode_minus'] = False
+    os.makedirs(img_dir, exist_ok=True)
+    paths = []
+
+    # 🔹 결측치율 시각화
+    missing_ratio = summary["missing_ratio"]
+    plt.figure(figsize=(8, 4))
+    plt.bar(missing_ratio['컬럼명'], missing_ratio['결측치비율(%)'],
+            color=sns.color_palette('Blues_d', len(missing_ratio)))
+    plt.title('결측치 비율 (%)')
+    plt.xlabel('컬럼명')
+    plt.ylabel('결측치비율(%)')
+    plt.xticks(rotation=45)
+    plt.tight_layout()
+    paths.append(os.path.join(img_dir, "missing_ratio.png"))
+    plt.savefig(paths[-1], dpi=150)
+    plt.close()
+
+    # 🔹 발전기별 발전량 분포 히스토그램 (누적 막대)
+    hist = summary["histogram"]
+    edges, counts = hist["edges"], hist["counts"]
+    colors = sns.color_palette(n_colors=len(hist["groups"]))
+    plt.figure(figsize=(10, 5))
+    bottom = np.zeros(len(edges) - 1)
+    for gen, row, color in zip(hist["groups"], counts, colors):
+        plt.bar(edges[:-1], row, width=np.diff(edges), bottom=bottom, align="edge",
+                color=color, edgecolor="white", linewidth=0.3, label=gen)
+        bottom += row
+    plt.title('발전기별 발전량 분포')
+    plt.xlabel('발전량(MWh)')
+    plt.ylabel('Count')
+    plt.legend(title='발전기명', fontsize=6)
+    plt.tight_layout()
+    paths.append(os.path.join(img_dir, "generation_hist.png"))
+    plt.savefig(paths[-1], dpi=150)
+    plt.close()
+
+    # 🔹 발전기별 박스플롯 (IQR 시각화)
+    box_stats = summary["boxplot"]
+    fig, ax = plt.subplots(figsize=(12, 6))
+    artists = ax.bxp(box_stats, patch_artist=True, showfliers=True, medianprops={"color": "black"})
+    for patch, color in zip(artists["boxes"], sns.color_palette(n_colors=len(box_stats))):
+        patch.set_facecolor(color)
+    ax.set_title('발전기별 발전량 박스플롯 (IQR 이상치 시각화)')
+    ax.set_xlabel('발전기명')
+    ax.set_ylabel('발전량(MWh)')
+    plt.xticks(rotation=45)
+    plt.tight_layout()
+    paths.append(os.path.join(img_dir, "iqr_boxplot.png"))
+    plt.savefig(paths[-1], dpi=150)
+    plt.close(fig)
+    return paths
+
+
+def start_chart_process(summary, img_dir):
+    """
+    그래프 렌더링을 백그라운드 프로세스로 시작 → (executor, future) / 끝나면 future.result()로 확인
+    """
+    executor = ProcessPoolExecutor(max_workers=1)
+    return executor, executor.submit(render_charts, summary, img_dir)
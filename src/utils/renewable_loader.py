@@ -0,0 +1,196 @@
+# 시간별 발전량 원자료(renewable_generation_*.csv) 로드 유틸리티 파일
+#
+# - 원자료: (date, genNm, qcap) 한 행에 q01~q24(1~24시, 단위 Wh)가 옆으로 나열된 형식
+#   같은 날짜/발전기명에 설비용량(qcap)이 다른 호기가 여러 행으로 들어 있음 → 발전기 단위로 합산
+# - 이상값은 NaN 처리 후 목록으로 따로 반환
+#   · 음수
+#   · 한 시간 발전량이 설비용량×1시간×ANOMALY_TOLERANCE 초과
+#     (월말 행의 q24에 한 달 합계가 들어 있는 경우 등, 다른 시간이 모두 0이면 '월합계 추정'으로 표시)
+# - 발전기 × 날짜 × 24시간 배열(cube)로 만든 뒤 .npz로 캐시 (원본 파일 크기/수정시각/해시가 같으면 재사용)
+#
+# 실행: python -m src.utils.renewable_loader [--output 일별합계.csv]
+
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.utils.data_io import _file_signature, sniff_encoding
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+DEFAULT_FILES = [
+    os.path.join(REPO_ROOT, "renewable_generation_2017_2024.csv"),
+    os.path.join(REPO_ROOT, "renewable_generation_2018_2024.csv"),
+]
+CACHE_DIR = os.path.join(REPO_ROOT, "data", "cache", "renewable_generation")
+
+HOUR_COLUMNS = [f"q{h:02d}" for h in range(1, 25)]
+WH_PER_MWH = 1_000_000
+ANOMALY_TOLERANCE = 1.1   # 설비용량 대비 한 시간 발전량 허용 배율
+
+
+def read_wide(path):
+    """
+    원자료 CSV를 타입을 정해 읽기 (date → datetime64, q01~q24 → float64 Wh)
+    """
+    dtype = {"genNm": "string", "qcap": "float64", **{c: "float64" for c in HOUR_COLUMNS}}
+    df = pd.read_csv(path, encoding=sniff_encoding(path), dtype=dtype)
+    df["date"] = pd.to_datetime(df["date"].astype(str), format="%Y%m%d", errors="coerce")
+    return df.dropna(subset=["date", "genNm"]).reset_index(drop=True)
+
+
+def clean_hours(wide, tolerance=ANOMALY_TOLERANCE):
+    """
+    시간별 값에서 이상값을 NaN으로 바꾸기 → (n행 × 24 배열, 이상값 목록 DataFrame)
+    """
+    values = wide[HOUR_COLUMNS].to_numpy(dtype=np.float64, copy=True)
+    limit = wide["qcap"].to_numpy(dtype=np.float64)[:, None] * WH_PER_MWH * tolerance
+    negative = values < 0
+    over = values > limit
+    bad = negative | over
+
+    rows, hours = np.nonzero(bad)
+    others_zero = np.nansum(np.where(bad, 0, values), axis=1)[rows] == 0
+    reason = np.where(negative[rows, hours], "음수",
+                      np.where((hours == 23) & others_zero, "월합계 추정", "설비용량 초과"))
+    anomalies = pd.DataFrame({
+        "날짜": wide["date"].to_numpy()[rows],
+        "발전기명": wide["genNm"].to_numpy()[rows],
+        "설비용량(MW)": wide["qcap"].to_numpy()[rows],
+        "시간": hours + 1,
+        "값(Wh)": values[rows, hours],
+        "사유": reason,
+    })
+    values[bad] = np.nan
+    return values, anomalies
+
+
+def build_cube(wide, tolerance=ANOMALY_TOLERANCE):
+    """
+    발전기 × 날짜 × 24시간 배열 생성 (같은 발전기의 여러 호기는 합산, 이상값이 낀 시간은 NaN)
+    반환: {"plants", "dates", "values"(Wh), "capacity"(MW), "present", "anomalies"}
+    """
+    values, anomalies = clean_hours(wide, tolerance)
+    plant_codes, plants = pd.factorize(wide["genNm"], sort=True)
+    start = wide["date"].min()
+    day_codes = ((wide["date"] - start) // pd.Timedelta(days=1)).to_numpy(dtype=np.int64)
+    dates = pd.date_range(start, wide["date"].max(), freq="D")
+
+    cube = np.zeros((len(plants), len(dates), 24), dtype=np.float64)
+    np.add.at(cube, (plant_codes, day_codes), values)   # NaN이 낀 시간은 합계도 NaN
+    capacity = np.zeros((len(plants), len(dates)), dtype=np.float64)
+    np.add.at(capacity, (plant_codes, day_codes), wide["qcap"].to_numpy(dtype=np.float64))
+    present = np.zeros((len(plants), len(dates)), dtype=bool)
+    present[plant_codes, day_codes] = True
+
+    return {
+        "plants": np.asarray(plants, dtype=str),
+        "dates": dates.to_numpy(dtype="datetime64[D]"),
+        "values": cube,
+        "capacity": capacity,
+        "present": present,
+        "anomalies": anomalies,
+    }
+
+
+def _cache_paths(sources, cache_dir):
+    name = "+".join(os.path.splitext(os.path.basename(p))[0] for p in sources)
+    return os.path.join(cache_dir, f"{name}.npz"), os.path.join(cache_dir, f"{name}_anomalies.parquet")
+
+
+def _signatures(sources):
+    return [dict(_file_signature(p), path=os.path.basename(p)) for p in sources]
+
+
+def _same_sources(saved, sources):
+    # 크기가 같고 수정시각이 같으면 같은 원본 (수정시각만 다르면 내용 해시로 비교)
+    if len(saved) != len(sources):
+        return False
+    for s, path in zip(saved, sources):
+        st = os.stat(path)
+        if s["size"] != st.st_size:
+            return False
+        if s["mtime_ns"] != st.st_mtime_ns and s["sha256"] != _file_signature(path)["sha256"]:
+            return False
+    return True
+
+
+def load_cube(sources=DEFAULT_FILES, cache_dir=CACHE_DIR, refresh=False):
+    """
+    여러 원자료 파일을 합쳐 cube 로드 (캐시가 최신이면 .npz만 읽음)
+    파일 간 같은 (date, genNm, qcap) 행이 겹치면 뒤 파일의 값을 사용
+    """
+    npz_path, anomalies_path = _cache_paths(sources, cache_dir)
+    if not refresh and os.path.exists(npz_path) and os.path.exists(anomalies_path):
+        with np.load(npz_path, allow_pickle=False) as cached:
+            if _same_sources(json.loads(str(cached["sources"])), sources):
+                cube = {key: cached[key] for key in ("plants", "dates", "values", "capacity", "present")}
+                cube["anomalies"] = pd.read_parquet(anomalies_path)
+                return cube
+
+    # 파일 사이에서만 중복 제거 (한 파일 안의 같은 용량 호기는 그대로 합산)
+    wide = pd.concat([read_wide(p).assign(_src=i) for i, p in enumerate(sources)], ignore_index=True)
+    latest = wide.groupby(["date", "genNm", "qcap"], observed=True)["_src"].transform("max")
+    wide = wide[wide["_src"] == latest].drop(columns="_src")
+    cube = build_cube(wide)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = npz_path + ".tmp.npz"
+    np.savez(tmp_path, sources=json.dumps(_signatures(sources)), **{k: v for k, v in cube.items() if k != "anomalies"})
+    os.replace(tmp_path, npz_path)
+    cube["anomalies"].to_parquet(anomalies_path, index=False)
+    return cube
+
+
+def to_long(cube):
+    """
+    cube → 시간별 긴 형식 (자료가 있는 발전기/날짜만): 발전기명, 날짜, 시간(1~24), DATETIME(시작 시각), 발전량(Wh)
+    """
+    plant_idx, day_idx = np.nonzero(cube["present"])
+    n = len(plant_idx)
+    dates = cube["dates"][day_idx].astype("datetime64[ns]")
+    hours = np.tile(np.arange(24), n)
+    return pd.DataFrame({
+        "발전기명": np.repeat(cube["plants"][plant_idx], 24),
+        "날짜": np.repeat(dates, 24),
+        "시간": hours + 1,
+        "DATETIME": np.repeat(dates, 24) + hours.astype("timedelta64[h]"),
+        "발전량(Wh)": cube["values"][plant_idx, day_idx].reshape(-1),
+    })
+
+
+def daily_totals(cube):
+    """
+    발전기별 일별 합계 (발전량(MWh)과 같은 단위/컬럼명, 이상값이 낀 날은 NaN)
+    """
+    plant_idx, day_idx = np.nonzero(cube["present"])
+    hourly = cube["values"][plant_idx, day_idx]
+    valid_hours = np.isfinite(hourly).sum(axis=1)
+    total = hourly.sum(axis=1) / WH_PER_MWH
+    return pd.DataFrame({
+        "날짜": cube["dates"][day_idx].astype("datetime64[ns]"),
+        "발전기명": cube["plants"][plant_idx],
+        "설비용량(MW)": cube["capacity"][plant_idx, day_idx],
+        "발전량(MWh)": np.where(valid_hours == 24, total, np.nan),
+        "유효시간수": valid_hours,
+    })
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="시간별 발전량 원자료 로드 + 일별 합계")
+    parser.add_argument("sources", nargs="*", default=DEFAULT_FILES)
+    parser.add_argument("--refresh", action="store_true", help="캐시를 무시하고 원자료 다시 읽기")
+    parser.add_argument("--output", default=None, help="일별 합계를 저장할 CSV 경로")
+    args = parser.parse_args()
+
+    cube = load_cube(args.sources, refresh=args.refresh)
+    daily = daily_totals(cube)
+    print(f"✅ 발전기 {len(cube['plants'])}개 × {len(cube['dates'])}일 "
+          f"({cube['dates'][0]} ~ {cube['dates'][-1]}), 자료가 있는 발전기-일 {int(cube['present'].sum())}개")
+    print(f"⚠️ 이상값 {len(cube['anomalies'])}건: {cube['anomalies']['사유'].value_counts().to_dict()}")
+    print(daily.head())
+    if args.output:
+        daily.to_csv(args.output, index=False, encoding="utf-8-sig")
+        print(f"💾 일별 합계 저장: {args.output}")
@@ -0,0 +1,69 @@
+# 발전기별 모델 학습을 프로세스 풀로 나눠 실행하는 스케줄러 유틸리티 파일
+#
+# - 작업(발전기)을 데이터 수가 큰 순서로 넣어 먼저 비는 워커가 다음 큰 작업을 가져가도록 함 (LPT)
+# - 워커 수 × 워커 안의 병렬 수(n_jobs, BLAS 스레드)가 CPU 수를 넘지 않도록 나눔
+# - 결과는 끝나는 순서대로 (키, 결과)로 돌려줌 → 호출 쪽에서 원래 순서로 다시 정렬
+# - 워커가 1개면 풀을 만들지 않고 현재 프로세스에서 차례로 실행
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from threadpoolctl import threadpool_limits
+
+_LIMITS = None   # 워커 프로세스의 BLAS/OpenMP 스레드 제한 (프로세스가 끝날 때까지 유지)
+
+
+def available_cpus():
+    """
+    현재 프로세스가 쓸 수 있는 CPU 수 (affinity 제한 반영)
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def plan_workers(n_tasks, max_workers=None, cpus=None):
+    """
+    (워커 수, 워커당 병렬 수) 결정: 워커 수는 작업 수/CPU 수를 넘지 않고, 남는 CPU는 워커 안에서 사용
+    """
+    cpus = cpus or available_cpus()
+    workers = max(1, min(n_tasks, max_workers or cpus, cpus))
+    return workers, max(1, cpus // workers)
+
+
+def balance_order(weights):
+    """
+    큰 작업부터 실행하는 순서 (같은 크기면 원래 순서)
+    """
+    return sorted(range(len(weights)), key=lambda i: -weights[i])
+
+
+def _init_worker(n_threads):
+    global _LIMITS
+    _LIMITS = threadpool_limits(limits=n_threads)
+
+
+def run_tasks(func, tasks, max_workers=None):
+    """
+    tasks: [(키, 인자 튜플, 크기), ...] → func(키, *인자, n_jobs=워커당 병렬 수) 실행
+    끝나는 순서대로 (키, 결과) yield (작업 중 예외는 그대로 올림)
+    """
+    if not tasks:
+        return
+    workers, n_jobs = plan_workers(len(tasks), max_workers)
+    order = balance_order([weight for _, _, weight in tasks])
+
+    if workers == 1:
+        for i in order:
+            key, args, _ = tasks[i]
+            yield key, func(key, *args, n_jobs=n_jobs)
+        return
+
+    print(f"🧵 학습 워커 {workers}개 × 워커당 병렬 {n_jobs} (작업 {len(tasks)}개)")
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(n_jobs,)) as pool:
+        futures = {}
+        for i in order:
+            key, args, _ = tasks[i]
+            futures[pool.submit(func, key, *args, n_jobs=n_jobs)] = key
+        for future in as_completed(futures):
+            yield futures[future], future.result()
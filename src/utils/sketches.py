@@ -0,0 +1,317 @@
+# 발전기별 스트리밍 통계(sketch) 유틸리티 파일
+#
+# - 평균/표준편차: Welford 누적 (병합 가능, 정확한 값)
+# - 분위수(Q1/Q3): t-digest (중심값/가중치 배열로 요약, 병합 가능, 근사값)
+#   데이터가 compression개 이하일 때는 원본 값을 그대로 보관하므로 pandas quantile과 같은 값
+# - 새로 들어온 행만으로 통계를 갱신하고 파일(JSON)로 저장 → 다음 실행에서 이어서 사용
+# - 다른 회사/지역에서 만든 sketch 파일도 merge로 합칠 수 있음
+#
+# 병합: python -m src.utils.sketches merge 합친결과.json A.json B.json ...
+
+import argparse
+import json
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.utils.outliers import flag_column
+
+DEFAULT_COMPRESSION = 300
+
+
+class Welford:
+    """
+    평균/분산 누적 (배치 단위 갱신, 병합 가능)
+    """
+
+    def __init__(self, n=0, mean=0.0, m2=0.0):
+        self.n, self.mean, self.m2 = int(n), float(mean), float(m2)
+
+    def merge(self, other):
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.n, self.mean, self.m2 = other.n, other.mean, other.m2
+            return self
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean += delta * other.n / n
+        self.m2 += other.m2 + delta * delta * self.n * other.n / n
+        self.n = n
+        return self
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values):
+            mean = values.mean()
+            self.merge(Welford(len(values), mean, ((values - mean) ** 2).sum()))
+        return self
+
+    def std(self):
+        # 표본 표준편차 (ddof=1, pandas std와 같음)
+        return math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else float("nan")
+
+    def to_list(self):
+        return [self.n, self.mean, self.m2]
+
+
+class TDigest:
+    """
+    분위수 근사용 t-digest (중심값 means, 가중치 weights)
+    """
+
+    def __init__(self, compression=DEFAULT_COMPRESSION, means=None, weights=None, vmin=None, vmax=None):
+        self.compression = compression
+        self.means = np.asarray(means if means is not None else [], dtype=np.float64)
+        self.weights = np.asarray(weights if weights is not None else [], dtype=np.float64)
+        self.min = float("inf") if vmin is None else float(vmin)
+        self.max = float("-inf") if vmax is None else float(vmax)
+
+    @property
+    def count(self):
+        return float(self.weights.sum())
+
+    def _add(self, means, weights):
+        order = np.argsort(np.concatenate([self.means, means]), kind="stable")
+        self.means = np.concatenate([self.means, means])[order]
+        self.weights = np.concatenate([self.weights, weights])[order]
+        if len(self.means) > self.compression:
+            self._compress()
+
+    def _compress(self):
+        # 누적 비율 q를 k = δ/(2π)·asin(2q-1) 눈금으로 바꿔 같은 정수 구간의 중심값끼리 합침
+        # (양 끝 분위수는 구간이 좁아 정밀도가 높음)
+        total = self.weights.sum()
+        q_mid = (np.cumsum(self.weights) - self.weights / 2) / total
+        k = self.compression / (2 * math.pi) * np.arcsin(np.clip(2 * q_mid - 1, -1, 1))
+        _, bucket = np.unique(np.floor(k), return_inverse=True)
+        weights = np.bincount(bucket, weights=self.weights)
+        self.means = np.bincount(bucket, weights=self.weights * self.means) / weights
+        self.weights = weights
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values):
+            self.min = min(self.min, values.min())
+            self.max = max(self.max, values.max())
+            self._add(np.sort(values), np.ones(len(values)))
+        return self
+
+    def merge(self, other):
+        if len(other.means):
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+            self._add(other.means, other.weights)
+        return self
+
+    def quantile(self, q):
+        """
+        q 분위수 (pandas 기본값과 같은 선형 보간 기준: 순위 q·(n-1))
+        """
+        if not len(self.means):
+            return float("nan")
+        # 각 중심값이 차지하는 순위 구간의 가운데를 그 중심값의 순위로 보고 보간
+        ranks = np.cumsum(self.weights) - (self.weights + 1) / 2
+        ranks = np.concatenate([[0.0], ranks, [self.count - 1]])
+        values = np.concatenate([[self.min], self.means, [self.max]])
+        return float(np.interp(q * (self.count - 1), ranks, values))
+
+    def to_dict(self):
+        return {"means": self.means.tolist(), "weights": self.weights.tolist(), "min": self.min, "max": self.max}
+
+    @classmethod
+    def from_dict(cls, data, compression=DEFAULT_COMPRESSION):
+        return cls(compression, data["means"], data["weights"], data["min"], data["max"])
+
+
+class GeneratorSketch:
+    """
+    발전기 1개의 누적 통계: 행 수, Welford, t-digest, 반영 시점 Z-score 이상치 수, 마지막 날짜
+    """
+
+    def __init__(self, compression=DEFAULT_COMPRESSION):
+        self.rows = 0
+        self.z_outliers = 0
+        self.last_date = None
+        self.moments = Welford()
+        self.digest = TDigest(compression)
+
+    def update(self, values, dates=None):
+        self.rows += len(values)
+        self.moments.update(values)
+        self.digest.update(values)
+        if dates is not None and len(dates):
+            # NaT는 건너뜀 (np.max는 NaT가 하나라도 있으면 NaT → 이후 new_rows가 전체 행을 다시 반영하게 됨)
+            latest = pd.Series(dates).dropna().max()
+            if not pd.isna(latest) and (self.last_date is None or latest > self.last_date):
+                self.last_date = pd.Timestamp(latest)
+        return self
+
+    def merge(self, other):
+        self.rows += other.rows
+        self.z_outliers += other.z_outliers
+        self.moments.merge(other.moments)
+        self.digest.merge(other.digest)
+        if other.last_date is not None and (self.last_date is None or other.last_date > self.last_date):
+            self.last_date = other.last_date
+        return self
+
+    def iqr_bounds(self, k=1.5):
+        q1, q3 = self.digest.quantile(0.25), self.digest.quantile(0.75)
+        return q1, q3, q1 - k * (q3 - q1), q3 + k * (q3 - q1)
+
+    def to_dict(self):
+        return {
+            "rows": self.rows,
+            "z_outliers": self.z_outliers,
+            "last_date": None if self.last_date is None else self.last_date.isoformat(),
+            "welford": self.moments.to_list(),
+            "digest": self.digest.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data, compression=DEFAULT_COMPRESSION):
+        sketch = cls(compression)
+        sketch.rows, sketch.z_outliers = data["rows"], data["z_outliers"]
+        last_date = None if data["last_date"] is None else pd.Timestamp(data["last_date"])
+        sketch.last_date = None if pd.isna(last_date) else last_date
+        sketch.moments = Welford(*data["welford"])
+        sketch.digest = TDigest.from_dict(data["digest"], compression)
+        return sketch
+
+
+class SketchStore:
+    """
+    발전기명 → GeneratorSketch 모음 (JSON 저장/로드, 병합, 새 행 분류)
+    """
+
+    def __init__(self, compression=DEFAULT_COMPRESSION, iqr_k=1.5, z_threshold=3.0):
+        self.compression = compression
+        self.iqr_k = iqr_k
+        self.z_threshold = z_threshold
+        self.sketches = {}
+
+    # ---------------- 저장/로드/병합 ----------------
+    @classmethod
+    def load(cls, path, **kwargs):
+        store = cls(**kwargs)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            store.compression = data.get("compression", store.compression)
+            store.sketches = {name: GeneratorSketch.from_dict(s, store.compression)
+                              for name, s in data["generators"].items()}
+        return store
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        data = {"compression": self.compression,
+                "generators": {name: s.to_dict() for name, s in sorted(self.sketches.items())}}
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def merge(self, other):
+        for name, sketch in other.sketches.items():
+            if name in self.sketches:
+                self.sketches[name].merge(sketch)
+            else:
+                self.sketches[name] = sketch
+        return self
+
+    # ---------------- 새 행 선택/분류/갱신 ----------------
+    def new_rows(self, df, group_col="발전기명", date_col="날짜"):
+        """
+        발전기별 마지막 반영 날짜 이후의 행만 선택 (날짜가 없는(NaT) 행은 제외)
+        """
+        last = pd.Series({name: s.last_date for name, s in self.sketches.items()}, dtype="datetime64[ns]")
+        cutoff = pd.Series(last.reindex(df[group_col].to_numpy()).to_numpy(), index=df.index)
+        return df[df[group_col].notna() & df[date_col].notna() & (cutoff.isna() | (df[date_col] > cutoff))]
+
+    def bounds_table(self):
+        """
+        발전기별 현재 기준값 (Q1, Q3, 하한, 상한, 평균, 표준편차)
+        """
+        records = {}
+        for name, s in self.sketches.items():
+            q1, q3, lower, upper = s.iqr_bounds(self.iqr_k)
+            records[name] = {"Q1": q1, "Q3": q3, "하한": lower, "상한": upper,
+                             "평균": s.moments.mean if s.moments.n else float("nan"), "표준편차": s.moments.std()}
+        return pd.DataFrame.from_dict(records, orient="index",
+                                      columns=["Q1", "Q3", "하한", "상한", "평균", "표준편차"])
+
+    def classify(self, df, value_col="발전량(MWh)", group_col="발전기명"):
+        """
+        현재 sketch 기준으로 행 분류 → outliers.detect_outliers와 같은 형식의 플래그 DF
+        (sketch가 없는 발전기의 행은 IQR 기준으로는 이상치, Z-score 기준으로는 정상)
+        """
+        row_bounds = self.bounds_table().reindex(df[group_col].to_numpy())
+        x = df[value_col].to_numpy(dtype=np.float64)
+        in_range = (x >= row_bounds["하한"].to_numpy()) & (x <= row_bounds["상한"].to_numpy())
+        with np.errstate(divide="ignore", invalid="ignore"):
+            z = (x - row_bounds["평균"].to_numpy()) / row_bounds["표준편차"].to_numpy()
+        return pd.DataFrame({flag_column("iqr"): ~in_range,
+                             flag_column("zscore"): np.abs(z) > self.z_threshold}, index=df.index)
+
+    def update(self, df, value_col="발전량(MWh)", group_col="발전기명", date_col="날짜"):
+        """
+        새 행을 sketch에 반영한 뒤 갱신된 기준으로 분류 → 새 행의 플래그 DF
+        (전체 재계산과 같은 방식, 비용은 새 행 수 + 해당 발전기 수에 비례)
+        """
+        for name, sub in df.groupby(group_col, sort=False, observed=True):
+            sketch = self.sketches.setdefault(name, GeneratorSketch(self.compression))
+            sketch.update(sub[value_col].to_numpy(dtype=np.float64), sub[date_col].to_numpy())
+        flags = self.classify(df, value_col, group_col)
+        for name, n_out in flags[flag_column("zscore")].groupby(df[group_col], sort=False, observed=True).sum().items():
+            self.sketches[name].z_outliers += int(n_out)
+        return flags
+
+    # ---------------- 보고서 표 ----------------
+    def iqr_table(self):
+        """
+        outliers.iqr_detector 통계와 같은 컬럼의 발전기별 IQR 표
+        """
+        bounds = self.bounds_table().sort_index()
+        table = pd.DataFrame({"발전기명": bounds.index, "Q1": bounds["Q1"].to_numpy(), "Q3": bounds["Q3"].to_numpy()})
+        table["IQR"] = table["Q3"] - table["Q1"]
+        table["하한"] = bounds["하한"].to_numpy()
+        table["상한"] = bounds["상한"].to_numpy()
+        return table
+
+    def zscore_table(self):
+        """
+        outliers.zscore_detector 통계와 같은 컬럼의 발전기별 Z-score 표
+        (이상치수는 각 행이 반영된 시점의 평균/표준편차 기준 누적값)
+        """
+        records = []
+        for name in sorted(self.sketches):
+            s = self.sketches[name]
+            records.append({
+                "발전기명": name,
+                "평균": s.moments.mean if s.moments.n else float("nan"),
+                "표준편차": s.moments.std(),
+                "이상치수": s.z_outliers,
+                "전체데이터수": s.rows,
+                "이상치비율(%)": round(s.z_outliers / s.rows * 100, 2) if s.rows else 0.0,
+            })
+        return pd.DataFrame(records)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="발전기별 sketch 파일 병합")
+    sub = parser.add_subparsers(dest="command", required=True)
+    merge_parser = sub.add_parser("merge", help="여러 sketch 파일을 하나로 병합")
+    merge_parser.add_argument("output")
+    merge_parser.add_argument("inputs", nargs="+")
+    args = parser.parse_args()
+
+    merged = SketchStore.load(args.inputs[0])
+    for path in args.inputs[1:]:
+        merged.merge(SketchStore.load(path))
+    merged.save(args.output)
+    print(f"✅ {len(args.inputs)}개 파일 병합 → {args.output} (발전기 {len(merged.sketches)}개)")
@@ -0,0 +1,138 @@
+# 발전기별 시계열 교차검증 분할(폴드) 생성/캐시 유틸리티 파일
+#
+# - 무작위 train_test_split은 미래 날짜의 기상/발전량이 학습에 섞임 → 날짜 순서를 지키는 분할
+#   · rolling: 처음 MIN_TRAIN_DAYS일 이후 구간을 n_folds개 검증 구간으로 나누고,
+#     각 검증 구간보다 앞선 날짜 전체로 학습 (rolling-origin, 학습 구간이 점점 늘어남)
+#   · blocked: 전체 날짜를 n_folds개 연속 구간으로 나누고, 검증 구간 앞뒤 gap_days일을 뺀 나머지로 학습
+# - gap_days: 검증 구간과 학습 구간 사이에 비워 두는 날 수 (전날 기상이 다음날과 비슷해 생기는 누수 완화)
+# - 분할 결과(행 위치)는 (날짜 배열 + 분할 설정) 해시를 키로 .npz에 캐시
+#
+# 실행: python -m src.utils.timeseries_cv CSV경로 [--mode rolling|blocked] [--folds 5] [--gap-days 0]
+
+import argparse
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+CACHE_DIR = os.path.join(REPO_ROOT, "data", "cache", "cv_folds")
+CACHE_VERSION = 1   # 분할 로직이 바뀌면 올려서 기존 캐시 무효화
+
+MODES = ("rolling", "blocked")
+N_FOLDS = 5
+MIN_TRAIN_DAYS = 365   # rolling: 첫 검증 구간 전에 확보할 학습 기간
+MIN_TRAIN_ROWS = 10    # 학습 행이 이보다 적은 폴드는 버림
+
+
+def split_config(mode="rolling", n_folds=N_FOLDS, gap_days=0, min_train_days=MIN_TRAIN_DAYS):
+    """
+    분할 설정 dict (캐시 키와 결과 기록에 그대로 사용)
+    """
+    if mode not in MODES:
+        raise ValueError(f"지원하지 않는 분할 방식: {mode} (가능: {', '.join(MODES)})")
+    return {"mode": mode, "n_folds": int(n_folds), "gap_days": int(gap_days),
+            "min_train_days": int(min_train_days)}
+
+
+def _test_blocks(days, config):
+    # 검증 구간: 고유 날짜를 연속 구간으로 나눈 것 (rolling은 최소 학습 기간 이후만)
+    if config["mode"] == "rolling":
+        days = days[days >= days[0] + np.timedelta64(config["min_train_days"], "D")]
+    return [block for block in np.array_split(days, config["n_folds"]) if len(block)]
+
+
+def make_folds(dates, config):
+    """
+    날짜 배열 → [(학습 행 위치, 검증 행 위치), ...] (행 위치는 dates 순서 기준, 각 폴드 안에서는 오름차순)
+    """
+    dates = pd.to_datetime(pd.Series(dates)).to_numpy(dtype="datetime64[D]")
+    if len(dates) == 0:
+        return []
+    gap = np.timedelta64(config["gap_days"], "D")
+    folds = []
+    for block in _test_blocks(np.unique(dates), config):
+        start, end = block[0], block[-1]
+        test = (dates >= start) & (dates <= end)
+        train = dates < start - gap
+        if config["mode"] == "blocked":
+            train |= dates > end + gap
+        if train.sum() < MIN_TRAIN_ROWS:
+            continue
+        folds.append((np.flatnonzero(train), np.flatnonzero(test)))
+    return folds
+
+
+def fold_key(dates, config):
+    """
+    캐시 키: 날짜 배열(순서 포함) + 분할 설정
+    """
+    days = pd.to_datetime(pd.Series(dates)).to_numpy(dtype="datetime64[D]").astype(np.int64)
+    h = hashlib.sha256(days.tobytes())
+    h.update(json.dumps(dict(config, version=CACHE_VERSION), sort_keys=True).encode("utf-8"))
+    return h.hexdigest()
+
+
+def load_folds(dates, config, cache_dir=CACHE_DIR, refresh=False):
+    """
+    폴드 로드 (캐시에 있으면 .npz만 읽고, 없으면 만들어서 저장) → (폴드 목록, 캐시 사용 여부)
+    """
+    path = os.path.join(cache_dir, f"{fold_key(dates, config)[:24]}.npz")
+    if not refresh and os.path.exists(path):
+        with np.load(path, allow_pickle=False) as cached:
+            n = int(cached["n_folds"])
+            return [(cached[f"train_{k}"], cached[f"test_{k}"]) for k in range(n)], True
+
+    folds = make_folds(dates, config)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        arrays = {"n_folds": np.array(len(folds))}
+        for k, (train, test) in enumerate(folds):
+            arrays[f"train_{k}"], arrays[f"test_{k}"] = train, test
+        tmp_path = path + ".tmp.npz"
+        np.savez(tmp_path, **arrays)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"⚠️ 폴드 캐시 저장 실패 (계속 진행): {e}")
+    return folds, False
+
+
+def describe_fold(dates, train, test):
+    """
+    폴드의 학습/검증 기간 요약 (결과 CSV 기록용)
+    """
+    dates = pd.to_datetime(pd.Series(dates)).reset_index(drop=True)
+    fmt = "%Y-%m-%d"
+    return {
+        "학습 시작": dates[train].min().strftime(fmt),
+        "학습 끝": dates[train].max().strftime(fmt),
+        "검증 시작": dates[test].min().strftime(fmt),
+        "검증 끝": dates[test].max().strftime(fmt),
+        "학습 수": len(train),
+        "검증 수": len(test),
+    }
+
+
+if __name__ == "__main__":
+    from src.utils.data_io import load_dataset
+
+    parser = argparse.ArgumentParser(description="발전기별 시계열 교차검증 폴드 확인")
+    parser.add_argument("csv_path")
+    parser.add_argument("--mode", default="rolling", choices=MODES)
+    parser.add_argument("--folds", type=int, default=N_FOLDS)
+    parser.add_argument("--gap-days", type=int, default=0)
+    parser.add_argument("--min-train-days", type=int, default=MIN_TRAIN_DAYS)
+    args = parser.parse_args()
+
+    config = split_config(args.mode, args.folds, args.gap_days, args.min_train_days)
+    df = load_dataset(args.csv_path)
+    for gen_name, group in df.groupby('발전기명', observed=True):
+        dates = group['날짜'].sort_values(kind="stable")
+        folds, cached = load_folds(dates, config)
+        print(f"📅 {gen_name}: 폴드 {len(folds)}개{' (캐시)' if cached else ''}")
+        for k, (train, test) in enumerate(folds, start=1):
+            d = describe_fold(dates, train, test)
+            print(f"   {k}) 학습 {d['학습 시작']}~{d['학습 끝']} ({d['학습 수']}) → "
+                  f"검증 {d['검증 시작']}~{d['검증 끝']} ({d['검증 수']})")
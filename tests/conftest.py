@@ -0,0 +1,6 @@
+# 테스트 공통 설정: 저장소 루트를 import 경로에 추가 (src.utils.* import용)
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
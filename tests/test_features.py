@@ -0,0 +1,41 @@
+# src/utils/features.py 테스트 (전처리 방식이 기존 스크립트와 같은 행을 남기는지)
+
+import numpy as np
+import pandas as pd
+
+from src.utils.features import FEATURES_FULL, TARGET, preprocess
+
+
+def _raw():
+    n = 6
+    df = pd.DataFrame({
+        "지점": ["서울"] * n,
+        "날짜": pd.date_range("2024-01-01", periods=n),
+        "발전기명": ["A"] * n,
+        **{c: np.arange(n, dtype=float) + 1 for c in FEATURES_FULL},
+        TARGET: np.arange(n, dtype=float) + 1,
+        "비고": [1.0] * n,   # 행렬에 쓰지 않는 컬럼
+    })
+    df.loc[0, "일강수량(mm)"] = np.nan        # 0으로 채워서 유지
+    df.loc[1, "합계 일사량(MJ/m2)"] = np.nan  # 결측 제거
+    df.loc[2, "평균기온(°C)"] = np.inf        # 무한대 제거
+    df.loc[3, "비고"] = np.nan                # 행렬 밖 컬럼 결측도 제거 (기존 스크립트와 동일)
+    return df
+
+
+def test_rain_zero_finite_matches_legacy_script():
+    raw = _raw()
+    legacy = raw.copy()
+    legacy["일강수량(mm)"] = legacy["일강수량(mm)"].fillna(0)
+    legacy = legacy.dropna(subset=["합계 일사량(MJ/m2)"])
+    legacy = legacy.replace([np.inf, -np.inf], np.nan).dropna()
+
+    df, info = preprocess(raw, "rain_zero_finite")
+    assert list(df.index) == list(legacy.index) == [0, 4, 5]
+    assert "비고" not in df.columns
+    assert info == {"원본행수": 6, "결측제거": 1, "무한대제거": 2, "발전량0제거": 0, "행수": 3}
+
+
+def test_rain_zero_keeps_rows_with_gaps_outside_matrix():
+    df, _ = preprocess(_raw(), "rain_zero")
+    assert list(df.index) == [0, 2, 3, 4, 5]
@@ -0,0 +1,180 @@
+# src/utils/kma_client.py 테스트 (로컬 http.server를 기상청 API 대신 사용)
+#
+# - 토큰 버킷 속도 제한, 동시 요청 수 상한, 429 + Retry-After 백오프, 마감 시간 처리
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.utils.kma_client import KMAFetcher, TokenBucket
+
+
+class StubServer:
+    """
+    요청 시각/동시 처리 수를 기록하는 로컬 서버
+    - delay: 응답 지연(초)
+    - fail_first: 처음 n건은 429 (Retry-After: retry_after)
+    """
+
+    def __init__(self, delay=0.0, fail_first=0, retry_after=None):
+        self.delay = delay
+        self.fail_first = fail_first
+        self.retry_after = retry_after
+        self.times = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with stub.lock:
+                    stub.times.append(time.monotonic())
+                    n = len(stub.times)
+                    stub.active += 1
+                    stub.max_active = max(stub.max_active, stub.active)
+                try:
+                    time.sleep(stub.delay)
+                    if n <= stub.fail_first:
+                        self.send_response(429)
+                        if stub.retry_after is not None:
+                            self.send_header("Retry-After", str(stub.retry_after))
+                        body = b"Too Many Requests"
+                    else:
+                        self.send_response(200)
+                        body = b"#START7777\n| LAT | LON | 202401010000 |\n| 37.0 | 127.0 | 1.0 |\n#7777END\n"
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                finally:
+                    with stub.lock:
+                        stub.active -= 1
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/api"
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub_server():
+    servers = []
+
+    def start(**kwargs):
+        server = StubServer(**kwargs)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.close()
+
+
+def _jobs(url, n):
+    return ((i, url, {"i": i}) for i in range(n))
+
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=20, burst=1)
+    start = time.monotonic()
+    for _ in range(11):
+        bucket.acquire()
+    # 첫 토큰은 바로, 나머지 10개는 초당 20개 → 최소 0.5초
+    assert time.monotonic() - start >= 0.45
+
+
+def test_token_bucket_pause_blocks_acquire():
+    bucket = TokenBucket(rate=100, burst=5)
+    bucket.pause(0.3)
+    start = time.monotonic()
+    bucket.acquire()
+    assert time.monotonic() - start >= 0.28
+
+
+def test_fetch_all_respects_rate_limit(stub_server):
+    server = stub_server()
+    fetcher = KMAFetcher(rate=20, burst=1, max_workers=4)
+    results = dict(fetcher.fetch_all(_jobs(server.url, 21)))
+    fetcher.close()
+
+    assert sorted(results) == list(range(21))
+    assert all(r["status"] == 200 for r in results.values())
+    # 21건 = 즉시 1건 + 20건 × 0.05초 → 요청 시각 간격이 최소 약 1초
+    assert server.times[-1] - server.times[0] >= 0.9
+    assert fetcher.request_count == 21
+
+
+def test_fetch_all_bounds_in_flight_requests(stub_server):
+    server = stub_server(delay=0.1)
+    fetcher = KMAFetcher(rate=1000, max_workers=3)
+    consumed = []
+
+    def jobs():
+        for i in range(12):
+            consumed.append(i)
+            yield i, server.url, {"i": i}
+
+    stream = fetcher.fetch_all(jobs())
+    next(stream)
+    # 작업 목록은 한 번에 다 꺼내지 않고 진행 중 요청 max_workers*2개까지만 미리 꺼냄
+    assert len(consumed) <= 3 * 2 + 1
+    rest = list(stream)
+    fetcher.close()
+
+    assert len(rest) == 11
+    assert server.max_active <= 3
+    assert server.max_active == 3
+
+
+def test_get_retries_429_after_retry_after(stub_server):
+    server = stub_server(fail_first=1, retry_after=0.3)
+    fetcher = KMAFetcher(rate=1000, max_workers=1, max_retries=3)
+    start = time.monotonic()
+    result = fetcher.get(server.url)
+    elapsed = time.monotonic() - start
+    fetcher.close()
+
+    assert result["status"] == 200
+    assert result["retries"] == 1
+    assert fetcher.retry_count == 1
+    assert len(server.times) == 2
+    # 두 번째 요청은 Retry-After만큼 기다린 뒤
+    assert server.times[1] - server.times[0] >= 0.28
+    assert elapsed >= 0.28
+
+
+def test_get_gives_up_after_max_retries(stub_server):
+    server = stub_server(fail_first=100, retry_after=0)
+    fetcher = KMAFetcher(rate=1000, max_workers=1, max_retries=2)
+    result = fetcher.get(server.url)
+    fetcher.close()
+
+    assert result["status"] == 429
+    assert result["retries"] == 2
+    assert fetcher.request_count == 3
+    assert len(server.times) == 3
+
+
+def test_fetch_all_deadline_reports_unfinished_jobs(stub_server):
+    server = stub_server(delay=1.0)
+    fetcher = KMAFetcher(rate=1000, max_workers=2)
+    start = time.monotonic()
+    results = dict(fetcher.fetch_all(_jobs(server.url, 6), deadline=0.2))
+    elapsed = time.monotonic() - start
+    fetcher.close()
+
+    # 마감 후 바로 반환, 보내지 않은 요청까지 모든 키를 오류 결과로 보고
+    assert elapsed < 0.9
+    assert sorted(results) == list(range(6))
+    assert all(r["status"] is None and r["error"] == "마감 시간 초과" for r in results.values())
+    assert len(server.times) <= 2
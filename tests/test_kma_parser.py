@@ -0,0 +1,68 @@
+# src/utils/kma_parser.py 테스트 (벡터화 파서 결과를 기존 루프 방식 _legacy_parse와 비교)
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.kma_parser import _legacy_parse, parse_wide_table
+
+
+def _table(headers, values):
+    return ("#START7777\n| LAT | LON | X | Y | " + " | ".join(headers) + " |\n"
+            "| 37.5 | 126.9 | 1 | 2 | " + " | ".join(values) + " |\n#7777END\n")
+
+
+def _assert_same_as_legacy(text, time_format):
+    legacy = _legacy_parse(text, time_format)
+    parsed = parse_wide_table(text, time_format=time_format)
+    if legacy.empty:
+        assert parsed is None
+        return
+    times, values = parsed
+    np.testing.assert_array_equal(times, legacy["DATETIME"].to_numpy("datetime64[ns]"))
+    np.testing.assert_array_equal(values, legacy["SI"].to_numpy(np.float64))
+
+
+def test_valid_headers_match_legacy():
+    headers = pd.date_range("2024-02-28", periods=96, freq="30min").strftime("%Y%m%d%H%M")
+    values = ["-nan" if i % 7 == 0 else f"{i * 1.5:.1f}" for i in range(len(headers))]
+    _assert_same_as_legacy(_table(headers, values), "%Y%m%d%H%M")
+
+
+@pytest.mark.parametrize("time_format, bad", [
+    ("%Y%m%d%H%M", ["202402300000", "202302290030", "202404310100"]),
+    ("%Y%m%d%H%M", ["202402300000", "202302290030", "202404310100", "202413010000",
+                    "202400010000", "202401000000", "202401012400", "202401010060"]),
+    ("%Y%m%d%H", ["2024023000", "2023022912", "2024010124", "2024130100"]),
+])
+def test_invalid_headers_are_dropped_like_legacy(time_format, bad):
+    good = pd.date_range("2024-02-29", periods=4, freq="3h").strftime(time_format).tolist()
+    headers = good[:2] + bad + good[2:]
+    values = [f"{i:.1f}" for i in range(len(headers))]
+    text = _table(headers, values)
+
+    times, numbers = parse_wide_table(text, time_format=time_format)
+    # 없는 날짜(2월 30일 등)가 다음 달로 넘어가지 않고 빠짐
+    assert list(pd.DatetimeIndex(times).strftime(time_format)) == good
+    np.testing.assert_array_equal(numbers, [0.0, 1.0, len(headers) - 2, len(headers) - 1])
+    _assert_same_as_legacy(text, time_format)
+
+
+def test_leap_day_is_kept():
+    times, _ = parse_wide_table(_table(["202402290000", "202402291230"], ["1.0", "2.0"]))
+    assert list(pd.DatetimeIndex(times)) == [pd.Timestamp("2024-02-29 00:00"), pd.Timestamp("2024-02-29 12:30")]
+
+
+def test_non_numeric_values_and_mixed_headers_match_legacy():
+    headers = ["202401010000", "2024-01-01", "202401010100", "202401010130", "202401010200"]
+    values = ["1.0", "2.0", "abc", "nan", "-nan"]
+    _assert_same_as_legacy(_table(headers, values), "%Y%m%d%H%M")
+
+
+def test_all_invalid_returns_none():
+    assert parse_wide_table(_table(["202402300000", "202402310000"], ["1.0", "2.0"])) is None
+
+
+def test_utc_to_kst_shift():
+    times, _ = parse_wide_table(_table(["2024013118"], ["1.0"]), time_format="%Y%m%d%H", utc_to_kst=True)
+    assert times[0] == np.datetime64("2024-02-01T03:00", "ns")
@@ -0,0 +1,34 @@
+# src/utils/parquet_sink.py 테스트 (기간/발전소를 지정한 CSV 내보내기)
+
+import pandas as pd
+
+from src.utils.parquet_sink import ParquetSink, export_csv
+
+
+def _write(root, plant, start, periods):
+    sink = ParquetSink(str(root), "sat")
+    times = pd.date_range(start, periods=periods, freq="30min")
+    sink.write(pd.DataFrame({"발전기명": plant, "DATETIME": times, "SI": 1.0}))
+    sink.close()
+
+
+def test_export_csv_keeps_only_requested_period_and_plants(tmp_path):
+    # 같은 저장소에 다른 연도/다른 발전소 수집분이 섞여 있는 경우
+    for year in (2023, 2024, 2025):
+        _write(tmp_path, "A", f"{year}-12-31 00:00", 96)
+    _write(tmp_path, "B", "2024-06-01 00:00", 48)
+
+    output = tmp_path / "out.csv"
+    n_rows = export_csv(str(tmp_path), "sat", str(output), start="20240101", end="2024-12-31 23:30", plants=["A"])
+    df = pd.read_csv(output, parse_dates=["DATETIME"])
+
+    assert n_rows == len(df) == 96
+    assert set(df["발전기명"]) == {"A"}
+    assert df["DATETIME"].min() == pd.Timestamp("2024-01-01 00:00")
+    assert df["DATETIME"].max() == pd.Timestamp("2024-12-31 23:30")
+
+
+def test_export_csv_without_range_exports_everything(tmp_path):
+    for year in (2023, 2024):
+        _write(tmp_path, "A", f"{year}-12-31 00:00", 96)
+    assert export_csv(str(tmp_path), "sat", str(tmp_path / "all.csv")) == 192
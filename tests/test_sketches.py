@@ -0,0 +1,37 @@
+# src/utils/sketches.py 테스트 (날짜 결측(NaT)이 섞인 증분 갱신)
+
+import numpy as np
+import pandas as pd
+
+from src.utils.sketches import GeneratorSketch, SketchStore
+
+
+def _frame(dates, values):
+    return pd.DataFrame({"발전기명": "A", "날짜": pd.to_datetime(dates), "발전량(MWh)": values})
+
+
+def test_update_ignores_nat_dates():
+    sketch = GeneratorSketch().update(np.array([1.0, 2.0]),
+                                      pd.to_datetime(["2024-01-01", None]).to_numpy())
+    assert sketch.last_date == pd.Timestamp("2024-01-01")
+    sketch.update(np.array([3.0]), pd.to_datetime([None]).to_numpy())
+    assert sketch.last_date == pd.Timestamp("2024-01-01")
+
+
+def test_incremental_rerun_does_not_recount_rows(tmp_path):
+    path = str(tmp_path / "sketch.json")
+    df = _frame(["2024-01-01", "2024-01-02", None], [1.0, 2.0, 3.0])
+
+    store = SketchStore.load(path)
+    new_df = store.new_rows(df)
+    assert len(new_df) == 2   # 날짜 없는 행은 반영하지 않음
+    store.update(new_df)
+    store.save(path)
+
+    # 같은 데이터로 다시 실행하면 새 행 없음, 다음 날짜만 추가
+    store = SketchStore.load(path)
+    assert store.new_rows(df).empty
+    df = pd.concat([df, _frame(["2024-01-03"], [4.0])], ignore_index=True)
+    store.update(store.new_rows(df))
+    assert store.sketches["A"].rows == 3
+    assert store.sketches["A"].last_date == pd.Timestamp("2024-01-03")
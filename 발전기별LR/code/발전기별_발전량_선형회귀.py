@@ -6,6 +6,10 @@ from sklearn.model_selection import train_test_split
 from sklearn.metrics import r2_score, mean_squared_error
 import matplotlib.pyplot as plt
 import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from src.utils.features import build_features
 
 # macOS 한글 폰트 설정
 plt.rcParams['font.family'] = 'AppleGothic'   # 한글 폰트
@@ -15,23 +19,14 @@ plt.rcParams['axes.unicode_minus'] = False    # 마이너스 기호 깨짐
 file_path = "/Users/parkhyeji/Desktop/RE_PV/이상치제거전데이터/동서/한국동서발전.csv"
 output_csv = "/Users/parkhyeji/Desktop/RE_PV/동서.csv"
 
-# CSV 읽기
-df = pd.read_csv(file_path, encoding='utf-8-sig')
-
-# 1. 일강수량 결측값을 0으로 대체
-df['일강수량(mm)'] = df['일강수량(mm)'].fillna(0)
-
-# 2. 합계 일사량 결측값 개수 세기
-missing_solar_count = df['합계 일사량(MJ/m2)'].isna().sum()
-print(f"합계 일사량(MJ/m2) 결측값 개수: {missing_solar_count}")
-
-# 3. 결측값 제외
-df = df.dropna(subset=['합계 일사량(MJ/m2)'])
+# CSV 읽기 + 결측 처리 (일강수량 결측값 0으로 대체, 합계 일사량 결측값 제외)
+df, prep = build_features(file_path, "rain_zero")
+print(f"합계 일사량(MJ/m2) 결측값 개수: {prep['결측제거']}")
 
 # 4. 발전기별 회귀 분석 수행
 results = []
 
-for gen_name, group in df.groupby('발전기명'):
+for gen_name, group in df.groupby('발전기명', observed=True):
     X = group[['설비용량(MW)', '평균기온(°C)', '일강수량(mm)', '평균 풍속(m/s)',
                '평균 상대습도(%)', '합계 일조시간(hr)', '합계 일사량(MJ/m2)']]
     y = group['발전량(MWh)']
@@ -4,6 +4,10 @@ import statsmodels.api as sm
 from sklearn.metrics import r2_score, mean_squared_error
 import matplotlib.pyplot as plt
 import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from src.utils.features import build_features
 
 plt.rcParams['font.family'] = 'AppleGothic'
 plt.rcParams['axes.unicode_minus'] = False
@@ -11,18 +15,9 @@ plt.rcParams['axes.unicode_minus'] = False
 file_path = "/Users/parkhyeji/Desktop/RE_PV/이상치제거(인천,발전량0)/한국중부발전.csv"
 save_path = "/Users/parkhyeji/Desktop/RE_PV/중부(이상치제거)_회귀결과.csv"
 
-df = pd.read_csv(file_path, encoding='utf-8-sig')
-
-# 결측치 처리
-df['일강수량(mm)'] = df['일강수량(mm)'].fillna(0)
-missing_solar_count = df['합계 일사량(MJ/m2)'].isna().sum()
-print(f"합계 일사량(MJ/m2) 결측값 개수: {missing_solar_count}")
-
-# 합계 일사량 결측 제거
-df = df.dropna(subset=['합계 일사량(MJ/m2)'])
-
-# 무한대 값 제거
-df = df.replace([np.inf, -np.inf], np.nan).dropna()
+# 결측치 처리 (일강수량 0, 합계 일사량 결측 제거, 무한대 값 제거)
+df, prep = build_features(file_path, "rain_zero_finite")
+print(f"합계 일사량(MJ/m2) 결측값 개수: {prep['결측제거']}")
 
 # 분석 대상 컬럼
 X_cols = ['설비용량(MW)', '평균기온(°C)', '일강수량(mm)', '평균 풍속(m/s)',
@@ -31,7 +26,7 @@ y_col = '발전량(MWh)'
 
 results = []
 
-for gen_name, group in df.groupby('발전기명'):
+for gen_name, group in df.groupby('발전기명', observed=True):
     if len(group) < 10:
         continue
 
@@ -4,6 +4,10 @@ import statsmodels.api as sm
 from sklearn.metrics import r2_score, mean_squared_error
 import matplotlib.pyplot as plt
 import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from src.utils.features import build_features
 
 # macOS 한글 폰트 설정
 plt.rcParams['font.family'] = 'AppleGothic'
@@ -12,12 +16,8 @@ plt.rcParams['axes.unicode_minus'] = False
 file_path = "/Users/parkhyeji/Desktop/RE_PV/이상치제거(인천,발전량0)/한국중부발전.csv"
 save_path = "/Users/parkhyeji/Desktop/RE_PV/중부(이상치제거)_변수검정_최적회귀.csv"
 
-df = pd.read_csv(file_path, encoding='utf-8-sig')
-
-# 결측 처리
-df['일강수량(mm)'] = df['일강수량(mm)'].fillna(0)
-df = df.dropna(subset=['합계 일사량(MJ/m2)'])
-df = df.replace([np.inf, -np.inf], np.nan).dropna()
+# 결측 처리 (일강수량 0, 합계 일사량 결측 제거, 무한대 값 제거)
+df, _ = build_features(file_path, "rain_zero_finite")
 
 # 변수 지정
 X_cols = ['설비용량(MW)', '평균기온(°C)', '일강수량(mm)',
@@ -27,7 +27,7 @@ y_col = '발전량(MWh)'
 
 results = []
 
-for gen_name, group in df.groupby('발전기명'):
+for gen_name, group in df.groupby('발전기명', observed=True):
     if len(group) < 10:
         continue
 
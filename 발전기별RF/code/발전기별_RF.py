@@ -4,6 +4,10 @@ from sklearn.model_selection import train_test_split
 from sklearn.metrics import r2_score, mean_squared_error
 import matplotlib.pyplot as plt
 import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from src.utils.features import build_features
 
 # ✅ macOS 한글 폰트 설정
 plt.rcParams['font.family'] = 'AppleGothic'
@@ -17,18 +21,14 @@ output_folder = "/Users/parkhyeji/Desktop/RE_PV/data/발전기별RF/"
 # 🔹 폴더 없으면 생성
 os.makedirs(output_folder, exist_ok=True)
 
-# 🔹 데이터 불러오기
-df = pd.read_csv(file_path, encoding='utf-8-sig')
-
-# 🔹 결측 처리
-df['일강수량(mm)'] = df['일강수량(mm)'].fillna(0)
-df = df.dropna(subset=['합계 일사량(MJ/m2)'])
+# 🔹 데이터 불러오기 + 결측 처리 (일강수량 0, 합계 일사량 결측 제거)
+df, _ = build_features(file_path, "rain_zero")
 
 # 🔹 결과 저장용 리스트
 results = []
 
 # 🔹 발전기명별 반복 학습
-for gen_name, group in df.groupby('발전기명'):
+for gen_name, group in df.groupby('발전기명', observed=True):
     if len(group) < 10:
         print(f"⚠️ {gen_name}: 데이터가 너무 적어 학습 건너뜀 ({len(group)}개)")
         continue
@@ -5,6 +5,10 @@ from sklearn.metrics import r2_score, mean_squared_error
 import matplotlib.pyplot as plt
 import os
 import numpy as np
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from src.utils.features import build_features
 
 # macOS 한글 폰트 설정
 plt.rcParams['font.family'] = 'AppleGothic'
@@ -19,12 +23,8 @@ importance_csv = "/Users/parkhyeji/Desktop/RE_PV/RF/data/발전기별RF/동서_R
 # 폴더 없으면 생성
 os.makedirs(output_folder, exist_ok=True)
 
-# 데이터 불러오기
-df = pd.read_csv(file_path, encoding='utf-8-sig')
-
-# 결측 처리
-df['일강수량(mm)'] = df['일강수량(mm)'].fillna(0)
-df = df.dropna(subset=['합계 일사량(MJ/m2)'])
+# 데이터 불러오기 + 결측 처리 (일강수량 0, 합계 일사량 결측 제거)
+df, _ = build_features(file_path, "rain_zero")
 
 # 사용 변수 목록
 features = ['설비용량(MW)', '평균기온(°C)', '일강수량(mm)',
@@ -40,7 +40,7 @@ all_importances = []   # 전체 발전기 중요도 누적용
 # ======================================================
 # 발전기명별 반복 학습
 # ======================================================
-for gen_name, group in df.groupby('발전기명'):
+for gen_name, group in df.groupby('발전기명', observed=True):
     if len(group) < 10:
         print(f"{gen_name}: 데이터가 너무 적어 학습 건너뜀 ({len(group)}개)")
         continue
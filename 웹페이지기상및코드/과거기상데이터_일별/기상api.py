@@ -1,46 +1,79 @@
 import pandas as pd
+import io
+import os
+import sys
 
-def get_kma_data(stn_id):
-    """
-    기상청 API를 호출하여 특정 지점의 일별 데이터를 DataFrame으로 반환
-    """
-    base_url = 'https://apihub.kma.go.kr/api/typ01/url/kma_sfcdd3.php'
-    tm1 = '20220101'
-    tm2 = '20241231'
-    authKey = 'vLfGjQIPTia3xo0CD94muA'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from src.utils.kma_client import KMAFetcher, KMA_BASE_URL
+from src.utils.kma_cache import KMACache
+
+BASE_URL = KMA_BASE_URL + '/api/typ01/url/kma_sfcdd3.php'
+AUTH_KEY = 'vLfGjQIPTia3xo0CD94muA'
+DEFAULT_TM1 = '20220101'
+DEFAULT_TM2 = '20241231'
+
+# [요청 속도 제어] 여러 지점을 동시에 받되 초당 요청 수는 제한
+RATE_LIMIT = 1.0
+MAX_WORKERS = 4
+
+# ✅ 컬럼 인덱스 매핑 (일자료 기준)
+column_map = {
+    0: '날짜',
+    1: '지점',
+    2: '풍속',
+    10: '기온',     
+    18: '습도',     
+    38: '강수량',    
+    32: '일조',     
+    35: '일사'
+    # 기온 풍속 강수량 일조시간 일사량 습도 
+}
+
+# 과거 관측 자료는 바뀌지 않으므로 디스크 캐시에 영구 보관 (KMA_CACHE_MODE=replay면 캐시만 사용)
+_fetcher = KMAFetcher(rate=RATE_LIMIT, max_workers=MAX_WORKERS, cache=KMACache())
 
-    url = f"{base_url}?stn={stn_id}&tm1={tm1}&tm2={tm2}&help=1&authKey={authKey}"
 
+def build_params(stn_id, tm1=DEFAULT_TM1, tm2=DEFAULT_TM2):
+    return {'stn': stn_id, 'tm1': tm1, 'tm2': tm2, 'help': 1, 'authKey': AUTH_KEY}
+
+
+def parse_daily_response(content):
+    """
+    일자료 응답 본문(bytes)을 매핑된 컬럼의 DataFrame으로 변환
+    """
     try:
-        # ✅ 데이터 요청
         df = pd.read_csv(
-            url,
+            io.BytesIO(content),
             sep=r'\s+',         # 구분자: 하나 이상의 공백
             comment='#',       
             header=None,       
             encoding='euc-kr'
         )
+    except pd.errors.EmptyDataError:
+        # 요청 기간에 자료가 없으면 (주석만 있는 응답) 빈 DF
+        return pd.DataFrame(columns=list(column_map.values()))
+
+    # ✅ 실제 존재하는 컬럼만 선택
+    valid_cols = [col for col in column_map.keys() if col in df.columns]
+    df_selected = df[valid_cols].rename(columns=column_map)
 
-        # ✅ 컬럼 인덱스 매핑 (일자료 기준)
-        column_map = {
-            0: '날짜',
-            1: '지점',
-            2: '풍속',
-            10: '기온',     
-            18: '습도',     
-            38: '강수량',    
-            32: '일조',     
-            35: '일사'
-            # 기온 풍속 강수량 일조시간 일사량 습도 
-        }
-
-          # ✅ 실제 존재하는 컬럼만 선택
-        valid_cols = [col for col in column_map.keys() if col in df.columns]
-        df_selected = df[valid_cols].rename(columns=column_map)
-
-        # ✅ 날짜 필터 및 타입 변환
-        df_selected = df_selected.dropna(subset=['날짜'])
-        df_selected['날짜'] = df_selected['날짜'].astype(str)
+    # ✅ 날짜 필터 및 타입 변환
+    df_selected = df_selected.dropna(subset=['날짜'])
+    df_selected['날짜'] = df_selected['날짜'].astype(str)
+    return df_selected
+
+
+def get_kma_data(stn_id, tm1=DEFAULT_TM1, tm2=DEFAULT_TM2):
+    """
+    기상청 API를 호출하여 특정 지점의 tm1~tm2 일별 데이터를 DataFrame으로 반환
+    """
+    try:
+        # ✅ 데이터 요청 (캐시 우선)
+        result = _fetcher.get(BASE_URL, build_params(stn_id, tm1, tm2))
+        if result['error'] is not None or result['status'] != 200:
+            raise RuntimeError(f"요청 실패 (상태 코드 {result['status']}, {result['error']})")
+
+        df_selected = parse_daily_response(result['content'])
 
         print(f"\n📋 컬럼 매핑 후 컬럼 목록: {list(df_selected.columns)}")
         print(f"📊 {stn_id} 지점 데이터 {len(df_selected)}행 로드 완료\n")
@@ -53,4 +86,23 @@ def get_kma_data(stn_id):
         return pd.DataFrame()  # 빈 DF 반환
 
 
-df_test = get_kma_data('108') 
\ No newline at end of file
+def fetch_stations(windows):
+    """
+    windows: {지점코드: (tm1, tm2)}
+    여러 지점을 속도 제한 안에서 동시에 요청하여 완료 순서대로 (지점코드, DataFrame 또는 None) yield
+    """
+    jobs = ((stn_id, BASE_URL, build_params(stn_id, tm1, tm2)) for stn_id, (tm1, tm2) in windows.items())
+    for stn_id, result in _fetcher.fetch_all(jobs):
+        if result['error'] is not None or result['status'] != 200:
+            print(f"❌ {stn_id} 지점 요청 실패 (상태 코드 {result['status']}, {result['error']})")
+            yield stn_id, None
+            continue
+        try:
+            yield stn_id, parse_daily_response(result['content'])
+        except Exception as e:
+            print(f"❌ {stn_id} 지점 데이터 읽기 오류 발생: {e}")
+            yield stn_id, None
+
+
+if __name__ == "__main__":
+    df_test = get_kma_data('108')
@@ -1,6 +1,8 @@
 import pandas as pd
-import time
-from 기상api import get_kma_data  # get_kma_data 함수가 들어있는 파일명 맞춰주세요
+import os
+import datetime
+import shutil
+from 기상api import fetch_stations  # 기상api.py와 같은 폴더에서 실행
 
 # -------------------------------------------------------
 # 1️⃣ 수집할 지점 목록 (지점명 → 코드)
@@ -29,51 +31,90 @@ station_dict = {
 }
 
 # -------------------------------------------------------
-# 모든 지점 데이터 반복 수집
+# 2️⃣ 저장 파일 / 수집 기간
 # -------------------------------------------------------
-all_data = []
+# 수집 기간 끝이 매일 어제로 늘어나므로 파일 이름에 연도를 넣지 않음 (KMA_DAILY_OUTPUT 환경변수로 변경 가능)
+output_file = os.environ.get("KMA_DAILY_OUTPUT", "전국_일별기상데이터.csv")
+legacy_output_file = "전국_일별기상데이터_2022_2024.csv"   # 이전 이름 (2022~2024 전체 수집본)
+START_DATE = '20220101'
+# 어제(KST)까지 수집 (오늘 일자료는 아직 확정되지 않음)
+KST = datetime.timezone(datetime.timedelta(hours=9))
+END_DATE = (datetime.datetime.now(KST) - datetime.timedelta(days=1)).strftime('%Y%m%d')
 
-for name, stn_id in station_dict.items():
-    print(f"📡 {name}({stn_id}) 데이터 수집 중...")
-
-    df = get_kma_data(stn_id)
-
-    if not df.empty:
-        # 결측치(-9, NaN 등)를 모두 0으로 변환
-        df = df.replace([-9, -99, -999, -9999], 0)
-        df = df.fillna(0)
+cols = ['지역명', '날짜', '풍속', '기온', '습도', '강수량', '일조', '일사']
 
-        # ✅ 지역명 추가
-        df['지역명'] = name
+# -------------------------------------------------------
+# 3️⃣ 지점별 마지막 저장 날짜 확인 → 빠진 기간만 요청
+# -------------------------------------------------------
+# 새 이름의 파일이 없으면 이전 이름 파일을 복사해서 이어 받음 (이전 파일은 그대로 둠)
+if not os.path.exists(output_file) and os.path.exists(legacy_output_file):
+    shutil.copyfile(legacy_output_file, output_file)
+    print(f"📄 {legacy_output_file} → {output_file} 복사 후 이어서 수집")
 
-        all_data.append(df)
-    else:
-        print(f"⚠️ {name}({stn_id}) 데이터 없음!")
+last_dates = {}
+if os.path.exists(output_file):
+    df_saved = pd.read_csv(output_file, encoding='utf-8-sig', usecols=['지역명', '날짜'], dtype={'날짜': str})
+    last_dates = df_saved.groupby('지역명')['날짜'].max().to_dict()
+    # 기존 파일의 컬럼 순서를 그대로 따라 이어쓰기
+    cols = list(pd.read_csv(output_file, encoding='utf-8-sig', nrows=0).columns)
 
-    time.sleep(1.5)  # API 서버 차단 방지용
+windows = {}
+for name, stn_id in station_dict.items():
+    last = last_dates.get(name)
+    tm1 = START_DATE if last is None else (pd.Timestamp(last) + pd.Timedelta(days=1)).strftime('%Y%m%d')
+    if tm1 > END_DATE:
+        print(f"✅ {name}({stn_id}) 최신 상태 (마지막 {last})")
+        continue
+    windows[stn_id] = (tm1, END_DATE)
+    print(f"📡 {name}({stn_id}) {tm1} ~ {END_DATE} 요청 예정")
 
 # -------------------------------------------------------
-# 3️⃣ 전체 병합 및 컬럼 정리
+# 4️⃣ 지점 동시 수집 → 끝나는 지점부터 파일 끝에 이어쓰기
 # -------------------------------------------------------
-if all_data:
-    df_final = pd.concat(all_data, ignore_index=True)
+station_names = {stn_id: name for name, stn_id in station_dict.items()}
+appended_rows = 0
 
-    # 필요한 컬럼만 정리
-    cols = ['지역명', '날짜', '풍속', '기온', '습도', '강수량', '일조', '일사']
-    df_final = df_final[[c for c in cols if c in df_final.columns]]
+for stn_id, df in fetch_stations(windows):
+    name = station_names[stn_id]
 
-    # 날짜 기준 정렬
-    df_final = df_final.sort_values(['지역명', '날짜']).reset_index(drop=True)
+    if df is None:
+        print(f"⚠️ {name}({stn_id}) 수집 실패 → 다음 실행 때 다시 요청")
+        continue
+    if df.empty:
+        print(f"⚠️ {name}({stn_id}) 새 데이터 없음!")
+        continue
 
-    print("\n최종 데이터 요약:")
-    print(df_final.head())
+    # 결측치(-9, NaN 등)를 모두 0으로 변환
+    df = df.replace([-9, -99, -999, -9999], 0)
+    df = df.fillna(0)
 
-    # ---------------------------------------------------
-    # CSV 파일 저장
-    # ---------------------------------------------------
-    output_file = "전국_일별기상데이터_2022_2024.csv"
-    df_final.to_csv(output_file, encoding='utf-8-sig', index=False)
-    print(f"\n💾 저장 완료 → {output_file}")
+    # ✅ 지역명 추가 + 이미 저장된 날짜는 제외
+    df['지역명'] = name
+    if name in last_dates:
+        df = df[df['날짜'] > last_dates[name]]
+
+    df = df[[c for c in cols if c in df.columns]].sort_values('날짜')
+    if df.empty:
+        print(f"✅ {name}({stn_id}) 새 날짜 없음")
+        continue
+
+    write_header = not os.path.exists(output_file)
+    df.to_csv(output_file, mode='a', header=write_header, index=False,
+              encoding='utf-8-sig' if write_header else 'utf-8')
+    appended_rows += len(df)
+    print(f"💾 {name}({stn_id}) {len(df)}행 추가 ({df['날짜'].min()} ~ {df['날짜'].max()})")
+
+# -------------------------------------------------------
+# 5️⃣ 지점이 끝나는 순서대로 붙였으므로 (지역명, 날짜) 순으로 다시 정렬해 저장
+# -------------------------------------------------------
+if appended_rows:
+    df_all = pd.read_csv(output_file, encoding='utf-8-sig', dtype={'날짜': str})
+    df_all = df_all.sort_values(['지역명', '날짜'], kind='stable').reset_index(drop=True)
+    tmp_file = output_file + ".tmp"
+    df_all.to_csv(tmp_file, encoding='utf-8-sig', index=False)
+    os.replace(tmp_file, output_file)
 
+if windows:
+    print(f"\n💾 저장 완료 → {output_file} (이번 실행 {appended_rows}행 추가, 지역명/날짜 순 정렬)")
 else:
-    print(" 수집된 데이터가 없습니다.")
+    print("\n모든 지점이 최신 상태입니다.")
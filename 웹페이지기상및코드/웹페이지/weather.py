@@ -1,7 +1,15 @@
 import pandas as pd
-import requests
 import io
-import time
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from src.utils.kma_client import KMAFetcher, KMA_BASE_URL
+from src.utils.kma_cache import KMACache
+from src.utils.kma_parser import parse_wide_table
+from src.utils.checkpoint import CompletionLedger
+from src.utils.parquet_sink import ParquetSink, export_csv
+from src.utils.kma_plan import SHARE_DISTANCE_KM, SLOT_LIMITS, plan_grid_cells, plan_windows, print_cell_plan
 
 # --- 파라미터 ---
 AUTH_KEY = "vLfGjQIPTia3xo0CD94muA"
@@ -10,175 +18,188 @@ INPUT_FILE = "locations.csv"
 INPUT_ENCODING = "cp949" 
 OUTPUT_FILE = "solar_data_2024_total.csv" 
 OUTPUT_ENCODING = "utf-8-sig"
-BASE_URL = "https://apihub.kma.go.kr/api/typ01/cgi-bin/url/nph_sun_sat_ana_txt"
-
-START_DATE = "20240101" 
-END_DATE = "20241231"   
+BASE_URL = KMA_BASE_URL + "/api/typ01/cgi-bin/url/nph_sun_sat_ana_txt"
+
+# (벤치마크/테스트에서는 KMA_START_DATE, KMA_END_DATE 환경변수로 짧은 기간만 수집 가능)
+START_DATE = os.environ.get("KMA_START_DATE", "20240101")
+END_DATE = os.environ.get("KMA_END_DATE", "20241231")
+
+# [요청 속도 제어] 초당 요청 수 / 동시 요청 수 / 429 재시도 횟수
+RATE_LIMIT = 5.0
+MAX_WORKERS = 8
+MAX_RETRIES = 5
+
+# [체크포인트] 완료 장부 (재실행 시 빠진 요청만 수행)
+CHECKPOINT_DIR = "solar_data_2024_checkpoint"
+LEDGER_FILE = os.path.join(CHECKPOINT_DIR, "ledger.tsv")
+
+# [저장] 자료원/발전소/연-월로 나눈 Parquet 저장소 (수집 중에도 부분 결과를 읽을 수 있음)
+DATASET_DIR = "solar_data_parquet"
+DATASET_SOURCE = "sat"
+FLUSH_ROWS = 50_000
+FINAL_COLUMNS = ['발전기명', 'DATETIME', 'SI']
 # -----------------------------
-all_dataframes = []
 def parse_wide_format_response(text_data, location_name):
     try:
-        lines = text_data.strip().split('\n')
-        table_lines = [line.strip() for line in lines if line.strip().startswith('|')]
-        
-        if len(table_lines) < 2:
-            return None
-
-        header_line = table_lines[0]
-        headers = [h.strip() for h in header_line.split('|') if h.strip()]
-        
-        data_line = table_lines[1]
-        values = [v.strip() for v in data_line.split('|') if v.strip()]
-        
-        time_headers = headers[4:]
-        time_values = values[4:]
-        
-        if len(time_headers) != len(time_values):
+        # 헤더/값 행을 한 번에 분해하고 시각·값을 벡터화 변환
+        parsed = parse_wide_table(text_data, time_format='%Y%m%d%H%M')
+        if parsed is None:
             return None
 
-        parsed_data = []
-        for dt_str, si_val in zip(time_headers, time_values):
-            try:
-                dt_obj = pd.to_datetime(dt_str, format='%Y%m%d%H%M')
-                si = float(si_val.replace('-nan', 'NaN'))
-            except ValueError:
-                continue
-                
-            parsed_data.append({
-                "발전기명": location_name,
-                "DATETIME": dt_obj,
-                "SI": si
-            })
-            
-        if not parsed_data:
-            return None
-            
-        return pd.DataFrame(parsed_data)
+        times, values = parsed
+        return pd.DataFrame({
+            "발전기명": location_name,
+            "DATETIME": times,
+            "SI": values
+        })
         
     except Exception as e:
         print(f"     -> [파싱 함수 오류] {location_name}: {e}")
         return None
 # -----------------------------------------------------------------
+def build_jobs(cells, windows, ledger):
+    """
+    (요청 구간 × 요청 좌표) 요청 중 묶인 발전소가 모두 장부에 있는 것은 건너뛰고 순서대로 생성
+    - 아주 가까운 발전소들은 대표 발전소의 실제 좌표로 한 번만 요청 (혼자인 발전소는 자기 좌표)
+    """
+    for tm1, tm2 in windows:
+        for (cell_lat, cell_lon), names in cells.items():
+            if all(ledger.is_done((name, tm1, tm2)) for name in names):
+                continue
+            params = {
+                'authKey': AUTH_KEY,
+                'tm1': tm1,
+                'tm2': tm2,
+                'int': INTERVAL,
+                'lat': cell_lat,
+                'lon': cell_lon
+            }
+            yield ((cell_lat, cell_lon), tm1, tm2), BASE_URL, params
+
+
+def handle_response(location_name, period_name, result):
+    """
+    응답 1건을 파싱하여 (DataFrame 또는 None, 완료 여부) 반환
+    - 완료 여부가 False면 장부에 기록하지 않아 재실행 시 다시 요청
+    """
+    label = f"{location_name} {period_name}"
+
+    if result['error'] is not None:
+        print(f"     -> [네트워크 오류] {label} 요청 중 예외 발생: {result['error']}")
+        return None, False
+
+    if result['status'] == 429:
+        print(f"     -> [!!! API 트래픽 제한 감지 !!!] {label} (HTTP 429, 재시도 {result['retries']}회 초과)")
+        return None, False
+
+    if result['status'] != 200:
+        print(f"     -> [HTTP 오류] {label}: 상태 코드 {result['status']}")
+        return None, False
+
+    data_text = result['text'].strip()
+
+    if data_text and not data_text.startswith("#ERROR") and not data_text.startswith("<Error>"):
+
+        # 5. Wide 포맷 파서 호출
+        df_temp = parse_wide_format_response(data_text, location_name)
+
+        if df_temp is not None and not df_temp.empty:
+            return df_temp[FINAL_COLUMNS], True
+
+        # [예외 처리] Long 포맷이 올 경우
+        try:
+            df_long = pd.read_csv(io.StringIO(data_text), sep=r'\s+', comment='#')
+            if 'SI' in df_long.columns:
+                print(f"     -> [알림] {label} 'Long' 포맷 데이터 파싱 성공 (데이터 {len(df_long)}개)")
+                df_long['발전기명'] = location_name
+                df_long['DATETIME'] = pd.to_datetime(df_long[['YEAR', 'MON', 'DAY', 'HR', 'MIN']].rename(
+                    columns={'YEAR': 'year', 'MON': 'month', 'DAY': 'day', 'HR': 'hour', 'MIN': 'minute'}))
+                return df_long[FINAL_COLUMNS], True
+        except Exception:
+            pass
+        print(f"     -> [파싱 실패] {label} 응답이 알 수 없는 형식입니다: {data_text[:50]}...")
+
+    elif data_text.count('\n') < 2:
+        print(f"     -> [알림] {label} 데이터가 없습니다 (API가 빈 응답 반환).")
+        return None, True
+    else:
+        print(f"     -> [API 오류] {label} 응답: {data_text}")
+    return None, False
+# -----------------------------------------------------------------
 try:
     # 1. CSV (cp949) 읽기
     df_locations = pd.read_csv(INPUT_FILE, encoding=INPUT_ENCODING)
     
     print(f"'{INPUT_FILE}' (인코딩: {INPUT_ENCODING}) 파일 로드 성공.")
     print(f"총 {len(df_locations)}개 위치에 대해 데이터 수집을 시작합니다.")
-    print(f"데이터 기간: {START_DATE} 부터 {END_DATE} 까지\n")
-
-    # START_DATE부터 END_DATE까지 하루 단위로 날짜 리스트 생성
-    date_range = pd.date_range(start=START_DATE, end=END_DATE, freq='D')
-    
-    for current_day in date_range:
-        current_day_str = current_day.strftime('%Y%m%d')
-        print(f"--- [날짜 루프] {current_day_str} 데이터 수집 시작 ---")
-
-        # [수정됨] 24개 제한 우회를 위한 시간대를 '현재 날짜' 기준으로 동적 생성
-        time_periods = [
-            {"name": "오전", "start": current_day_str + "0000", "end": current_day_str + "1130"},
-            {"name": "오후", "start": current_day_str + "1200", "end": current_day_str + "2330"}
-        ]
-        
-        for row in df_locations.itertuples():
-            lat = row.위도
-            lon = row.경도
-            location_name = row.발전기명.strip() 
-            
-            print(f"--- 📍'{location_name}' (위도:{lat}, 경도:{lon}) 처리 중 ---")
-
-            # 3. 오전/오후 2번 분할 요청
-            for period in time_periods:
-                print(f"     -> {period['name']} ({period['start']}~{period['end']}) 요청...")
-                params = {
-                    'authKey': AUTH_KEY,
-                    'tm1': period['start'],
-                    'tm2': period['end'],
-                    'int': INTERVAL,
-                    'lat': lat,
-                    'lon': lon
-                }
-
-                try:
-                    response = requests.get(BASE_URL, params=params, timeout=30) 
-
-                    if response.status_code == 200:
-                        data_text = response.text.strip()
-                        
-                        if data_text and not data_text.startswith("#ERROR") and not data_text.startswith("<Error>"):
-                            
-                            # 5. Wide 포맷 파서 호출
-                            df_temp = parse_wide_format_response(data_text, location_name)
-                            
-                            if df_temp is not None and not df_temp.empty:
-                                all_dataframes.append(df_temp)
-                                print(f"     -> {period['name']} 데이터 파싱 성공 (데이터 {len(df_temp)}개)")
-                            else:
-                                # [예외 처리] Long 포맷이 올 경우
-                                try:
-                                    df_long = pd.read_csv(io.StringIO(data_text), delim_whitespace=True, comment='#')
-                                    if 'SI' in df_long.columns:
-                                        print(f"     -> [알림] {period['name']} 'Long' 포맷 데이터 파싱 성공 (데이터 {len(df_long)}개)")
-                                        df_long['발전기명'] = location_name
-                                        all_dataframes.append(df_long)
-                                    else:
-                                        print(f"     -> [파싱 실패] {period['name']} 응답이 알 수 없는 형식입니다: {data_text[:50]}...")
-                                except Exception:
-                                     print(f"     -> [파싱 실패] {period['name']} 응답이 알 수 없는 형식입니다: {data_text[:50]}...")
-
-                        elif data_text.count('\n') < 2:
-                             print(f"     -> [알림] {period['name']} 데이터가 없습니다 (API가 빈 응답 반환).")
-                        else:
-                            print(f"     -> [API 오류] {period['name']} 응답: {data_text}")
-                
-                
-                    elif response.status_code == 429: # [중요] 429: Too Many Requests (트래픽 제한)
-                        print(f"     -> [!!! API 트래픽 제한 감지 !!!] (HTTP 429)")
-                        print("     -> 30초간 대기 후 재시도합니다...")
-                        time.sleep(30)
-                
-                    else:
-                        print(f"     -> [HTTP 오류] {period['name']}: 상태 코드 {response.status_code}")
-
-                except requests.exceptions.Timeout:
-                    print(f"     -> [네트워크 오류] {period['name']} 요청 시간 초과 (Timeout=30s).")
-                except requests.exceptions.RequestException as e:
-                    print(f"     -> [네트워크 오류] {period['name']} 요청 중 예외 발생: {e}")
-                
-                time.sleep(0.2)
-
-            print(f"--- ✔️ '{location_name}' ({current_day_str}) 처리 완료 ---\n")
-        
-        print(f"--- [날짜 루프] {current_day_str} 데이터 수집 완료 ---\n" + "="*50 + "\n")
-
-
-    # 데이터 취합 및 최종 파일 생성
-    if all_dataframes:        
-        final_df = pd.concat(all_dataframes, ignore_index=True)
-        
-        if 'DATETIME' not in final_df.columns:
-            try:
-                final_df['DATETIME'] = pd.to_datetime(final_df[['YEAR', 'MON', 'DAY', 'HR', 'MIN']])
-            except Exception as e:
-                print(f"날짜 변환 실패: {e}.")
-        
-        final_columns = ['발전기명', 'DATETIME', 'SI']
-        existing_final_columns = [col for col in final_columns if col in final_df.columns]
-        
-        if 'SI' not in final_df.columns or '발전기명' not in final_df.columns:
-             print("최종 데이터에 'SI' 또는 '발전기명' 컬럼이 없습니다.")
-        
-        else:
-            final_output_df = final_df[existing_final_columns]
-            final_output_df = final_output_df.sort_values(by=['발전기명', 'DATETIME'])
-            final_output_df = final_output_df.drop_duplicates(subset=['발전기명', 'DATETIME'], keep='first')
-            
-            final_output_df.to_csv(OUTPUT_FILE, index=False, encoding=OUTPUT_ENCODING)
-            
-            print(f"모든 데이터를 '{OUTPUT_FILE}' 파일로 저장했습니다.")
-
-            print("\n데이터 미리보기")
-            print(final_output_df.head())
+    print(f"데이터 기간: {START_DATE} 부터 {END_DATE} 까지")
+    print(f"요청 속도: 초당 {RATE_LIMIT}건, 동시 {MAX_WORKERS}건\n")
+
+    # START_DATE 00시부터 END_DATE 마지막 시각까지를 요청당 시각 수 제한(24개)에 맞춰 최소 구간으로 분할
+    last_slot = pd.Timestamp(END_DATE) + pd.Timedelta(days=1) - pd.Timedelta(minutes=INTERVAL)
+    windows = plan_windows(START_DATE, last_slot, INTERVAL, SLOT_LIMITS["sat"])
+    total_jobs = len(windows) * len(df_locations)
+    print(f"요청 구간: {len(windows)}개 (구간당 최대 {SLOT_LIMITS['sat']}개 시각, {INTERVAL}분 간격)")
+
+    # 위성 격자점을 공유한다고 볼 만큼 가까운 발전소는 한 번만 요청하고 결과를 나눠 씀 (근사)
+    cells = plan_grid_cells(df_locations, SHARE_DISTANCE_KM["sat"])
+    print_cell_plan(cells, len(df_locations), label=" (위성)")
+    print()
+
+    # 2. 완료 장부 로드 (이미 받은 (발전기, 구간 시작, 구간 끝)은 건너뜀)
+    ledger = CompletionLedger(LEDGER_FILE)
+    print(f"체크포인트: 전체 {total_jobs}건 중 {len(ledger)}건 완료 기록 있음 → 나머지만 요청합니다.\n")
+
+    # 3. 토큰 버킷 + 병렬 요청 (429는 자동 백오프 후 재시도, 이미 받은 응답은 디스크 캐시에서)
+    cache = KMACache()
+    fetcher = KMAFetcher(rate=RATE_LIMIT, max_workers=MAX_WORKERS, max_retries=MAX_RETRIES, cache=cache)
+    sink = ParquetSink(DATASET_DIR, DATASET_SOURCE, flush_rows=FLUSH_ROWS)
+    pending_keys = []
+    done_count = 0
+
+    for key, result in fetcher.fetch_all(build_jobs(cells, windows, ledger)):
+        cell, tm1, tm2 = key
+        period_name = f"{tm1}~{tm2}"
+        names = [name for name in cells[cell] if not ledger.is_done((name, tm1, tm2))]
+        location_name = ", ".join(names)
+        done_count += 1
+        df_temp, completed = handle_response(location_name, period_name, result)
+
+        # 4. 공유 요청의 응답을 묶인 발전소별로 복제해 저장 버퍼에 넣고, Parquet으로 내려쓴 뒤에 장부에 완료 기록
+        if df_temp is not None:
+            sink.write(pd.concat([df_temp.assign(발전기명=name) for name in names], ignore_index=True))
+        if completed:
+            pending_keys.extend((name, tm1, tm2) for name in names)
+        if sink.buffered_rows >= FLUSH_ROWS:
+            sink.flush()
+            for done_key in pending_keys:
+                ledger.mark_done(done_key)
+            pending_keys = []
+
+        if done_count % 100 == 0:
+            print(f"--- 진행 상황: 이번 실행 {done_count}건 완료 (누적 {len(ledger)}/{total_jobs}, 재시도 {fetcher.retry_count}회, 마지막: '{location_name}' {period_name}) ---")
+
+    # 남은 버퍼 기록 → 장부 반영 → 이번에 쓴 파티션 정리(키 중복 제거)
+    sink.flush()
+    for done_key in pending_keys:
+        ledger.mark_done(done_key)
+    sink.compact()
+
+    fetcher.close()
+    ledger.close()
+    cache.close()
+    print(f"--- 수집 종료: 이번 실행 {done_count}건 처리 (캐시 적중 {cache.hits}건), 누적 완료 {len(ledger)}/{total_jobs} ---\n")
+
+
+    # 최종 CSV 생성: 이번 수집 기간(START_DATE~END_DATE)/발전소의 파티션(발전소/연-월)만 하나씩 읽어 정렬·중복 제거된 상태로 이어씀
+    n_rows = export_csv(DATASET_DIR, DATASET_SOURCE, OUTPUT_FILE, columns=FINAL_COLUMNS, encoding=OUTPUT_ENCODING,
+                        start=START_DATE, end=last_slot, plants=[n for names in cells.values() for n in names])
+
+    if n_rows > 0:
+        print(f"모든 데이터({n_rows}행)를 '{OUTPUT_FILE}' 파일로 저장했습니다.")
+
+        print("\n데이터 미리보기")
+        print(pd.read_csv(OUTPUT_FILE, nrows=5))
 
     else:
         print("\n--- 작업 완료 ---")
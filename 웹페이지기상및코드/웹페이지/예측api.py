@@ -1,16 +1,22 @@
 import pandas as pd
-import requests
-import io
-import time
+import numpy as np
+import os
+import sys
 import datetime
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from src.utils.kma_client import KMAFetcher, KMA_BASE_URL
+from src.utils.kma_cache import KMACache
+from src.utils.kma_parser import parse_wide_table
+from src.utils.kma_plan import SHARE_DISTANCE_KM, SLOT_LIMITS, plan_grid_cells, plan_windows, print_cell_plan
+
 # --- 1. 파라미터 설정 ---
 AUTH_KEY = "vLfGjQIPTia3xo0CD94muA"
 INPUT_FILE = "locations.csv"
 INPUT_ENCODING = "cp949" 
 OUTPUT_FILE = "today_forecast_3hourly_final.csv" # 최종 저장 파일
 OUTPUT_ENCODING = "utf-8-sig"
-BASE_URL = "https://apihub.kma.go.kr/api/typ01/cgi-bin/url/nph_sun_nwp_txt"
+BASE_URL = KMA_BASE_URL + "/api/typ01/cgi-bin/url/nph_sun_nwp_txt"
 
 # [변환 계수]
 # (3시간 * 3600초/시간) / (1,000,000 J/MJ) = 0.0108
@@ -23,11 +29,13 @@ VARIABLES_TO_FETCH = {
     "RH": "습도"    # 상대습도
 }
 
-# [API 6개 제한 우회 시간대]
-time_periods = [
-    {"name": "Part 1", "start_time": "0000", "end_time": "1500"}, # 6개
-    {"name": "Part 2", "start_time": "1800", "end_time": "2100"}  # 2개
-]
+# [병렬 수집 설정] 초당 요청 수 / 동시 요청 수 / 전체 수집 마감 시간(초)
+RATE_LIMIT = 10.0
+MAX_WORKERS = 8
+RUN_DEADLINE_SEC = 60
+
+# [예측 시각 간격(시간)] 오늘 00시 ~ 21시를 요청당 6개 제한에 맞춰 자동 분할
+FORECAST_INTERVAL_HOURS = 3
 
 # --- 2. API 모델 시간 설정 (어제 18시 UTC) ---
 try:
@@ -45,6 +53,13 @@ except Exception as e:
     MODEL_RUN_TIME = "202511091800" # 오류 시 대체 (어제 18시)
     TODAY_STR = "20251110"        # 오류 시 대체 (오늘)
 
+# 오늘 하루의 예측 시각을 최소 개수의 요청 구간으로 분할 (예: 3시간 간격 → 00~15시, 18~21시)
+last_slot = pd.Timestamp(TODAY_STR) + pd.Timedelta(days=1) - pd.Timedelta(hours=FORECAST_INTERVAL_HOURS)
+time_periods = [
+    {"name": f"{tmef1[8:]}~{tmef2[8:]}", "tmef1": tmef1, "tmef2": tmef2}
+    for tmef1, tmef2 in plan_windows(TODAY_STR, last_slot, FORECAST_INTERVAL_HOURS * 60, SLOT_LIMITS["nwp"])
+]
+
 # 최종 결과를 담을 리스트
 all_parsed_data = []
 
@@ -52,39 +67,34 @@ all_parsed_data = []
 # --- 3. API 파서 함수 (UTC -> KST 변환 포함) ---
 # -----------------------------------------------------------------
 def parse_nwp_response(text_data, location_name, variable_name_korean):
+    """
+    응답 1건을 (발전기명, 변수명, KST 시각 배열, 값 배열)로 변환 (DataFrame은 마지막에 한 번만 생성)
+    """
     try:
-        lines = text_data.strip().split('\n')
-        table_lines = [line.strip() for line in lines if line.strip().startswith('|')]
-        if len(table_lines) < 2: return None
-        header_line = table_lines[0]
-        headers = [h.strip() for h in header_line.split('|') if h.strip()]
-        data_line = table_lines[1]
-        values = [v.strip() for v in data_line.split('|') if v.strip()]
-        time_headers = headers[4:]
-        time_values = values[4:]
-        if len(time_headers) != len(time_values): return None
-        
-        parsed_data = []
-        for dt_str, val_str in zip(time_headers, time_values):
-            try:
-                # [KST 변환]
-                dt_utc = pd.to_datetime(dt_str, format='%Y%m%d%H').tz_localize('UTC')
-                dt_obj = dt_utc.tz_convert('Asia/Seoul') # KST로 변환
-                
-                value = float(val_str.replace('-nan', 'NaN'))
-            except ValueError:
-                continue
-                
-            parsed_data.append({
-                "발전기명": location_name,
-                "DATETIME": dt_obj, # KST로 변환된 시간 (예: ...09:00:00+09:00)
-                "변수명": variable_name_korean,
-                "값": value
-            })
-        return pd.DataFrame(parsed_data) if parsed_data else None
+        # [KST 변환] UTC 시각 → KST (+9시간)까지 벡터화 처리
+        parsed = parse_wide_table(text_data, time_format='%Y%m%d%H', utc_to_kst=True)
+        if parsed is None:
+            return None
+        times, values = parsed
+        return location_name, variable_name_korean, times, values
     except Exception as e:
         print(f"     -> [파싱 함수 오류] {location_name} ({variable_name_korean}): {e}")
         return None
+def build_jobs(cells):
+    """
+    (요청 좌표 × 변수 × 시간 분할) 요청 목록 생성 (아주 가까운 발전소는 대표 발전소의 실제 좌표로 한 번만 요청)
+    """
+    for (cell_lat, cell_lon) in cells:
+        for var_code, var_name_korean in VARIABLES_TO_FETCH.items():
+            for period in time_periods:
+                params = {
+                    'authKey': AUTH_KEY, 'nwp': 'KIMG', 'varn': var_code,
+                    'tm': MODEL_RUN_TIME,
+                    'tmef1': period['tmef1'],
+                    'tmef2': period['tmef2'],
+                    'int': FORECAST_INTERVAL_HOURS, 'lat': cell_lat, 'lon': cell_lon
+                }
+                yield ((cell_lat, cell_lon), var_name_korean, period['name']), BASE_URL, params
 # -----------------------------------------------------------------
 # --- 4. 메인 스크립트 실행 ---
 # -----------------------------------------------------------------
@@ -94,84 +104,84 @@ print(f"'{MODEL_RUN_TIME}' 모델 (어제 18시 UTC) 기준\n")
 try:
     # 1. CSV (cp949) 읽기
     df_locations = pd.read_csv(INPUT_FILE, encoding=INPUT_ENCODING)
-    
-    # 2. 'locations.csv'의 모든 위치 반복
-    for row in df_locations.itertuples():
-        lat = row.위도
-        lon = row.경도
-        location_name = row.발전기명.strip()
-        
-        print(f"--- 📍'{location_name}' (위도:{lat}, 경도:{lon}) 처리 중 ---")
-    
-        # 3. 변수 리스트(DSWRF, TMP, RH) 반복
-        for var_code, var_name_korean in VARIABLES_TO_FETCH.items():
-            print(f"  -> 변수 '{var_name_korean}' (코드: {var_code}) 요청 중...")
-            
-            # 4. 시간 분할(Part 1, Part 2) 반복
-            for period in time_periods:
-                
-                forecast_start_time = TODAY_STR + period['start_time']
-                forecast_end_time = TODAY_STR + period['end_time']
-                
-                params = {
-                    'authKey': AUTH_KEY, 'nwp': 'KIMG', 'varn': var_code,
-                    'tm': MODEL_RUN_TIME,
-                    'tmef1': forecast_start_time,
-                    'tmef2': forecast_end_time,
-                    'int': 3, 'lat': lat, 'lon': lon
-                }
-
-                try:
-                    # 5. API 요청
-                    response = requests.get(BASE_URL, params=params, timeout=30) 
-
-                    if response.status_code == 200:
-                        data_text = response.text.strip()
-                        if data_text and not data_text.startswith("#ERROR") and not data_text.startswith("<Error>"):
-                            # 6. KST 파서 호출
-                            df_temp = parse_nwp_response(data_text, location_name, var_name_korean)
-                            if df_temp is not None and not df_temp.empty:
-                                all_parsed_data.append(df_temp) # 메모리에 추가
-                            else:
-                                 print(f"     -> [파싱 실패] {period['name']} ({var_name_korean}) 응답이 알 수 없는 형식입니다.")
-                        elif data_text.count('\n') < 2:
-                             print(f"     -> [알림] {period['name']} ({var_name_korean}) 데이터가 없습니다 (API가 빈 응답 반환).")
-                        else:
-                            print(f"     -> [API 오류] {period['name']} ({var_name_korean}) 응답: {data_text}")
-                    else:
-                        print(f"     -> [HTTP 오류] {period['name']} ({var_name_korean}): 상태 코드 {response.status_code}")
-
-                except requests.exceptions.Timeout:
-                    print(f"     -> [네트워크 오류] {period['name']} ({var_name_korean}) 요청 시간 초과.")
-                except requests.exceptions.RequestException as e:
-                    print(f"     -> [네트워크 오류] {period['name']} ({var_name_korean}) 요청 중 예외: {e}")
-                
-                time.sleep(0.1) 
-        print(f"--- ✔️ '{location_name}' 처리 완료 ---\n")
+    total_jobs = len(df_locations) * len(VARIABLES_TO_FETCH) * len(time_periods)
+
+    # 수치예보 격자점을 공유한다고 볼 만큼 가까운 발전소는 한 번만 요청하고 결과를 나눠 씀 (근사)
+    cells = plan_grid_cells(df_locations, SHARE_DISTANCE_KM["nwp"])
+    print_cell_plan(cells, len(df_locations), label=" (수치예보)")
+    total_requests = len(cells) * len(VARIABLES_TO_FETCH) * len(time_periods)
+    print(f"총 {total_requests}건 요청 (좌표 {len(cells)} × 변수 {len(VARIABLES_TO_FETCH)} × 시간대 {len(time_periods)}), "
+          f"동시 {MAX_WORKERS}건 / 마감 {RUN_DEADLINE_SEC}초\n")
+
+    # 2. 공유 세션(keep-alive) + 병렬 요청, 같은 모델 시각의 응답은 디스크 캐시에서 재사용 (NWP는 짧은 TTL)
+    cache = KMACache()
+    fetcher = KMAFetcher(rate=RATE_LIMIT, max_workers=MAX_WORKERS, cache=cache)
+    failed_jobs = []
+
+    # 3. 완료되는 순서대로 파싱 (마감 시간 초과분은 실패 목록으로)
+    for (cell, var_name_korean, period_name), result in fetcher.fetch_all(build_jobs(cells), deadline=RUN_DEADLINE_SEC):
+        location_name = ", ".join(cells[cell])
+        label = f"'{location_name}' {period_name} ({var_name_korean})"
+
+        if result['error'] is not None:
+            print(f"     -> [네트워크 오류] {label} 요청 중 예외: {result['error']}")
+        elif result['status'] == 200:
+            data_text = result['text'].strip()
+            if data_text and not data_text.startswith("#ERROR") and not data_text.startswith("<Error>"):
+                # 4. KST 파서 호출
+                parsed = parse_nwp_response(data_text, location_name, var_name_korean)
+                if parsed is not None:
+                    # 공유 요청의 응답을 묶인 발전소마다 그대로 사용 (배열 그대로 메모리에 추가)
+                    _, _, times, values = parsed
+                    all_parsed_data.extend((name, var_name_korean, times, values) for name in cells[cell])
+                    continue
+                print(f"     -> [파싱 실패] {label} 응답이 알 수 없는 형식입니다.")
+            elif data_text.count('\n') < 2:
+                 print(f"     -> [알림] {label} 데이터가 없습니다 (API가 빈 응답 반환).")
+            else:
+                print(f"     -> [API 오류] {label} 응답: {data_text}")
+        else:
+            print(f"     -> [HTTP 오류] {label}: 상태 코드 {result['status']}")
+        failed_jobs.extend((name, var_name_korean, period_name) for name in cells[cell])
+
+    fetcher.close()
+    cache.close()
+
+    # 부분 결과: 받지 못한 (위치, 변수, 시간대)는 결측(NaN)으로 남기고 목록만 보고
+    print(f"\n--- 수집 완료: 성공 {total_jobs - len(failed_jobs)}/{total_jobs}건 (발전소 기준, 실제 요청 {total_requests}건 중 캐시 적중 {cache.hits}건) ---")
+    if failed_jobs:
+        print(f"⚠️ 받지 못한 요청 {len(failed_jobs)}건 (해당 값은 빈 칸으로 저장):")
+        for location_name, var_name_korean, period_name in failed_jobs:
+            print(f"   - {location_name} / {var_name_korean} / {period_name}")
 
     # --- 5. [합본] 최종 변환 및 저장 ---
     if all_parsed_data:
         print(f"\n--- ✨ 모든 위치 데이터 취합 및 최종 변환 시작 ---")
         
-        # 7-1. 모든 데이터를 하나로 합치기
-        final_df = pd.concat(all_parsed_data, ignore_index=True)
+        # 7-1. 모든 배열을 한 번에 이어 붙여 DataFrame 1개로 만들기
+        lengths = [len(times) for _, _, times, _ in all_parsed_data]
+        final_df = pd.DataFrame({
+            '발전기명': np.repeat([name for name, _, _, _ in all_parsed_data], lengths),
+            'DATETIME': np.concatenate([times for _, _, times, _ in all_parsed_data]),
+            '변수명': np.repeat([var for _, var, _, _ in all_parsed_data], lengths),
+            '값': np.concatenate([values for _, _, _, values in all_parsed_data])
+        })
+
+        # 7-2. 받은 응답 안의 결측값(NaN)만 0으로 처리 (계산을 위해, 받지 못한 요청은 빈 칸 유지)
+        final_df['값'] = final_df['값'].fillna(0)
         
-        # 7-2. 피벗(Pivot) 테이블: '변수명'을 컬럼으로 변경
+        # 7-3. 피벗(Pivot) 테이블: '변수명'을 컬럼으로 변경 (받지 못한 변수도 컬럼은 유지)
         final_pivot_df = final_df.pivot_table(
             index=['발전기명', 'DATETIME'], 
             columns='변수명', 
             values='값'
-        ).reset_index()
+        ).reindex(columns=list(VARIABLES_TO_FETCH.values())).reset_index()
+        final_pivot_df.columns.name = None
         
-        # 7-3. 정렬
+        # 7-4. 정렬
         final_pivot_df = final_pivot_df.sort_values(by=['발전기명', 'DATETIME'])
         
         print("     -> 피벗 테이블 생성 완료 (KST 시간 적용됨)")
-
-        # 7-4. 결측값(NaN)을 0으로 처리 (계산을 위해)
-        final_pivot_df['일사'] = final_pivot_df['일사'].fillna(0)
-        final_pivot_df['기온'] = final_pivot_df['기온'].fillna(0)
-        final_pivot_df['습도'] = final_pivot_df['습도'].fillna(0)
     
         # 7-5. [MJ/m² 변환]
         final_pivot_df['일사량(MJ/m²)'] = final_pivot_df['일사'] * CONVERSION_FACTOR
@@ -181,10 +191,7 @@ try:
         
         print("     -> 일사량 단위 변환 (W/m² -> 3시간 누적 MJ/m²) 완료")
         
-        # 7-7. [날짜 형식 수정] +09:00 시간대 정보 제거
-        final_pivot_df['DATETIME'] = final_pivot_df['DATETIME'].dt.tz_localize(None)
-        
-        print("     -> 날짜 형식 정리 (시간대 정보 +09:00 제거) 완료")
+        # 7-7. [날짜 형식] 파서가 시간대 정보 없는 KST 시각을 반환하므로 +09:00 제거 불필요
         
         # 7-8. [컬럼명 수정]
         final_pivot_df = final_pivot_df.rename(columns={
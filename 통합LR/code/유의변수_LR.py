@@ -2,6 +2,10 @@ import pandas as pd
 import statsmodels.api as sm
 import matplotlib.pyplot as plt
 import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from src.utils.features import build_features
 
 # macOS 한글 폰트 설정
 plt.rcParams['font.family'] = 'AppleGothic'
@@ -11,20 +15,12 @@ plt.rcParams['axes.unicode_minus'] = False
 file_path = "/Users/parkhyeji/Desktop/RE_PV/데이터/이상치제거_후/한국중부발전.csv"
 output_csv = "/Users/parkhyeji/Desktop/RE_PV/통합LR/data/최적회귀/중부_최적회귀.csv"
 
-# CSV 읽기
-df = pd.read_csv(file_path, encoding='utf-8-sig')
-
 # ==========================================================
 # 1. 결측값 처리
 # ==========================================================
-cols_fill_zero = ['일강수량(mm)', '평균기온(°C)', '평균 풍속(m/s)', 
-                  '평균 상대습도(%)', '합계 일조시간(hr)']
-df[cols_fill_zero] = df[cols_fill_zero].fillna(0)
-
-missing_solar_count = df['합계 일사량(MJ/m2)'].isna().sum()
-print(f" 합계 일사량(MJ/m2) 결측값 개수: {missing_solar_count}")
-
-df = df.dropna(subset=['합계 일사량(MJ/m2)'])
+# 기상 결측값(일강수량, 평균기온, 평균 풍속, 평균 상대습도, 합계 일조시간) → 0, 합계 일사량 결측 행 제거
+df, prep = build_features(file_path, "weather_zero")
+print(f" 합계 일사량(MJ/m2) 결측값 개수: {prep['결측제거']}")
 
 # ==========================================================
 # 2. 회귀모델 설정 (전체 데이터 기준)
@@ -6,6 +6,10 @@ from sklearn.model_selection import train_test_split
 from sklearn.metrics import r2_score, mean_squared_error
 import matplotlib.pyplot as plt
 import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from src.utils.features import build_features
 
 # macOS 한글 폰트 설정
 plt.rcParams['font.family'] = 'AppleGothic'
@@ -15,23 +19,13 @@ plt.rcParams['axes.unicode_minus'] = False
 file_path = "/Users/parkhyeji/Desktop/RE_PV/이상치제거(인천,발전량0)/한국중부발전.csv"
 output_csv = "/Users/parkhyeji/Desktop/RE_PV/통합선형결과/중부_통합회귀결과.csv"
 
-# CSV 읽기
-df = pd.read_csv(file_path, encoding='utf-8-sig')
-
 # ==========================================================
 # 1. 결측값 처리
 # ==========================================================
 # '일강수량(mm)', '평균기온(°C)', '평균 풍속(m/s)', '평균 상대습도(%)', '합계 일조시간(hr)' → 0으로 대체
-cols_fill_zero = ['일강수량(mm)', '평균기온(°C)', '평균 풍속(m/s)',
-                  '평균 상대습도(%)', '합계 일조시간(hr)']
-df[cols_fill_zero] = df[cols_fill_zero].fillna(0)
-
-# '합계 일사량(MJ/m2)' 결측 개수 확인
-missing_solar_count = df['합계 일사량(MJ/m2)'].isna().sum()
-print(f"✅ 합계 일사량(MJ/m2) 결측값 개수: {missing_solar_count}")
-
 # '합계 일사량(MJ/m2)' 결측 행 제거
-df = df.dropna(subset=['합계 일사량(MJ/m2)'])
+df, prep = build_features(file_path, "weather_zero")
+print(f"✅ 합계 일사량(MJ/m2) 결측값 개수: {prep['결측제거']}")
 
 # ==========================================================
 # 2. 독립변수 / 종속변수 정의
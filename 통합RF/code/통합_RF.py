@@ -4,6 +4,10 @@ from sklearn.model_selection import train_test_split
 from sklearn.metrics import r2_score, mean_squared_error
 import matplotlib.pyplot as plt
 import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from src.utils.features import build_features
 
 # macOS 한글 폰트 설정 (그래프 깨짐 방지)
 plt.rcParams['font.family'] = 'AppleGothic'
@@ -13,12 +17,8 @@ plt.rcParams['axes.unicode_minus'] = False
 file_path = "/Users/parkhyeji/Desktop/RE_PV/data/중부+동서/동서+중부_일사량예측(LR).csv"
 output_csv = "/Users/parkhyeji/Desktop/RE_PV/data/중부+동서/동서+중부_통합학습결과_일사량LR.csv"
 
-# CSV 읽기
-df = pd.read_csv(file_path, encoding='utf-8-sig')
-
-# 결측 처리
-df['일강수량(mm)'] = df['일강수량(mm)'].fillna(0)
-df = df.dropna(subset=['합계 일사량(MJ/m2)'])
+# CSV 읽기 + 결측 처리 (일강수량 0, 합계 일사량 결측 제거)
+df, _ = build_features(file_path, "rain_zero")
 
 # 독립변수(X), 종속변수(y)
 X = df[['설비용량(MW)', '평균기온(°C)', '일강수량(mm)',
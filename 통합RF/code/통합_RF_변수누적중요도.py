@@ -4,6 +4,10 @@ from sklearn.model_selection import train_test_split
 from sklearn.metrics import r2_score, mean_squared_error
 import matplotlib.pyplot as plt
 import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from src.utils.features import build_features
 
 # macOS 한글 폰트 설정
 plt.rcParams['font.family'] = 'AppleGothic'
@@ -18,12 +22,8 @@ importance_csv = os.path.join(save_dir, "중부+동서_변수중요도_통합RF.
 importance_img = os.path.join(save_dir, "중부+동서_변수중요도_통합RF.png")
 cumulative_img = os.path.join(save_dir, "중부+동서_변수누적중요도_통합RF.png")
 
-# CSV 읽기
-df = pd.read_csv(file_path, encoding='utf-8-sig')
-
-# 결측 처리
-df['일강수량(mm)'] = df['일강수량(mm)'].fillna(0)
-df = df.dropna(subset=['합계 일사량(MJ/m2)'])
+# CSV 읽기 + 결측 처리 (일강수량 0, 합계 일사량 결측 제거)
+df, _ = build_features(file_path, "rain_zero")
 
 # 독립변수(X), 종속변수(y)
 X = df[['설비용량(MW)', '평균기온(°C)', '일강수량(mm)',
@@ -13,6 +13,10 @@ from sklearn.metrics import r2_score, mean_squared_error
 import matplotlib.pyplot as plt
 import os
 import numpy as np
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from src.utils.features import build_features
 
 # macOS 한글 폰트 설정
 plt.rcParams['font.family'] = 'AppleGothic'
@@ -37,9 +41,8 @@ rmse_plot = os.path.join(save_dir, "중부+동서_RMSE변화.png")
 # ======================================================
 # 데이터 로드 및 전처리
 # ======================================================
-df = pd.read_csv(file_path, encoding='utf-8-sig')
-df['일강수량(mm)'] = df['일강수량(mm)'].fillna(0)
-df = df.dropna(subset=['합계 일사량(MJ/m2)'])
+# 일강수량 0, 합계 일사량 결측 제거
+df, _ = build_features(file_path, "rain_zero")
 
 X = df[['설비용량(MW)', '평균기온(°C)', '일강수량(mm)',
         '평균 풍속(m/s)', '평균 상대습도(%)',
@@ -3,6 +3,11 @@ from sklearn.ensemble import RandomForestRegressor
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import r2_score, mean_squared_error
 import matplotlib.pyplot as plt
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from src.utils.features import build_features
 
 plt.rcParams['font.family'] = 'AppleGothic'
 plt.rcParams['axes.unicode_minus'] = False
@@ -12,12 +17,8 @@ file_path = "/Users/parkhyeji/Desktop/RE_PV/이상치제거/한국중부발전.c
 output_csv = "/Users/parkhyeji/Desktop/RE_PV/파일/중부_통합학습결과.csv"
 error_csv = "/Users/parkhyeji/Desktop/RE_PV/파일/중부_발전기별_오차율.csv"
 
-# CSV 읽기
-df = pd.read_csv(file_path, encoding='utf-8-sig')
-
-# 결측 처리
-df['일강수량(mm)'] = df['일강수량(mm)'].fillna(0)
-df = df.dropna(subset=['합계 일사량(MJ/m2)'])
+# CSV 읽기 + 결측 처리 (일강수량 0, 합계 일사량 결측 제거)
+df, _ = build_features(file_path, "rain_zero")
 
 # X, y, 인덱스 분리
 X = df[['설비용량(MW)', '평균기온(°C)', '일강수량(mm)',
@@ -86,7 +87,7 @@ if '발전기명' in df.columns:
 
     # 발전기별 평균 오차율 및 오차값
     gen_error = (
-        test_df.groupby('발전기명')
+        test_df.groupby('발전기명', observed=True)
         .agg({'오차율(%)': 'mean', '오차값(MWh)': 'mean'})
         .reset_index()
         .sort_values('오차율(%)')
@@ -105,7 +106,7 @@ if '발전기명' in df.columns:
     plt.show()
 
     # 발전기별 실제 vs 예측 비교 (상위 10개만 표시)
-    top10 = test_df.groupby('발전기명').head(1).reset_index(drop=True).head(10)
+    top10 = test_df.groupby('발전기명', observed=True).head(1).reset_index(drop=True).head(10)
     plt.figure(figsize=(10, 6))
     plt.bar(top10['발전기명'], top10['발전량(MWh)'], label='실제값', alpha=0.7)
     plt.bar(top10['발전기명'], top10['예측 발전량(MWh)'], label='예측값', alpha=0.7)